@@ -0,0 +1,50 @@
+from typing import Callable
+
+from api import NGDC
+
+import math
+import threading
+
+
+class DeclinationCache:
+    # Magnetic declination resolved once per location and validity window, refreshed by a background timer so
+    # readers only ever access an attribute.
+    DEFAULT_VALIDITY = 7 * 24 * 60 * 60
+    RETRY_INTERVAL = 60 * 60
+
+    def __init__(self, lat: float, lon: float,
+                 provider: Callable[[float, float], float] = NGDC.get_magnetic_declination,
+                 validity: float = DEFAULT_VALIDITY):
+        self.lat = lat
+        self.lon = lon
+        self.provider = provider
+        # seconds until the declination is looked up again
+        self.validity = validity
+        self.degrees = 0.0
+        self.radians = 0.0
+        self.valid = False
+        self.timer = None
+        self.refresh()
+
+    def refresh(self):
+        try:
+            degrees = self.provider(self.lat, self.lon)
+            # single attribute assignments, readers never see a half updated pair of values
+            self.radians = degrees * math.pi / 180.0
+            self.degrees = degrees
+            self.valid = True
+            self.schedule(self.validity)
+        except Exception as e:
+            # keep the last known value and try again later
+            print("[WARN] Magnetic declination lookup failed: %s" % e)
+            self.schedule(DeclinationCache.RETRY_INTERVAL)
+
+    def schedule(self, delay: float):
+        self.timer = threading.Timer(delay, self.refresh)
+        self.timer.daemon = True
+        self.timer.start()
+
+    def stop(self):
+        if self.timer is not None:
+            self.timer.cancel()
+            self.timer = None
@@ -0,0 +1,147 @@
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Optional
+
+from sensors.Camera import Camera, CameraFrame
+
+import email.utils
+import io
+import os
+import threading
+import time
+
+import requests
+import requests.adapters
+
+
+class FrameUploader:
+    # Captured frames are spooled to disk first and uploaded by a thread pool, so capture never waits for the
+    # network. Frames left in the spool directory by a previous run are uploaded on start.
+    # client errors that are retried like server errors, every other 4xx drops the frame
+    RETRY_STATUS_CODES = [408, 429]
+
+    def __init__(self, url: str, spool_path: str, headers: Dict[str, str] = None, workers: int = 2,
+                 max_spool_files: int = 500, max_retries: int = 5, backoff: float = 2.0, timeout: float = 30.0):
+        self.url = url
+        self.spool_path = spool_path
+        self.headers = headers or {}
+        self.max_spool_files = max_spool_files
+        self.max_retries = max_retries
+        # first retry delay in seconds, doubled after every failed attempt
+        self.backoff = backoff
+        self.timeout = timeout
+        self.session = requests.Session()
+        # keep one pooled connection per worker
+        adapter = requests.adapters.HTTPAdapter(pool_connections=1, pool_maxsize=workers)
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+        self.executor = ThreadPoolExecutor(max_workers=workers)
+        self.lock = threading.Lock()
+        # files in the spool directory, oldest first
+        self.spooled: List[str] = []
+        self.in_flight = 0
+        self.uploaded = 0
+        self.failed = 0
+        self.dropped = 0
+        self.closed = False
+        # interrupts the backoff waits on close
+        self.stop_event = threading.Event()
+        if not os.path.exists(spool_path):
+            os.makedirs(spool_path)
+        for file_name in sorted(os.listdir(spool_path)):
+            self.enqueue(os.path.join(spool_path, file_name))
+
+    def submit(self, frame: CameraFrame) -> str:
+        # sub-second timestamps keep frames captured within the same second apart
+        file_path = Camera.write_frame(frame, self.spool_path, 'microseconds')
+        self.enqueue(file_path)
+        return file_path
+
+    def enqueue(self, file_path: str):
+        with self.lock:
+            self.spooled.append(file_path)
+            self.in_flight += 1
+            # bounded spool, the oldest frames are given up first
+            while len(self.spooled) > self.max_spool_files:
+                FrameUploader.remove(self.spooled.pop(0))
+                self.dropped += 1
+        self.executor.submit(self.upload, file_path)
+
+    @staticmethod
+    def remove(file_path: str):
+        if os.path.isfile(file_path):
+            os.remove(file_path)
+
+    def upload(self, file_path: str):
+        try:
+            self.upload_with_retries(file_path)
+        finally:
+            with self.lock:
+                self.in_flight -= 1
+
+    def upload_with_retries(self, file_path: str):
+        delay = self.backoff
+        for attempt in range(self.max_retries + 1):
+            with self.lock:
+                if file_path not in self.spooled:
+                    # dropped from the spool in the meantime
+                    return
+            if self.closed:
+                return
+            try:
+                with io.open(file_path, "rb") as f:
+                    files = {'image': (os.path.basename(file_path), f)}
+                    response = self.session.post(self.url, files=files, headers=self.headers, timeout=self.timeout)
+                if response.status_code < 500 and response.status_code not in FrameUploader.RETRY_STATUS_CODES:
+                    with self.lock:
+                        if file_path in self.spooled:
+                            self.spooled.remove(file_path)
+                        if response.ok:
+                            self.uploaded += 1
+                        else:
+                            # client errors won't go away by retrying
+                            self.failed += 1
+                            print("[WARN] Upload of %s rejected: %s %s" % (file_path, response.status_code,
+                                                                            response.text))
+                    FrameUploader.remove(file_path)
+                    return
+                retry_after = FrameUploader.get_retry_after(response)
+            except (requests.RequestException, OSError) as e:
+                print("[WARN] Upload of %s failed: %s" % (file_path, e))
+                retry_after = None
+            if attempt < self.max_retries:
+                if self.stop_event.wait(delay if retry_after is None else retry_after):
+                    return
+                delay *= 2
+        # keep the file spooled, it is retried on the next start
+        with self.lock:
+            self.failed += 1
+
+    @staticmethod
+    def get_retry_after(response: requests.Response) -> Optional[float]:
+        # Retry-After is either a number of seconds or an HTTP date
+        value = response.headers.get("Retry-After")
+        if value is None:
+            return None
+        try:
+            return max(float(value), 0.0)
+        except ValueError:
+            pass
+        try:
+            return max(email.utils.parsedate_to_datetime(value).timestamp() - time.time(), 0.0)
+        except (TypeError, ValueError):
+            return None
+
+    @property
+    def pending_count(self) -> int:
+        # uploads queued or in progress
+        with self.lock:
+            return self.in_flight
+
+    def close(self, wait: bool = True):
+        # Queued uploads are cancelled, their frames stay spooled for the next start. Without wait, uploads in
+        # backoff stop right away and only a POST already in progress finishes in the background.
+        if not wait:
+            self.closed = True
+            self.stop_event.set()
+        self.executor.shutdown(wait=wait, cancel_futures=True)
+        self.session.close()
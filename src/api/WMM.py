@@ -0,0 +1,141 @@
+import io
+import os
+import datetime
+
+import numpy as np
+
+# World Magnetic Model evaluator, offline alternative to the NGDC web calculator. The coefficient file is the
+# official NOAA/NCEI WMM.COF (WMM-2025, valid 2025.0 - 2030.0), see "The US/UK World Magnetic Model for 2025-2030:
+# Technical Report" for the equations used below.
+
+COEFFICIENT_FILE = os.path.join(os.path.dirname(__file__), "WMM.COF")
+# WGS 84 ellipsoid
+SEMI_MAJOR_AXIS_KM = 6378.137
+FLATTENING = 1.0 / 298.257223563
+ECCENTRICITY_SQUARED = FLATTENING * (2.0 - FLATTENING)
+# geomagnetic reference radius
+REFERENCE_RADIUS_KM = 6371.2
+VALIDITY_YEARS = 5.0
+
+model = None
+
+
+class WorldMagneticModel:
+    def __init__(self, file_path: str = COEFFICIENT_FILE):
+        with io.open(file_path, "r", encoding="utf-8") as f:
+            header = f.readline().split()
+            self.epoch = float(header[0])
+            self.name = header[1]
+            rows = []
+            for line in f:
+                values = line.split()
+                if len(values) < 6 or values[0].startswith("9999"):
+                    break
+                rows.append([float(x) for x in values[0:6]])
+        rows = np.array(rows)
+        self.degree = int(rows[:, 0].max())
+        size = self.degree + 1
+        self.g = np.zeros((size, size))
+        self.h = np.zeros((size, size))
+        self.g_dot = np.zeros((size, size))
+        self.h_dot = np.zeros((size, size))
+        n = rows[:, 0].astype(int)
+        m = rows[:, 1].astype(int)
+        self.g[n, m] = rows[:, 2]
+        self.h[n, m] = rows[:, 3]
+        self.g_dot[n, m] = rows[:, 4]
+        self.h_dot[n, m] = rows[:, 5]
+
+    def is_valid(self, year: float) -> bool:
+        return self.epoch <= year < self.epoch + VALIDITY_YEARS
+
+    def get_field(self, lat, lon, year, height: float = 0.0):
+        # North (X), east (Y) and down (Z) components in nT for geodetic latitudes / longitudes in degrees, decimal
+        # years and heights in km above the ellipsoid. All arguments broadcast against each other.
+        lat, lon, year, height = np.broadcast_arrays(*[np.asarray(x, dtype=np.float64) for x in (lat, lon, year,
+                                                                                                 height)])
+        shape = lat.shape
+        lat, lon, year, height = [x.ravel() for x in (lat, lon, year, height)]
+        phi = np.radians(lat)
+        lam = np.radians(lon)
+        # geodetic to geocentric spherical coordinates
+        sin_phi = np.sin(phi)
+        curvature_radius = SEMI_MAJOR_AXIS_KM / np.sqrt(1.0 - ECCENTRICITY_SQUARED * sin_phi * sin_phi)
+        p = (curvature_radius + height) * np.cos(phi)
+        z = (curvature_radius * (1.0 - ECCENTRICITY_SQUARED) + height) * sin_phi
+        r = np.sqrt(p * p + z * z)
+        phi_c = np.arcsin(z / r)
+        # secular variation, coefficients have shape (n, m, points)
+        dt = (year - self.epoch)[np.newaxis, np.newaxis]
+        g = self.g[..., np.newaxis] + dt * self.g_dot[..., np.newaxis]
+        h = self.h[..., np.newaxis] + dt * self.h_dot[..., np.newaxis]
+        legendre, legendre_derivative = self.get_legendre(phi_c)
+        m = np.arange(self.degree + 1)[:, np.newaxis]
+        cos_m_lam = np.cos(m * lam[np.newaxis])
+        sin_m_lam = np.sin(m * lam[np.newaxis])
+        x_c = np.zeros_like(r)
+        y_c = np.zeros_like(r)
+        z_c = np.zeros_like(r)
+        ratio = REFERENCE_RADIUS_KM / r
+        for n in range(1, self.degree + 1):
+            factor = ratio ** (n + 2)
+            gh_cos = g[n, :n + 1] * cos_m_lam[:n + 1] + h[n, :n + 1] * sin_m_lam[:n + 1]
+            gh_sin = g[n, :n + 1] * sin_m_lam[:n + 1] - h[n, :n + 1] * cos_m_lam[:n + 1]
+            x_c -= factor * np.sum(gh_cos * legendre_derivative[n, :n + 1], axis=0)
+            y_c += factor * np.sum(m[:n + 1] * gh_sin * legendre[n, :n + 1], axis=0)
+            z_c -= (n + 1) * factor * np.sum(gh_cos * legendre[n, :n + 1], axis=0)
+        y_c /= np.cos(phi_c)
+        # rotate back to the ellipsoidal reference frame
+        delta = phi_c - phi
+        x = x_c * np.cos(delta) - z_c * np.sin(delta)
+        z = x_c * np.sin(delta) + z_c * np.cos(delta)
+        return x.reshape(shape), y_c.reshape(shape), z.reshape(shape)
+
+    def get_legendre(self, phi_c: np.ndarray):
+        # Schmidt semi-normalized associated Legendre functions P(n, m) of sin(phi_c) and their derivatives with
+        # respect to phi_c, shape (n, m, points)
+        size = self.degree + 1
+        cos_theta = np.sin(phi_c)
+        sin_theta = np.cos(phi_c)
+        legendre = np.zeros((size, size) + phi_c.shape)
+        derivative = np.zeros((size, size) + phi_c.shape)
+        legendre[0, 0] = 1.0
+        for n in range(1, size):
+            # diagonal from the previous diagonal element
+            scale = 1.0 if n == 1 else np.sqrt((2.0 * n - 1.0) / (2.0 * n))
+            legendre[n, n] = scale * sin_theta * legendre[n - 1, n - 1]
+            derivative[n, n] = scale * (cos_theta * legendre[n - 1, n - 1] + sin_theta * derivative[n - 1, n - 1])
+            for m in range(n):
+                k = np.sqrt(n * n - m * m)
+                previous = np.sqrt((n - 1) * (n - 1) - m * m) if n >= 2 else 0.0
+                legendre[n, m] = ((2 * n - 1) * cos_theta * legendre[n - 1, m] - previous * legendre[n - 2, m]) / k
+                derivative[n, m] = ((2 * n - 1) * (cos_theta * derivative[n - 1, m] - sin_theta * legendre[n - 1, m])
+                                    - previous * derivative[n - 2, m]) / k
+        # derivatives were taken with respect to the colatitude theta
+        return legendre, -derivative
+
+    def get_declinations(self, lat, lon, year, height: float = 0.0) -> np.ndarray:
+        # Declination in degrees, positive east
+        x, y, _ = self.get_field(lat, lon, year, height)
+        return np.degrees(np.arctan2(y, x))
+
+
+def get_decimal_year(date: datetime.date) -> float:
+    start = datetime.date(date.year, 1, 1)
+    days_in_year = (datetime.date(date.year + 1, 1, 1) - start).days
+    return date.year + (date - start).days / days_in_year
+
+
+def get_magnetic_declination(lat: float, lon: float) -> float:
+    # Drop-in replacement for NGDC.get_magnetic_declination
+    global model
+    if model is None:
+        model = WorldMagneticModel()
+    year = get_decimal_year(datetime.date.today())
+    if not model.is_valid(year):
+        print("[WARN] %s coefficients are not valid for %.2f" % (model.name, year))
+    return float(model.get_declinations(lat, lon, year))
+
+
+if __name__ == "__main__":
+    print(get_magnetic_declination(52.038264, 8.4764692))
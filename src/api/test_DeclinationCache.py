@@ -0,0 +1,26 @@
+from unittest import TestCase
+
+from api.DeclinationCache import DeclinationCache
+
+import math
+import time
+
+
+class TestDeclinationCache(TestCase):
+    def test_refresh(self):
+        values = [2.5, 3.0]
+        cache = DeclinationCache(52.0, 8.5, lambda lat, lon: values.pop(0) if len(values) > 1 else values[0], 0.05)
+        self.assertEqual(cache.degrees, 2.5)
+        self.assertAlmostEqual(cache.radians, 2.5 * math.pi / 180.0)
+        time.sleep(0.2)
+        self.assertEqual(cache.degrees, 3.0)
+        cache.stop()
+
+    def test_failed_lookup(self):
+        def provider(lat: float, lon: float) -> float:
+            raise OSError("offline")
+
+        cache = DeclinationCache(52.0, 8.5, provider)
+        self.assertFalse(cache.valid)
+        self.assertEqual(cache.radians, 0.0)
+        cache.stop()
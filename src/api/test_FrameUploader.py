@@ -0,0 +1,130 @@
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from unittest import TestCase
+
+from api.FrameUploader import FrameUploader
+from sensors.Camera import Camera
+from sensors.FakeCamera import FakeCamera
+
+import os
+import shutil
+import tempfile
+import threading
+import time
+
+
+class UploadHandler(BaseHTTPRequestHandler):
+    def do_POST(self):
+        body = self.rfile.read(int(self.headers["Content-Length"]))
+        server = self.server
+        with server.lock:
+            server.requests += 1
+            fail = server.requests <= server.failures
+            if not fail:
+                server.uploads.append(body)
+        self.send_response(server.failure_status if fail else 200)
+        if fail and server.retry_after is not None:
+            self.send_header("Retry-After", server.retry_after)
+        self.send_header("Content-Length", "0")
+        self.end_headers()
+
+    def log_message(self, format, *args):
+        pass
+
+
+class TestFrameUploader(TestCase):
+    def setUp(self):
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), UploadHandler)
+        self.server.lock = threading.Lock()
+        self.server.requests = 0
+        self.server.failures = 0
+        self.server.failure_status = 503
+        self.server.retry_after = None
+        self.server.uploads = []
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+        self.url = "http://127.0.0.1:%s/upload" % self.server.server_address[1]
+        self.spool_path = tempfile.mkdtemp()
+        self.camera = Camera(FakeCamera(), (32, 24), settle_time=0.0)
+
+    def tearDown(self):
+        self.server.shutdown()
+        self.server.server_close()
+        shutil.rmtree(self.spool_path)
+
+    def wait_for_uploads(self, uploader: FrameUploader):
+        for _ in range(200):
+            if uploader.pending_count == 0:
+                return
+            time.sleep(0.01)
+
+    def test_upload(self):
+        uploader = FrameUploader(self.url, self.spool_path, workers=2, backoff=0.01)
+        for _ in range(5):
+            uploader.submit(self.camera.capture())
+        self.wait_for_uploads(uploader)
+        uploader.close()
+        self.assertEqual(uploader.uploaded, 5)
+        self.assertEqual(len(self.server.uploads), 5)
+        self.assertTrue(all(b"\x89PNG" in body for body in self.server.uploads))
+        self.assertEqual(os.listdir(self.spool_path), [])
+
+    def test_retry(self):
+        self.server.failures = 2
+        uploader = FrameUploader(self.url, self.spool_path, workers=1, backoff=0.01)
+        uploader.submit(self.camera.capture())
+        self.wait_for_uploads(uploader)
+        uploader.close()
+        self.assertEqual(self.server.requests, 3)
+        self.assertEqual(uploader.uploaded, 1)
+
+    def test_retry_after(self):
+        self.server.failures = 2
+        self.server.failure_status = 429
+        self.server.retry_after = "0"
+        # the server's Retry-After replaces the long backoff
+        uploader = FrameUploader(self.url, self.spool_path, workers=1, backoff=60.0)
+        uploader.submit(self.camera.capture())
+        self.wait_for_uploads(uploader)
+        uploader.close()
+        self.assertEqual(self.server.requests, 3)
+        self.assertEqual(uploader.uploaded, 1)
+
+    def test_rejected(self):
+        self.server.failures = 1
+        self.server.failure_status = 400
+        uploader = FrameUploader(self.url, self.spool_path, workers=1, backoff=0.01)
+        uploader.submit(self.camera.capture())
+        self.wait_for_uploads(uploader)
+        uploader.close()
+        self.assertEqual(self.server.requests, 1)
+        self.assertEqual(uploader.failed, 1)
+        self.assertEqual(os.listdir(self.spool_path), [])
+
+    def test_close_during_backoff(self):
+        self.server.failures = 1000
+        uploader = FrameUploader(self.url, self.spool_path, workers=1, backoff=30.0)
+        uploader.submit(self.camera.capture())
+        for _ in range(200):
+            if self.server.requests > 0:
+                break
+            time.sleep(0.01)
+        start = time.perf_counter()
+        uploader.close(wait=False)
+        uploader.executor.shutdown(wait=True)
+        self.assertLess(time.perf_counter() - start, 5.0)
+        # the frame is kept for the next start
+        self.assertEqual(len(os.listdir(self.spool_path)), 1)
+
+    def test_spool_resumed_and_bounded(self):
+        self.server.failures = 1000
+        uploader = FrameUploader(self.url, self.spool_path, workers=1, max_spool_files=3, max_retries=0)
+        for _ in range(6):
+            uploader.submit(self.camera.capture())
+        self.wait_for_uploads(uploader)
+        uploader.close()
+        self.assertGreaterEqual(uploader.dropped, 1)
+        self.assertLessEqual(len(os.listdir(self.spool_path)), 3)
+        self.server.failures = 0
+        uploader = FrameUploader(self.url, self.spool_path, workers=1)
+        self.wait_for_uploads(uploader)
+        uploader.close()
+        self.assertEqual(os.listdir(self.spool_path), [])
@@ -0,0 +1,33 @@
+from unittest import TestCase
+
+from api import WMM
+
+import datetime
+
+import numpy as np
+
+
+class TestWMM(TestCase):
+    def setUp(self):
+        self.model = WMM.WorldMagneticModel()
+
+    def test_get_declinations(self):
+        # lat, lon, height (km), year, declination (degrees)
+        expected = np.array([
+            [89.0, -121.0, 28.0, 2025.0, -99.7746],
+            [80.0, -96.0, 48.0, 2025.0, -29.9122],
+            [-80.0, -145.0, 0.0, 2027.5, 90.2354],
+            [52.038264, 8.4764692, 0.0, 2026.0, 3.6855],
+            [0.0, 120.0, 0.0, 2029.0, -0.2914]
+        ])
+        declinations = self.model.get_declinations(expected[:, 0], expected[:, 1], expected[:, 3], expected[:, 2])
+        np.testing.assert_allclose(declinations, expected[:, 4], atol=1e-4)
+
+    def test_scalar(self):
+        declination = self.model.get_declinations(52.038264, 8.4764692, 2026.0)
+        self.assertEqual(declination.shape, ())
+        self.assertAlmostEqual(float(declination), 3.6855, places=4)
+
+    def test_get_decimal_year(self):
+        self.assertEqual(WMM.get_decimal_year(datetime.date(2026, 1, 1)), 2026.0)
+        self.assertAlmostEqual(WMM.get_decimal_year(datetime.date(2028, 7, 2)), 2028.5, places=2)
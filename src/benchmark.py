@@ -0,0 +1,105 @@
+#!/usr/bin/env python3
+
+import time
+from typing import Callable
+
+import numpy as np
+
+from wpiio import I2CBus
+from wpiio.MCP23017 import MCP23017
+from wpiio.simulation.SimulatedBus import SimulatedBus
+from wpiio.simulation.SimulatedBME280 import SimulatedBME280
+from wpiio.simulation.SimulatedGY271 import SimulatedGY271
+from wpiio.simulation.SimulatedMCP23017 import SimulatedMCP23017
+from wpiio.simulation.SimulatedSI1145 import SimulatedSI1145
+from sensors import BoschBatchCompensation, BoschCompensation
+from sensors.BME280 import BME280
+from sensors.GY271 import GY271
+from sensors.SI1145 import SI1145
+
+
+def benchmark(name: str, bus: SimulatedBus, function: Callable, iterations: int):
+    bus.reset_statistics()
+    start = time.perf_counter()
+    for _ in range(iterations):
+        function()
+    duration = time.perf_counter() - start
+    print("%-24s %10.1f samples/s %10.2f us/sample %6.1f transactions/sample" % (
+        name, iterations / duration, duration / iterations * 1000000.0, bus.transactions / iterations))
+
+
+def benchmark_drivers(latency: float, iterations: int):
+    # Per transaction latency of a 100 kHz bus is roughly 0.1 - 0.3 ms
+    bus = SimulatedBus(latency)
+    bus.attach(SimulatedBME280())
+    bus.attach(SimulatedSI1145())
+    bus.attach(SimulatedMCP23017())
+    bus.attach(SimulatedGY271()).set_field(-1200, 800, 300)
+    I2CBus.set_bus_factory(lambda bus_number: bus)
+    bme280_sensor = BME280()
+    gy271_sensor = GY271({"location": {"lat": 52.0, "lon": 8.5},
+                          "compass": {"calibration_offset": [0, 0], "calibration_norm_factor": [1, 1]}},
+                         lambda lat, lon: 3.0)
+    si1145_sensor = SI1145()
+    gpio_extender = MCP23017()
+    print("Simulated bus latency: %s ms" % (latency * 1000.0))
+    benchmark("BME280.read", bus, bme280_sensor.read, iterations)
+    benchmark("BME280.measure", bus, bme280_sensor.measure, max(iterations // 20, 1))
+    benchmark("SI1145 vis/ir/uv", bus, lambda: (si1145_sensor.get_als_vis_data(), si1145_sensor.get_als_ir_data(),
+                                                si1145_sensor.get_aux_data()), iterations)
+    benchmark("SI1145.read_measurement", bus, si1145_sensor.read_measurement, iterations)
+    benchmark("MCP23017.read_ports", bus, gpio_extender.read_ports, iterations)
+    benchmark("GY271.read", bus, gy271_sensor.read, iterations)
+    gy271_sensor.close()
+    I2CBus.set_bus_factory(None)
+
+
+def benchmark_batch_compensation(num_samples: int):
+    bus = SimulatedBus()
+    bus.attach(SimulatedBME280())
+    I2CBus.set_bus_factory(lambda bus_number: bus)
+    sensor = BME280()
+    random = np.random.default_rng()
+    raw_pressure = random.integers(250000, 500000, num_samples)
+    raw_temperature = random.integers(400000, 600000, num_samples)
+    raw_humidity = random.integers(0, 65536, num_samples)
+    start = time.perf_counter()
+    for p, t, h in zip(raw_pressure.tolist(), raw_temperature.tolist(), raw_humidity.tolist()):
+        _, t_fine = sensor.refine_temperature(t)
+        sensor.refine_pressure(p, t_fine)
+        sensor.refine_humidity(h, t_fine)
+    scalar_duration = time.perf_counter() - start
+    start = time.perf_counter()
+    BoschBatchCompensation.refine(sensor, raw_pressure, raw_temperature, raw_humidity)
+    batch_duration = time.perf_counter() - start
+    print("BME280 compensation of %s samples: scalar %.3f s, batch %.3f s (x%.1f)" % (
+        num_samples, scalar_duration, batch_duration, scalar_duration / batch_duration))
+    I2CBus.set_bus_factory(None)
+
+
+def benchmark_compensation_modes(num_samples: int):
+    # Per sample cost of the float and fixed point compensation formulas
+    bus = SimulatedBus()
+    bus.attach(SimulatedBME280())
+    I2CBus.set_bus_factory(lambda bus_number: bus)
+    sensor = BME280()
+    random = np.random.default_rng()
+    raw_pressure = random.integers(250000, 500000, num_samples).tolist()
+    raw_temperature = random.integers(400000, 600000, num_samples).tolist()
+    raw_humidity = random.integers(0, 65536, num_samples).tolist()
+    for mode in BoschCompensation.COMPENSATION_MODES:
+        start = time.perf_counter()
+        for p, t, h in zip(raw_pressure, raw_temperature, raw_humidity):
+            _, t_fine = BoschCompensation.refine_temperature(sensor, t)
+            BoschCompensation.refine_pressure(sensor, p, t_fine, mode)
+            BoschCompensation.refine_humidity(sensor, h, t_fine, mode)
+        duration = time.perf_counter() - start
+        print("BME280 %-5s compensation %10.2f us/sample" % (mode, duration / num_samples * 1000000.0))
+    I2CBus.set_bus_factory(None)
+
+
+if __name__ == "__main__":
+    benchmark_drivers(0.0, 10000)
+    benchmark_drivers(0.0002, 1000)
+    benchmark_batch_compensation(1000000)
+    benchmark_compensation_modes(100000)
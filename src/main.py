@@ -1,89 +1,290 @@
 #!/usr/bin/env python3
 
-import tempfile
-import shutil
+import asyncio
+from concurrent.futures import Future
 import io
+import os
 import csv
+import math
 import time
-from typing import Dict
-import requests
+from typing import Callable, Dict, Optional, Tuple
+import numpy as np
 
-from utils.PressureUtils import adjust_to_mean_sea_level
+from api import NGDC, WMM
+from api.FrameUploader import FrameUploader
+from utils.PressureUtils import SeaLevelReducer
 from wpiio.MCP23017 import MCP23017
 from sensors.BME280 import BME280
 from sensors.DigitalOnOffSensor import DigitalOnOffSensor
-from sensors.SI1145 import SI1145
+from sensors.SI1145 import SI1145, SI1145Measurement
 from sensors.GY271 import GY271
-from sensors.Camera import Camera
+from sensors.Camera import Camera, CameraFrame
 from sensors.RainDetector import RainDetector
-from utils import CompassUtils
+from sensors.Anemometer import Anemometer
+from sensors.RainGauge import RainGauge
+from utils import CompassUtils, SkyAnalysis, SolarUtils
+from utils.AppUtils import get_appdata_path
+from utils.DeviceStartup import DeviceStartup
+from utils.FrameChangeDetector import FrameChangeDetector
+from utils.MagnetometerCalibration import EllipsoidCalibrator
+from utils.RawSampleArchive import RawSampleArchive
+from utils.SamplingScheduler import SamplingScheduler
+from utils.SolarUtils import SolarSchedule
 
 
-def light_sensor():
-    si1145_sensor = SI1145()
+def light_handler(si1145_sensor: SI1145, readings: Dict) -> Callable[[SI1145Measurement], None]:
+    def handle(measurement: SI1145Measurement):
+        readings["uv_index"] = si1145_sensor.last_uv_index
+        readings["ir"] = measurement.ir
+        readings["visible_light"] = measurement.vis
+        readings["visible_lux"] = si1145_sensor.last_vis_lux
+        readings["ir_lux"] = si1145_sensor.last_ir_lux
+
+    return handle
+
+
+def light_sensor(scheduler: SamplingScheduler, config: Dict, readings: Dict) -> SI1145:
+    si1145_sensor = SI1145(config["sampling"]["si1145_auto_range"])
     print("SI1145 ID: %s, valid: %s" % (hex(si1145_sensor.chip_id), si1145_sensor.is_chip_id_valid()))
-    try:
-        while True:
-            time.sleep(1)
-            print("SI1145 UV index: %s" % (si1145_sensor.get_aux_data() * 0.01))
-            print("SI1145 IR: %s" % (si1145_sensor.get_als_ir_data()))
-            print("SI1145 visible light: %s" % (si1145_sensor.get_als_vis_data()))
-    except KeyboardInterrupt:
-        pass
+    if config["sampling"]["si1145_int_pin"] is None:
+        interval = max(si1145_sensor.get_interval_time(), config["sampling"]["min_interval"])
+        scheduler.add("SI1145", interval, si1145_sensor.read_measurement, light_handler(si1145_sensor, readings))
+    return si1145_sensor
+
 
+def light_interrupts(si1145_sensor: SI1145, config: Dict, readings: Dict):
+    # Every autonomous measurement is delivered from the INT edge, nothing to schedule. The chip paces itself, so
+    # the minimum interval goes into its measure rate.
+    measure_rate = max(0xFF, SI1145.get_measure_rate_for_interval(config["sampling"]["min_interval"]))
+    si1145_sensor.start_autonomous(config["sampling"]["si1145_int_pin"], light_handler(si1145_sensor, readings),
+                                   measure_rate)
 
-def temperature_sensor(config: Dict):
+
+def temperature_sensor(scheduler: SamplingScheduler, config: Dict, readings: Dict) -> BME280:
     bme280_sensor = BME280()
     print("BME280 ID: %s, valid: %s" % (hex(bme280_sensor.chip_id), bme280_sensor.is_chip_id_valid()))
-    bme280_sensor.start(BME280.CONTROL_MODE_NORMAL)
-    try:
-        while True:
-            time.sleep(1)
-            pressure_mean_sea_level = adjust_to_mean_sea_level(bme280_sensor.pressure, config["location"]["height"],
-                                                               config["location"]["lat"], bme280_sensor.temperature)
-            print("Temperature : %.4f°C, Pressure : %.4fhPa (%.4fhPa mean sea level), Humidity : %.4f%%" % (
-                bme280_sensor.temperature, bme280_sensor.pressure, pressure_mean_sea_level, bme280_sensor.humidity))
-    except KeyboardInterrupt:
-        pass
-    bme280_sensor.stop()
+    forced_interval = config["sampling"]["bme280_forced_interval"]
+    if forced_interval is None:
+        bme280_sensor.start(BME280.CONTROL_MODE_NORMAL)
+    sea_level_reducer = SeaLevelReducer(config["location"]["height"], config["location"]["lat"])
+
+    def handle(_):
+        readings["temperature"] = bme280_sensor.last_temperature
+        readings["pressure"] = bme280_sensor.last_pressure
+        readings["pressure_mean_sea_level"] = sea_level_reducer.reduce(bme280_sensor.last_pressure,
+                                                                       bme280_sensor.last_temperature)
+        readings["humidity"] = bme280_sensor.last_humidity
+
+    if forced_interval is None:
+        interval = max(bme280_sensor.get_interval_time(), config["sampling"]["min_interval"])
+        scheduler.add("BME280", interval, bme280_sensor.read, handle)
+    else:
+        # one conversion per sample, the sensor sleeps in between
+        scheduler.add("BME280", forced_interval, bme280_sensor.measure, handle)
+    return bme280_sensor
 
 
-def compass_sensor(config: Dict):
-    gy271_sensor = GY271(config)
+def compass_sensor(scheduler: SamplingScheduler, config: Dict, readings: Dict) -> Tuple[GY271, Dict]:
+    if config["compass"]["declination_source"] == "wmm":
+        gy271_sensor = GY271(config, WMM.get_magnetic_declination)
+    else:
+        gy271_sensor = GY271(config, NGDC.get_magnetic_declination)
     gy271_sensor.start()
-    min_x = 0
-    max_x = 0
-    min_y = 0
-    max_y = 0
-    points = []
+    calibration = {"calibrator": EllipsoidCalibrator(), "points": []}
+
+    def sample():
+        gy271_sensor.read()
+        return gy271_sensor.last_x, gy271_sensor.last_y, gy271_sensor.last_z, gy271_sensor.last_temperature
+
+    def handle(raw):
+        readings["heading_degrees"] = gy271_sensor.last_heading_degrees
+        readings["compass_raw"] = raw
+        calibration["calibrator"].add(*gy271_sensor.last_uncalibrated)
+        calibration["points"].append(gy271_sensor.last_uncalibrated)
+
+    interval = max(gy271_sensor.get_interval_time(), config["sampling"]["min_interval"])
+    scheduler.add("GY271", interval, sample, handle)
+    return gy271_sensor, calibration
+
+
+def weather_pulse_counters(scheduler: SamplingScheduler, config: Dict, readings: Dict) -> Tuple[Anemometer, RainGauge]:
+    # Pulses are counted from GPIO edge callbacks, the scheduler only evaluates the buffered timestamps
+    anemometer = Anemometer(config["pulse_counters"]["anemometer_pin"])
+    rain_gauge = RainGauge(config["pulse_counters"]["rain_gauge_pin"])
+
+    def handle(_):
+        readings["wind_speed"] = anemometer.get_speed()
+        readings["wind_gust"] = anemometer.get_gust_speed()
+        readings["rainfall_hour"] = rain_gauge.get_rainfall()
+        readings["rain_rate"] = rain_gauge.get_rain_rate()
+
+    scheduler.add("PulseCounters", config["sampling"]["report_interval"], lambda: None, handle)
+    return anemometer, rain_gauge
+
+
+def rain_sensor(scheduler: SamplingScheduler, config: Dict, readings: Dict) -> RainDetector:
+    # The detector tracks its state from edge callbacks, the report only copies the accumulated values
+    rain_detector = RainDetector(config["rain_detector"]["pin"], config["rain_detector"]["debounce"])
+
+    def handle(_):
+        readings["rain_detected"] = rain_detector.rain_detected
+        readings["rain_duration_hour"] = rain_detector.get_rain_duration_hour()
+        readings["rain_duration_day"] = rain_detector.get_rain_duration_day()
+
+    scheduler.add("RainDetector", config["sampling"]["report_interval"], lambda: None, handle)
+    return rain_detector
+
+
+def write_compass_calibration(calibration: Dict):
     try:
-        while True:
-            raw = gy271_sensor.raw
-            degrees = gy271_sensor.heading_degrees
-            heading_str = CompassUtils.degrees_to_string(degrees)
-            cardinal_point_8 = CompassUtils.get_cardinal_point(degrees, 8)
-            cardinal_point_16 = CompassUtils.get_cardinal_point(degrees, 16)
-            cardinal_point_32 = CompassUtils.get_cardinal_point(degrees, 32)
-            print("GY271 heading %s / %s / %s (%s) - raw [x: %s, y: %s, z: %s, rel. tmp: %s]" % (
-                cardinal_point_8, cardinal_point_16, cardinal_point_32, heading_str, raw[0], raw[1], raw[2], raw[3]))
-            min_x = min(min_x, raw[0])
-            min_y = min(min_y, raw[1])
-            max_x = max(max_x, raw[0])
-            max_y = max(max_y, raw[1])
-            points.append(raw[0:3])
-            time.sleep(0.1)
-    except KeyboardInterrupt:
-        pass
-    gy271_sensor.stop()
-    print("GY271 calibration range [%s, %s, %s, %s] offset [%s, %s]" % (
-        min_x, min_y, max_x, max_y, (max_x + min_x) * 0.5, (max_y + min_y) * 0.5))
+        matrix = calibration["calibrator"].solve()
+        print("GY271 calibration matrix %s" % matrix.tolist())
+    except (ValueError, np.linalg.LinAlgError) as e:
+        print("GY271 calibration failed: %s" % e)
     with io.open("/home/pi/calibration.csv", "w", encoding="utf-8") as f:
         writer = csv.writer(f, delimiter=",", quotechar="\"")
         writer.writerow(["x", "y", "z"])
-        for point in points:
+        for point in calibration["points"]:
             writer.writerow(point)
 
 
+def print_readings(readings: Dict):
+    if "visible_light" in readings:
+        print("SI1145 UV index: %s" % readings["uv_index"])
+        print("SI1145 IR: %s" % readings["ir"])
+        print("SI1145 visible light: %s" % readings["visible_light"])
+        print("SI1145 %s lux visible, %s lux IR" % (readings["visible_lux"], readings["ir_lux"]))
+    if "temperature" in readings:
+        print("Temperature : %.4f°C, Pressure : %.4fhPa (%.4fhPa mean sea level), Humidity : %.4f%%" % (
+            readings["temperature"], readings["pressure"], readings["pressure_mean_sea_level"],
+            readings["humidity"]))
+    if "wind_speed" in readings:
+        print("Wind %.1fm/s (gusts %.1fm/s), rain %.2fmm in the last hour (%.2fmm/h)" % (
+            readings["wind_speed"], readings["wind_gust"], readings["rainfall_hour"], readings["rain_rate"]))
+    if "rain_detected" in readings:
+        print("Rain: %s, %.0fs this hour, %.0fs today" % (
+            readings["rain_detected"], readings["rain_duration_hour"], readings["rain_duration_day"]))
+    if "cloud_fraction" in readings:
+        print("Sky %s, brightness: %.3f, cloud fraction: %.2f" % (
+            "day" if readings["is_day"] else "night", readings["sky_brightness"], readings["cloud_fraction"]))
+    if "heading_degrees" in readings:
+        degrees = readings["heading_degrees"]
+        raw = readings["compass_raw"]
+        heading_str = CompassUtils.degrees_to_string(degrees)
+        cardinal_point_8 = CompassUtils.get_cardinal_point(degrees, 8)
+        cardinal_point_16 = CompassUtils.get_cardinal_point(degrees, 16)
+        cardinal_point_32 = CompassUtils.get_cardinal_point(degrees, 32)
+        print("GY271 heading %s / %s / %s (%s) - raw [x: %s, y: %s, z: %s, rel. tmp: %s]" % (
+            cardinal_point_8, cardinal_point_16, cardinal_point_32, heading_str, raw[0], raw[1], raw[2], raw[3]))
+
+
+def sky_camera(scheduler: SamplingScheduler, config: Dict, readings: Dict) -> Dict:
+    camera_sensor = Camera()
+    uploader = FrameUploader(config["camera"]["upload_url"], config["camera"]["spool_path"],
+                             config["camera"]["headers"])
+    detector = FrameChangeDetector(config["camera"]["change_threshold"], config["camera"]["max_skipped_frames"])
+    schedule = SolarSchedule(config["location"]["lat"], config["location"]["lon"])
+    last_capture = {"time": -math.inf}
+    # the analysis is CPU bound, a separate process keeps it from competing with the sampling threads for the GIL
+    analysis_pool = SkyAnalysis.create_analysis_pool()
+
+    def publish_sky_conditions(future: Future):
+        if future.exception() is not None:
+            print("[WARN] Sky analysis failed: %s" % future.exception())
+            return
+        conditions = future.result()
+        readings["cloud_fraction"] = conditions.cloud_fraction
+        readings["sky_brightness"] = conditions.brightness
+        readings["is_day"] = conditions.is_day
+
+    def sample() -> Optional[CameraFrame]:
+        phase = schedule.get_phase()
+        readings["sun_phase"] = phase
+        if phase not in [SolarUtils.DAY, SolarUtils.CIVIL_TWILIGHT]:
+            night_interval = config["camera"]["night_interval"]
+            if night_interval is None or time.monotonic() - last_capture["time"] < night_interval:
+                # nothing to see, don't keep the sensor powered until the next capture
+                camera_sensor.stop()
+                return None
+        last_capture["time"] = time.monotonic()
+        camera_sensor.set_exposure_mode(Camera.get_exposure_by_sun_phase(phase))
+        # a small unencoded capture decides whether the full frame is worth encoding and uploading
+        thumbnail = camera_sensor.capture("rgb", detector.thumbnail_size)
+        analysis_pool.submit(SkyAnalysis.analyze_rgb, thumbnail.data,
+                             detector.thumbnail_size).add_done_callback(publish_sky_conditions)
+        return camera_sensor.capture() if detector.update_from_rgb(thumbnail.data) else None
+
+    def handle(frame: Optional[CameraFrame]):
+        readings["camera_dropped_frames"] = detector.dropped
+        readings["camera_frame_difference"] = detector.last_difference
+        if frame is None:
+            return
+        # only spools the frame, the upload runs on the uploader's own threads
+        uploader.submit(frame)
+        readings["camera_latency"] = frame.latency
+        readings["camera_pending_uploads"] = uploader.pending_count
+
+    scheduler.add("Camera", config["camera"]["interval"], sample, handle)
+    return {"camera": camera_sensor, "uploader": uploader, "detector": detector, "analysis_pool": analysis_pool}
+
+
+def close_sky_camera(sky: Dict):
+    sky["camera"].close()
+    sky["detector"].print_statistics()
+    sky["analysis_pool"].shutdown(wait=True)
+    sky["uploader"].close(wait=False)
+
+
+def station(config: Dict):
+    # All sensors are sampled at their native cadence from a single event loop, readings are printed once per
+    # report interval.
+    scheduler = SamplingScheduler()
+    readings = {}
+    # The I2C sensors and the camera settle independently, they start concurrently. The GPIO devices (including the
+    # SI1145 INT line) are cheap and stay on this thread, gpiozero creates its default pin factory on first use.
+    startup = DeviceStartup()
+    startup.add("SI1145", lambda: light_sensor(scheduler, config, readings), SI1145.close)
+    startup.add("BME280", lambda: temperature_sensor(scheduler, config, readings), BME280.close)
+    startup.add("GY271", lambda: compass_sensor(scheduler, config, readings), lambda compass: compass[0].close())
+    if config["camera"]["enabled"]:
+        startup.add("Camera", lambda: sky_camera(scheduler, config, readings), close_sky_camera)
+    try:
+        devices = startup.run()
+    finally:
+        startup.print_statistics()
+    si1145_sensor = devices["SI1145"]
+    if config["sampling"]["si1145_int_pin"] is not None:
+        light_interrupts(si1145_sensor, config, readings)
+    bme280_sensor = devices["BME280"]
+    gy271_sensor, compass_calibration = devices["GY271"]
+    sky = devices.get("Camera")
+    scheduler.add("report", config["sampling"]["report_interval"], lambda: None, lambda _: print_readings(readings))
+    pulse_counters = weather_pulse_counters(scheduler, config, readings) \
+        if config["pulse_counters"]["enabled"] else []
+    rain_detector = rain_sensor(scheduler, config, readings) if config["rain_detector"]["enabled"] else None
+    if config["archive"]["enabled"]:
+        for sensor in [si1145_sensor, bme280_sensor, gy271_sensor]:
+            sensor.archive = RawSampleArchive.for_device(sensor, config["archive"]["directory"])
+    try:
+        asyncio.run(scheduler.run())
+    except KeyboardInterrupt:
+        pass
+    scheduler.print_statistics()
+    bme280_sensor.stop()
+    gy271_sensor.stop()
+    write_compass_calibration(compass_calibration)
+    if sky is not None:
+        close_sky_camera(sky)
+    for counter in pulse_counters:
+        counter.close()
+    if rain_detector is not None:
+        rain_detector.close()
+    for sensor in [si1145_sensor, bme280_sensor, gy271_sensor]:
+        if sensor.archive is not None:
+            sensor.archive.close()
+        sensor.close()
+
+
 if __name__ == "__main__":
     config = {
        "location": {
@@ -93,36 +294,56 @@ if __name__ == "__main__":
        },
        "compass": {
            "calibration_offset": [803.0, 422.5],
-           "calibration_norm_factor": [1606, 263 + 1108]
+           "calibration_norm_factor": [1606, 263 + 1108],
+           "calibration_matrix": None,
+           # "wmm" evaluates the bundled World Magnetic Model offline, "ngdc" queries the NOAA web calculator
+           "declination_source": "wmm"
+       },
+       "sampling": {
+           "min_interval": 0.1,
+           "report_interval": 1.0,
+           # GPIO of the SI1145 INT output for interrupt driven autonomous measurements, None to poll
+           "si1145_int_pin": None,
+           # adapt the SI1145 VIS and IR gain to the light level, lux readings are gain normalized either way. The
+           # on-chip UV index only holds for the initial gain, it reads None while ranging moved away from it.
+           "si1145_auto_range": False,
+           # seconds between BME280 forced mode conversions, None to let the sensor run in normal mode
+           "bme280_forced_interval": None
+       },
+       "archive": {
+           "enabled": False,
+           "directory": os.path.join(get_appdata_path(), "archive")
+       },
+       "pulse_counters": {
+           "enabled": False,
+           "anemometer_pin": 5,
+           "rain_gauge_pin": 6
+       },
+       "rain_detector": {
+           "enabled": False,
+           "pin": 24,
+           # seconds the sensor output has to be stable before a change is taken over
+           "debounce": 5.0
+       },
+       "camera": {
+           "enabled": False,
+           "interval": 60,
+           "upload_url": "",
+           "headers": {
+               # 'authorization': "Bearer {token}"
+           },
+           "spool_path": os.path.join(get_appdata_path(), "spool"),
+           # mean luma difference (0-255) to the last uploaded frame below which frames are dropped
+           "change_threshold": 4.0,
+           # upload at least every n+1-th frame
+           "max_skipped_frames": 10,
+           # seconds between captures while the sun is below civil twilight, None to not capture at night
+           "night_interval": 900
        }
     }
-    light_sensor()
-    # temperature_sensor(config)
-    # compass_sensor(config)
-    # camera_sensor = Camera()
-    # target_path = tempfile.mkdtemp()
-    # url = ""
-    # headers = {
-    #    # 'authorization': "Bearer {token}"
-    # }
-    # try:
-    #    while True:
-    #        print('Capture...')
-    #        file_path = camera_sensor.snapshot(target_path)
-    #        files = {'image': open(file_path, 'rb')}
-    #        response = requests.request("POST", url, files=files, headers=headers)
-    #        print('Captured', file_path)
-    #        print('\t', response.status_code, response.text)
-    #        time.sleep(60)
-    # except KeyboardInterrupt:
-    #    pass
-    # shutil.rmtree(target_path)
-    # camera_sensor.snapshot('/home/pi/')
-    # rain_detector = RainDetector(24)
-    # while True:
-    #    print("Rain:", rain_detector.rain_detected)
-    #    time.sleep(1)
+    station(config)
     # gpio_extender = MCP23017(0x24)
+    # gpio_extender.set_pins_input(*([True] * 16))
+    # gpio_extender.start_interrupts(23, lambda change: print("GPIO:", change))
     # while True:
-    #    print("GPIO:", format(gpio_extender.read_ports(), '016b'))
-    #    time.sleep(0.1)
+    #    time.sleep(1)
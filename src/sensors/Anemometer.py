@@ -0,0 +1,23 @@
+from typing import Optional
+
+from sensors.PulseCounter import PulseCounter
+
+
+class Anemometer(PulseCounter):
+    # Cup anemometer with a reed switch closing once or more per revolution
+    # longest evaluated window (s), 10 minutes after the WMO definition
+    WINDOW = 600.0
+
+    def __init__(self, pin: Optional[int] = None, speed_per_hertz: float = 0.667, debounce: float = 0.001,
+                 pin_factory=None):
+        # the common SparkFun/Argent cups give 2.4 km/h per pulse per second. Only the 10 minute mean and gust
+        # windows are evaluated, at a few hundred Hz a longer buffer just makes every report copy more timestamps.
+        super().__init__(pin, debounce, Anemometer.WINDOW, pin_factory)
+        self.speed_per_hertz = speed_per_hertz
+
+    def get_speed(self, window: float = WINDOW, now: Optional[float] = None) -> float:
+        # mean wind speed (m/s)
+        return self.get_rate(window, now) * self.speed_per_hertz
+
+    def get_gust_speed(self, gust_window: float = 3.0, window: float = WINDOW, now: Optional[float] = None) -> float:
+        return self.get_gust_rate(gust_window, window, now) * self.speed_per_hertz
@@ -1,9 +1,11 @@
+from sensors import BoschCompensation
 from wpiio.I2CDevice import I2CDevice
 import time
 
 
 class BME280(I2CDevice):
     DEFAULT_DEVICE_I2C_ADDRESS = 0x76
+    RAW_SAMPLE_SIZE = 8
 
     REGISTER_HUM_LSB = 0xFE
     REGISTER_HUM_MSB = 0xFD
@@ -94,6 +96,13 @@ class BME280(I2CDevice):
     # Normal mode: perpetual cycling of measurements and inactive periods
     CONTROL_MODE_NORMAL = 3
 
+    # Set while a conversion is running, cleared when the results are in the data registers
+    STATUS_MEASURING = 1 << 3
+    # Set while the NVM data is copied to the image registers
+    STATUS_IM_UPDATE = 1 << 0
+    # Delay between two reads of the status register while waiting for a forced conversion (s)
+    STATUS_POLL_INTERVAL = 0.0005
+
     def __init__(self):
         super().__init__(BME280.DEFAULT_DEVICE_I2C_ADDRESS)
         self.config_standby_sec_lookup = {
@@ -140,8 +149,10 @@ class BME280(I2CDevice):
         self.last_humidity = 0.0
         self.started = False
         self.last_measure_time = 0
+        # one of BoschCompensation.COMPENSATION_MODES, the integer modes avoid the floating point division chains
+        self.compensation = BoschCompensation.COMPENSATION_FLOAT
         self.chip_id = self.get_chip_id()
-        self.read_calibration()
+        self.calibration_data = BoschCompensation.read_calibration(self, True)
         time.sleep(0.002)
         self.write_config()
 
@@ -151,34 +162,6 @@ class BME280(I2CDevice):
     def is_chip_id_valid(self) -> bool:
         return self.chip_id == 0x60
 
-    def read_calibration(self):
-        # Read blocks of calibration data from EEPROM
-        cal1 = self.read_register(BME280.REGISTER_CALIBRATION_00, 24)
-        cal2 = self.read_register(BME280.REGISTER_CALIBRATION_25, 1)
-        cal3 = self.read_register(BME280.REGISTER_CALIBRATION_26, 7)
-        self.dig_T1 = self.get_ushort(cal1, 0)
-        self.dig_T2 = self.get_short(cal1, 2)
-        self.dig_T3 = self.get_short(cal1, 4)
-        self.dig_P1 = self.get_ushort(cal1, 6)
-        self.dig_P2 = self.get_short(cal1, 8)
-        self.dig_P3 = self.get_short(cal1, 10)
-        self.dig_P4 = self.get_short(cal1, 12)
-        self.dig_P5 = self.get_short(cal1, 14)
-        self.dig_P6 = self.get_short(cal1, 16)
-        self.dig_P7 = self.get_short(cal1, 18)
-        self.dig_P8 = self.get_short(cal1, 20)
-        self.dig_P9 = self.get_short(cal1, 22)
-        self.dig_H1 = self.get_uchar(cal2, 0)
-        self.dig_H2 = self.get_short(cal3, 0)
-        self.dig_H3 = self.get_uchar(cal3, 2)
-        self.dig_H4 = self.get_char(cal3, 3)
-        self.dig_H4 = (self.dig_H4 << 24) >> 20
-        self.dig_H4 = self.dig_H4 | (self.get_char(cal3, 4) & 0x0F)
-        self.dig_H5 = self.get_char(cal3, 5)
-        self.dig_H5 = (self.dig_H5 << 24) >> 20
-        self.dig_H5 = self.dig_H5 | (self.get_uchar(cal3, 4) >> 4 & 0x0F)
-        self.dig_H6 = self.get_char(cal3, 6)
-
     def write_config(self):
         config = self.config_standby << 5 | self.config_filter << 2 | self.config_spi
         self.write_register(BME280.REGISTER_CONFIG, config)
@@ -204,10 +187,43 @@ class BME280(I2CDevice):
     def wait_before_measure(self):
         time.sleep(self.get_max_measure_time())
 
+    @staticmethod
+    def get_oversampling_factor(oversample: int) -> int:
+        # OVERSAMPLE_X1 .. OVERSAMPLE_X16 select 1 .. 16 samples, OVERSAMPLE_SKIPPED none
+        return 1 << (oversample - 1) if oversample != BME280.OVERSAMPLE_SKIPPED else 0
+
+    def get_measure_time(self, base: float, per_sample: float, setup: float) -> float:
+        # measure time in ms (Appendix B: Measurement time and current calculation), skipped measurements don't
+        # need the pressure and humidity setup time
+        t = BME280.get_oversampling_factor(self.oversample_temperature)
+        p = BME280.get_oversampling_factor(self.oversample_pressure)
+        h = BME280.get_oversampling_factor(self.oversample_humidity)
+        return (base + per_sample * t + (per_sample * p + setup if p else 0) + (
+                per_sample * h + setup if h else 0)) / 1000.0
+
     def get_max_measure_time(self):
-        # measure time in ms (Appendix B: Measurement time and current calculation)
-        return (1.25 + (2.3 * self.oversample_temperature) + ((2.3 * self.oversample_pressure) + 0.575) + (
-                (2.3 * self.oversample_humidity) + 0.575)) / 1000.0
+        return self.get_measure_time(1.25, 2.3, 0.575)
+
+    def get_typical_measure_time(self):
+        return self.get_measure_time(1.0, 2.0, 0.5)
+
+    def measure(self):
+        # Forced mode conversion on demand. The chip sleeps between calls, so slow sample rates draw almost no
+        # current, and the result is read as soon as the measuring bit drops instead of after the worst case time.
+        self.mode = BME280.CONTROL_MODE_FORCED
+        self.write_register(BME280.REGISTER_CTRL_HUM, self.oversample_humidity)
+        self.write_register(BME280.REGISTER_CTRL_MEAS,
+                            self.oversample_temperature << 5 | self.oversample_pressure << 2 | self.mode)
+        start = time.perf_counter()
+        deadline = start + 2 * self.get_max_measure_time()
+        time.sleep(self.get_typical_measure_time())
+        while self.read_register(BME280.REGISTER_STATUS, 1)[0] & BME280.STATUS_MEASURING:
+            if time.perf_counter() > deadline:
+                raise TimeoutError("[BME280] Forced conversion did not finish within %.1f ms" % (
+                        (deadline - start) * 1000))
+            time.sleep(BME280.STATUS_POLL_INTERVAL)
+        self.last_measure_time = self.get_now()
+        self.read()
 
     def get_interval_time(self):
         return self.get_max_measure_time() + self.config_standby_sec_lookup[self.config_standby]
@@ -227,45 +243,20 @@ class BME280(I2CDevice):
     def read_raw_values(self) -> (int, int, int):
         # Read 8 bytes starting at pressure MSB up to humidity LSB
         data = self.read_register(BME280.REGISTER_PRESS_MSB, 8)
+        self.archive_raw_sample(data)
         raw_pressure = (data[0] << 12) | (data[1] << 4) | (data[2] >> 4)
         raw_temperature = (data[3] << 12) | (data[4] << 4) | (data[5] >> 4)
         raw_humidity = (data[6] << 8) | data[7]
         return raw_pressure, raw_temperature, raw_humidity
 
     def refine_temperature(self, raw_temperature: int) -> (float, int):
-        var1 = (((raw_temperature >> 3) - (self.dig_T1 << 1)) * self.dig_T2) >> 11
-        var3 = (raw_temperature >> 4) - self.dig_T1
-        var2 = (((var3 * var3) >> 12) * self.dig_T3) >> 14
-        t_fine = var1 + var2
-        temperature = float(((t_fine * 5) + 128) >> 8)
-        return temperature / 100.0, t_fine
+        return BoschCompensation.refine_temperature(self, raw_temperature)
 
     def refine_pressure(self, raw_pressure: int, t_fine: int) -> float:
-        # Refine pressure and adjust for temperature
-        var1 = t_fine / 2.0 - 64000.0
-        var2 = var1 * var1 * self.dig_P6 / 32768.0
-        var2 = var2 + var1 * self.dig_P5 * 2.0
-        var2 = var2 / 4.0 + self.dig_P4 * 65536.0
-        var1 = (self.dig_P3 * var1 * var1 / 524288.0 + self.dig_P2 * var1) / 524288.0
-        var1 = (1.0 + var1 / 32768.0) * self.dig_P1
-        if var1 == 0:
-            pressure = 0.0
-        else:
-            pressure = 1048576.0 - raw_pressure
-            pressure = ((pressure - var2 / 4096.0) * 6250.0) / var1
-            var1 = self.dig_P9 * pressure * pressure / 2147483648.0
-            var2 = pressure * self.dig_P8 / 32768.0
-            pressure = pressure + (var1 + var2 + self.dig_P7) / 16.0
-        return pressure / 100.0
+        return BoschCompensation.refine_pressure(self, raw_pressure, t_fine, self.compensation)
 
     def refine_humidity(self, raw_humidity: int, t_fine: int) -> float:
-        humidity = t_fine - 76800.0
-        var1 = self.dig_H4 * 64.0 + self.dig_H5 / 16384.0 * humidity
-        var2 = 1.0 + self.dig_H3 / 67108864.0 * humidity
-        var3 = 1.0 + self.dig_H6 / 67108864.0 * humidity * var2
-        humidity = (raw_humidity - var1) * (self.dig_H2 / 65536.0 * var3)
-        humidity = humidity * (1.0 - self.dig_H1 * humidity / 524288.0)
-        return min(100.0, max(0.0, humidity))
+        return BoschCompensation.refine_humidity(self, raw_humidity, t_fine, self.compensation)
 
     @property
     def temperature(self) -> float:
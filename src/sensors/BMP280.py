@@ -1,9 +1,11 @@
+from sensors import BoschCompensation
 from wpiio.I2CDevice import I2CDevice
 import time
 
 
 class BMP280(I2CDevice):
     DEFAULT_DEVICE_I2C_ADDRESS = 0x76
+    RAW_SAMPLE_SIZE = 6
 
     REGISTER_TEMP_XLSB = 0xFC
     REGISTER_TEMP_LSB = 0xFB
@@ -110,8 +112,10 @@ class BMP280(I2CDevice):
         self.last_pressure = 0.0
         self.started = False
         self.last_measure_time = 0
+        # one of BoschCompensation.COMPENSATION_MODES, the integer modes avoid the floating point division chains
+        self.compensation = BoschCompensation.COMPENSATION_FLOAT
         self.chip_id = self.get_chip_id()
-        self.read_calibration()
+        self.calibration_data = BoschCompensation.read_calibration(self, False)
         time.sleep(0.002)
         self.write_config()
 
@@ -121,24 +125,6 @@ class BMP280(I2CDevice):
     def is_chip_id_valid(self) -> bool:
         return self.chip_id == 0x58
 
-    def read_calibration(self):
-        # Read blocks of calibration data from EEPROM
-        cal1 = self.read_register(BMP280.REGISTER_CALIBRATION_00, 24)
-        cal2 = self.read_register(BMP280.REGISTER_CALIBRATION_25, 1)
-        self.dig_T1 = self.get_ushort(cal1, 0)
-        self.dig_T2 = self.get_short(cal1, 2)
-        self.dig_T3 = self.get_short(cal1, 4)
-        self.dig_P1 = self.get_ushort(cal1, 6)
-        self.dig_P2 = self.get_short(cal1, 8)
-        self.dig_P3 = self.get_short(cal1, 10)
-        self.dig_P4 = self.get_short(cal1, 12)
-        self.dig_P5 = self.get_short(cal1, 14)
-        self.dig_P6 = self.get_short(cal1, 16)
-        self.dig_P7 = self.get_short(cal1, 18)
-        self.dig_P8 = self.get_short(cal1, 20)
-        self.dig_P9 = self.get_short(cal1, 22)
-        self.dig_H1 = self.get_uchar(cal2, 0)
-
     def write_config(self):
         config = self.config_standby << 5 | self.config_filter << 2 | self.config_spi
         self.write_register(BMP280.REGISTER_CONFIG, config)
@@ -184,35 +170,16 @@ class BMP280(I2CDevice):
     def read_raw_values(self) -> (int, int, int):
         # Read 6 bytes starting at pressure MSB up to humidity LSB
         data = self.read_register(BMP280.REGISTER_PRESS_MSB, 6)
+        self.archive_raw_sample(data)
         raw_pressure = (data[0] << 12) | (data[1] << 4) | (data[2] >> 4)
         raw_temperature = (data[3] << 12) | (data[4] << 4) | (data[5] >> 4)
         return raw_pressure, raw_temperature
 
     def refine_temperature(self, raw_temperature: int) -> (float, int):
-        var1 = (((raw_temperature >> 3) - (self.dig_T1 << 1)) * self.dig_T2) >> 11
-        var3 = (raw_temperature >> 4) - self.dig_T1
-        var2 = (((var3 * var3) >> 12) * self.dig_T3) >> 14
-        t_fine = var1 + var2
-        temperature = float(((t_fine * 5) + 128) >> 8)
-        return temperature / 100.0, t_fine
+        return BoschCompensation.refine_temperature(self, raw_temperature)
 
     def refine_pressure(self, raw_pressure: int, t_fine: int) -> float:
-        # Refine pressure and adjust for temperature
-        var1 = t_fine / 2.0 - 64000.0
-        var2 = var1 * var1 * self.dig_P6 / 32768.0
-        var2 = var2 + var1 * self.dig_P5 * 2.0
-        var2 = var2 / 4.0 + self.dig_P4 * 65536.0
-        var1 = (self.dig_P3 * var1 * var1 / 524288.0 + self.dig_P2 * var1) / 524288.0
-        var1 = (1.0 + var1 / 32768.0) * self.dig_P1
-        if var1 == 0:
-            pressure = 0.0
-        else:
-            pressure = 1048576.0 - raw_pressure
-            pressure = ((pressure - var2 / 4096.0) * 6250.0) / var1
-            var1 = self.dig_P9 * pressure * pressure / 2147483648.0
-            var2 = pressure * self.dig_P8 / 32768.0
-            pressure = pressure + (var1 + var2 + self.dig_P7) / 16.0
-        return pressure / 100.0
+        return BoschCompensation.refine_pressure(self, raw_pressure, t_fine, self.compensation)
 
     @property
     def temperature(self) -> float:
@@ -0,0 +1,65 @@
+from typing import Tuple
+
+import numpy as np
+
+# Array versions of the BoschCompensation float path for reprocessing stored raw samples. The operations are
+# performed in the same order as the scalar path, so results are bit identical. The calibration argument is any
+# object with the dig_* attributes, e.g. a BME280 or BMP280 instance.
+
+
+def refine_temperatures(calibration, raw_temperature: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    raw_temperature = np.asarray(raw_temperature, dtype=np.int64)
+    var1 = (((raw_temperature >> 3) - (calibration.dig_T1 << 1)) * calibration.dig_T2) >> 11
+    var3 = (raw_temperature >> 4) - calibration.dig_T1
+    var2 = (((var3 * var3) >> 12) * calibration.dig_T3) >> 14
+    t_fine = var1 + var2
+    temperature = (((t_fine * 5) + 128) >> 8).astype(np.float64)
+    return temperature / 100.0, t_fine
+
+
+def refine_pressures(calibration, raw_pressure: np.ndarray, t_fine: np.ndarray) -> np.ndarray:
+    raw_pressure = np.asarray(raw_pressure, dtype=np.int64)
+    var1 = t_fine / 2.0 - 64000.0
+    var2 = var1 * var1 * calibration.dig_P6 / 32768.0
+    var2 = var2 + var1 * calibration.dig_P5 * 2.0
+    var2 = var2 / 4.0 + calibration.dig_P4 * 65536.0
+    var1 = (calibration.dig_P3 * var1 * var1 / 524288.0 + calibration.dig_P2 * var1) / 524288.0
+    var1 = (1.0 + var1 / 32768.0) * calibration.dig_P1
+    valid = var1 != 0
+    with np.errstate(divide='ignore', invalid='ignore'):
+        pressure = 1048576.0 - raw_pressure
+        pressure = ((pressure - var2 / 4096.0) * 6250.0) / var1
+        var1 = calibration.dig_P9 * pressure * pressure / 2147483648.0
+        var2 = pressure * calibration.dig_P8 / 32768.0
+        pressure = pressure + (var1 + var2 + calibration.dig_P7) / 16.0
+    return np.where(valid, pressure, 0.0) / 100.0
+
+
+def refine_humidities(calibration, raw_humidity: np.ndarray, t_fine: np.ndarray) -> np.ndarray:
+    raw_humidity = np.asarray(raw_humidity, dtype=np.int64)
+    humidity = t_fine - 76800.0
+    var1 = calibration.dig_H4 * 64.0 + calibration.dig_H5 / 16384.0 * humidity
+    var2 = 1.0 + calibration.dig_H3 / 67108864.0 * humidity
+    var3 = 1.0 + calibration.dig_H6 / 67108864.0 * humidity * var2
+    humidity = (raw_humidity - var1) * (calibration.dig_H2 / 65536.0 * var3)
+    humidity = humidity * (1.0 - calibration.dig_H1 * humidity / 524288.0)
+    return np.clip(humidity, 0.0, 100.0)
+
+
+def refine(calibration, raw_pressure: np.ndarray, raw_temperature: np.ndarray,
+           raw_humidity: np.ndarray = None) -> Tuple[np.ndarray, np.ndarray, np.ndarray or None]:
+    # Returns temperature (°C), pressure (hPa) and humidity (%, None without raw humidity values)
+    temperature, t_fine = refine_temperatures(calibration, raw_temperature)
+    pressure = refine_pressures(calibration, raw_pressure, t_fine)
+    humidity = refine_humidities(calibration, raw_humidity, t_fine) if raw_humidity is not None else None
+    return temperature, pressure, humidity
+
+
+def decode_raw_samples(data: np.ndarray) -> Tuple[np.ndarray, np.ndarray, np.ndarray or None]:
+    # Raw register blocks starting at press_msb as returned by read_raw_values / stored in a RawSampleArchive,
+    # shape (n, 6) for the BMP280 and (n, 8) for the BME280
+    data = np.asarray(data, dtype=np.int64)
+    raw_pressure = (data[:, 0] << 12) | (data[:, 1] << 4) | (data[:, 2] >> 4)
+    raw_temperature = (data[:, 3] << 12) | (data[:, 4] << 4) | (data[:, 5] >> 4)
+    raw_humidity = (data[:, 6] << 8) | data[:, 7] if data.shape[1] >= 8 else None
+    return raw_pressure, raw_temperature, raw_humidity
@@ -0,0 +1,178 @@
+from typing import Dict, Tuple
+
+from wpiio.I2CDevice import I2CDevice
+
+# Compensation formulas shared by the BMP280 and BME280 (datasheet section 4.2.3 / 8). The calibration argument is
+# any object with the dig_* attributes, e.g. a BME280 or BMP280 instance.
+#
+# COMPENSATION_FLOAT is the double precision reference, COMPENSATION_INT64 the 64-bit fixed point pressure formula
+# (resolution 1/256 Pa) and COMPENSATION_INT32 the 32-bit pressure formula (resolution 1 Pa). Both integer modes use
+# the 32-bit fixed point humidity formula (resolution 1/1024 %RH). Temperature is always the 32-bit integer formula.
+COMPENSATION_FLOAT = "float"
+COMPENSATION_INT64 = "int64"
+COMPENSATION_INT32 = "int32"
+COMPENSATION_MODES = [COMPENSATION_FLOAT, COMPENSATION_INT64, COMPENSATION_INT32]
+
+# Calibration blocks 0x88 - 0x9F and 0xA1, the BME280 adds the humidity block 0xE1 - 0xE7
+REGISTER_CALIBRATION_00 = 0x88
+REGISTER_CALIBRATION_25 = 0xA1
+REGISTER_CALIBRATION_26 = 0xE1
+
+
+def read_calibration(device: I2CDevice, humidity: bool) -> bytes:
+    # Reads the calibration blocks from EEPROM and sets the dig_* attributes of the device, returns the raw blocks
+    data = device.read_register(REGISTER_CALIBRATION_00, 24) + device.read_register(REGISTER_CALIBRATION_25, 1)
+    if humidity:
+        data += device.read_register(REGISTER_CALIBRATION_26, 7)
+    for name, value in parse_calibration(bytes(data)).items():
+        setattr(device, name, value)
+    return bytes(data)
+
+
+def parse_calibration(data: bytes) -> Dict[str, int]:
+    # Calibration blocks concatenated as returned by read_calibration, 25 bytes (BMP280) or 32 bytes (BME280)
+    cal1 = data[0:24]
+    cal2 = data[24:25]
+    calibration = {
+        "dig_T1": I2CDevice.get_ushort(cal1, 0),
+        "dig_T2": I2CDevice.get_short(cal1, 2),
+        "dig_T3": I2CDevice.get_short(cal1, 4),
+        "dig_P1": I2CDevice.get_ushort(cal1, 6),
+        "dig_P2": I2CDevice.get_short(cal1, 8),
+        "dig_P3": I2CDevice.get_short(cal1, 10),
+        "dig_P4": I2CDevice.get_short(cal1, 12),
+        "dig_P5": I2CDevice.get_short(cal1, 14),
+        "dig_P6": I2CDevice.get_short(cal1, 16),
+        "dig_P7": I2CDevice.get_short(cal1, 18),
+        "dig_P8": I2CDevice.get_short(cal1, 20),
+        "dig_P9": I2CDevice.get_short(cal1, 22),
+        "dig_H1": I2CDevice.get_uchar(cal2, 0)
+    }
+    if len(data) > 25:
+        cal3 = data[25:32]
+        calibration["dig_H2"] = I2CDevice.get_short(cal3, 0)
+        calibration["dig_H3"] = I2CDevice.get_uchar(cal3, 2)
+        dig_h4 = I2CDevice.get_char(cal3, 3)
+        dig_h4 = (dig_h4 << 24) >> 20
+        calibration["dig_H4"] = dig_h4 | (I2CDevice.get_char(cal3, 4) & 0x0F)
+        dig_h5 = I2CDevice.get_char(cal3, 5)
+        dig_h5 = (dig_h5 << 24) >> 20
+        calibration["dig_H5"] = dig_h5 | (I2CDevice.get_uchar(cal3, 4) >> 4 & 0x0F)
+        calibration["dig_H6"] = I2CDevice.get_char(cal3, 6)
+    return calibration
+
+
+def check_mode(mode: str):
+    if mode not in COMPENSATION_MODES:
+        raise ValueError("Unknown compensation mode %s, expected one of %s" % (mode, COMPENSATION_MODES))
+
+
+def divide(dividend: int, divisor: int) -> int:
+    # C integer division truncates towards zero, Python's // rounds towards negative infinity
+    quotient = abs(dividend) // abs(divisor)
+    return quotient if (dividend < 0) == (divisor < 0) else -quotient
+
+
+def refine_temperature(calibration, raw_temperature: int) -> Tuple[float, int]:
+    var1 = (((raw_temperature >> 3) - (calibration.dig_T1 << 1)) * calibration.dig_T2) >> 11
+    var3 = (raw_temperature >> 4) - calibration.dig_T1
+    var2 = (((var3 * var3) >> 12) * calibration.dig_T3) >> 14
+    t_fine = var1 + var2
+    temperature = float(((t_fine * 5) + 128) >> 8)
+    return temperature / 100.0, t_fine
+
+
+def refine_pressure_float(calibration, raw_pressure: int, t_fine: int) -> float:
+    # Refine pressure and adjust for temperature
+    var1 = t_fine / 2.0 - 64000.0
+    var2 = var1 * var1 * calibration.dig_P6 / 32768.0
+    var2 = var2 + var1 * calibration.dig_P5 * 2.0
+    var2 = var2 / 4.0 + calibration.dig_P4 * 65536.0
+    var1 = (calibration.dig_P3 * var1 * var1 / 524288.0 + calibration.dig_P2 * var1) / 524288.0
+    var1 = (1.0 + var1 / 32768.0) * calibration.dig_P1
+    if var1 == 0:
+        pressure = 0.0
+    else:
+        pressure = 1048576.0 - raw_pressure
+        pressure = ((pressure - var2 / 4096.0) * 6250.0) / var1
+        var1 = calibration.dig_P9 * pressure * pressure / 2147483648.0
+        var2 = pressure * calibration.dig_P8 / 32768.0
+        pressure = pressure + (var1 + var2 + calibration.dig_P7) / 16.0
+    return pressure / 100.0
+
+
+def refine_pressure_int64(calibration, raw_pressure: int, t_fine: int) -> float:
+    var1 = t_fine - 128000
+    var2 = var1 * var1 * calibration.dig_P6
+    var2 = var2 + ((var1 * calibration.dig_P5) << 17)
+    var2 = var2 + (calibration.dig_P4 << 35)
+    var1 = ((var1 * var1 * calibration.dig_P3) >> 8) + ((var1 * calibration.dig_P2) << 12)
+    var1 = (((1 << 47) + var1) * calibration.dig_P1) >> 33
+    if var1 == 0:
+        return 0.0
+    pressure = 1048576 - raw_pressure
+    pressure = divide(((pressure << 31) - var2) * 3125, var1)
+    var1 = (calibration.dig_P9 * (pressure >> 13) * (pressure >> 13)) >> 25
+    var2 = (calibration.dig_P8 * pressure) >> 19
+    pressure = ((pressure + var1 + var2) >> 8) + (calibration.dig_P7 << 4)
+    # Q24.8 Pa
+    return pressure / 25600.0
+
+
+def refine_pressure_int32(calibration, raw_pressure: int, t_fine: int) -> float:
+    var1 = (t_fine >> 1) - 64000
+    var2 = (((var1 >> 2) * (var1 >> 2)) >> 11) * calibration.dig_P6
+    var2 = var2 + ((var1 * calibration.dig_P5) << 1)
+    var2 = (var2 >> 2) + (calibration.dig_P4 << 16)
+    var1 = (((calibration.dig_P3 * (((var1 >> 2) * (var1 >> 2)) >> 13)) >> 3) +
+            ((calibration.dig_P2 * var1) >> 1)) >> 18
+    var1 = ((32768 + var1) * calibration.dig_P1) >> 15
+    if var1 == 0:
+        return 0.0
+    # unsigned 32-bit in the reference implementation
+    pressure = (((1048576 - raw_pressure) - (var2 >> 12)) * 3125) & 0xFFFFFFFF
+    if pressure < 0x80000000:
+        pressure = (pressure << 1) // var1
+    else:
+        pressure = (pressure // var1) * 2
+    var1 = (calibration.dig_P9 * (((pressure >> 3) * (pressure >> 3)) >> 13)) >> 12
+    var2 = ((pressure >> 2) * calibration.dig_P8) >> 13
+    pressure = pressure + ((var1 + var2 + calibration.dig_P7) >> 4)
+    return pressure / 100.0
+
+
+def refine_humidity_float(calibration, raw_humidity: int, t_fine: int) -> float:
+    humidity = t_fine - 76800.0
+    var1 = calibration.dig_H4 * 64.0 + calibration.dig_H5 / 16384.0 * humidity
+    var2 = 1.0 + calibration.dig_H3 / 67108864.0 * humidity
+    var3 = 1.0 + calibration.dig_H6 / 67108864.0 * humidity * var2
+    humidity = (raw_humidity - var1) * (calibration.dig_H2 / 65536.0 * var3)
+    humidity = humidity * (1.0 - calibration.dig_H1 * humidity / 524288.0)
+    return min(100.0, max(0.0, humidity))
+
+
+def refine_humidity_int32(calibration, raw_humidity: int, t_fine: int) -> float:
+    var1 = t_fine - 76800
+    var1 = (((((raw_humidity << 14) - (calibration.dig_H4 << 20) - (calibration.dig_H5 * var1)) + 16384) >> 15) * (
+            ((((((var1 * calibration.dig_H6) >> 10) * (((var1 * calibration.dig_H3) >> 11) + 32768)) >> 10) +
+              2097152) * calibration.dig_H2 + 8192) >> 14))
+    var1 = var1 - (((((var1 >> 15) * (var1 >> 15)) >> 7) * calibration.dig_H1) >> 4)
+    var1 = min(max(var1, 0), 419430400)
+    # Q22.10 %RH
+    return (var1 >> 12) / 1024.0
+
+
+def refine_pressure(calibration, raw_pressure: int, t_fine: int, mode: str = COMPENSATION_FLOAT) -> float:
+    check_mode(mode)
+    if mode == COMPENSATION_INT64:
+        return refine_pressure_int64(calibration, raw_pressure, t_fine)
+    if mode == COMPENSATION_INT32:
+        return refine_pressure_int32(calibration, raw_pressure, t_fine)
+    return refine_pressure_float(calibration, raw_pressure, t_fine)
+
+
+def refine_humidity(calibration, raw_humidity: int, t_fine: int, mode: str = COMPENSATION_FLOAT) -> float:
+    check_mode(mode)
+    if mode == COMPENSATION_FLOAT:
+        return refine_humidity_float(calibration, raw_humidity, t_fine)
+    return refine_humidity_int32(calibration, raw_humidity, t_fine)
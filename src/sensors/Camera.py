@@ -1,27 +1,108 @@
-from picamera import PiCamera
 from time import sleep
+from typing import NamedTuple, Tuple
 import datetime
+import io
 import os.path
+import time
+
+from utils import SolarUtils
+
+
+class CameraFrame(NamedTuple):
+    timestamp: datetime.datetime
+    encoder: str
+    resolution: Tuple[int, int]
+    data: bytes
+    # seconds between the capture request and the encoded frame being available
+    latency: float
 
 
 class Camera:
-    def __init__(self):
-        self.camera = PiCamera()
+    ENCODERS = ["jpeg", "png", "yuv", "rgb"]
+    FILE_EXTENSIONS = {"jpeg": ".jpg", "png": ".png", "yuv": ".yuv", "rgb": ".rgb"}
+
+    def __init__(self, backend=None, resolution: Tuple[int, int] = (1296, 972), encoder: str = "png",
+                 settle_time: float = 5.0, use_video_port: bool = True):
+        if backend is None:
+            # only available on the Pi, tests pass a FakeCamera instead
+            from picamera import PiCamera
+            backend = PiCamera()
+        self.camera = backend
+        self.check_encoder(encoder)
         self.camera.led = False
-        self.camera.resolution = (1296, 972)
+        self.camera.resolution = resolution
+        self.encoder = encoder
+        # time for exposure and white balance to settle after the preview starts
+        self.settle_time = settle_time
+        # the video port captures without switching the sensor mode, at the cost of some quality
+        self.use_video_port = use_video_port
+        self.exposure_mode = 'auto'
+        self.warm = False
+        self.frame_count = 0
+        self.total_latency = 0.0
+        self.last_latency = 0.0
+
+    def start(self):
+        # Keep the preview running so the sensor stays warm between captures
+        if not self.warm:
+            self.camera.start_preview()
+            self.camera.exposure_mode = self.exposure_mode
+            sleep(self.settle_time)
+            self.warm = True
+
+    def set_exposure_mode(self, exposure_mode: str):
+        if exposure_mode != self.exposure_mode:
+            self.exposure_mode = exposure_mode
+            if self.warm:
+                # let the exposure settle again before the next capture
+                self.camera.exposure_mode = exposure_mode
+                sleep(self.settle_time)
+
+    def stop(self):
+        if self.warm:
+            self.camera.stop_preview()
+            self.warm = False
+
+    def close(self):
+        self.stop()
+        self.camera.close()
+
+    def check_encoder(self, encoder: str):
+        # a backend may list the formats it supports, e.g. the FakeCamera without PIL has no JPEG
+        if encoder not in Camera.ENCODERS or encoder not in getattr(self.camera, "FORMATS", Camera.ENCODERS):
+            raise ValueError("Unknown encoder %s" % encoder)
+
+    def capture(self, encoder: str = None, resize: Tuple[int, int] = None) -> CameraFrame:
+        encoder = encoder or self.encoder
+        self.check_encoder(encoder)
+        self.start()
+        stream = io.BytesIO()
+        timestamp = datetime.datetime.now().astimezone()
+        start = time.perf_counter()
+        self.camera.capture(stream, format=encoder, use_video_port=self.use_video_port, resize=resize)
+        latency = time.perf_counter() - start
+        self.frame_count += 1
+        self.total_latency += latency
+        self.last_latency = latency
+        return CameraFrame(timestamp, encoder, resize or tuple(self.camera.resolution), stream.getvalue(), latency)
+
+    @property
+    def mean_latency(self) -> float:
+        return self.total_latency / self.frame_count if self.frame_count > 0 else 0.0
 
     def snapshot(self, target_path: str) -> str:
-        self.camera.start_preview()
-        self.camera.exposure_mode = 'auto'  # self.get_exposure_by_time_of_day()
-        sleep(5)
-        timestamp = datetime.datetime.now().replace(microsecond=0).astimezone().isoformat()
-        file_path = os.path.join(target_path, timestamp + '_ldr_1.png')
-        self.camera.capture(file_path, format='png')
-        self.camera.stop_preview()
+        frame = self.capture()
+        return Camera.write_frame(frame, target_path)
+
+    @staticmethod
+    def write_frame(frame: CameraFrame, target_path: str, timespec: str = 'seconds') -> str:
+        timestamp = frame.timestamp.isoformat(timespec=timespec)
+        file_path = os.path.join(target_path, timestamp + '_ldr_1' + Camera.FILE_EXTENSIONS[frame.encoder])
+        with io.open(file_path, "wb") as f:
+            f.write(frame.data)
         return file_path
 
     @staticmethod
-    def get_exposure_by_time_of_day():
-        now = datetime.datetime.now()
-        # TODO: test 'night' or 'verylong'
-        return 'night' if now.hour >= 22 or now.hour < 4 else 'auto'
+    def get_exposure_by_sun_phase(phase: str) -> str:
+        # 'night' allows the long exposures needed in all phases darker than day
+        return 'auto' if phase == SolarUtils.DAY else 'night'
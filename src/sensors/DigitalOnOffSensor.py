@@ -1,14 +1,17 @@
-from gpiozero import InputDevice
+from gpiozero import DigitalInputDevice
 
 from sensors.Sensor import Sensor
 
 
 class DigitalOnOffSensor(Sensor):
-    def __init__(self, pin: int, inverted: bool = False):
+    def __init__(self, pin: int, inverted: bool = False, pin_factory=None):
         super().__init__()
         self.inverted = inverted
-        self.device = InputDevice(pin, pull_up=False)
+        self.device = DigitalInputDevice(pin, pull_up=False, pin_factory=pin_factory)
 
     @property
     def active(self) -> bool:
         return not self.device.is_active if self.inverted else self.device.is_active
+
+    def close(self):
+        self.device.close()
@@ -0,0 +1,97 @@
+from typing import Callable, Tuple
+
+import io
+import struct
+import time
+import zlib
+
+import numpy as np
+
+try:
+    # optional, only needed for JPEG frames
+    from PIL import Image
+except ImportError:
+    Image = None
+
+
+class FakeCamera:
+    # Stand-in for picamera.PiCamera producing synthetic frames, for running the camera pipeline without a Pi
+    # formats the fake can produce, Camera rejects the others up front
+    FORMATS = ["rgb", "yuv", "png"] + (["jpeg"] if Image is not None else [])
+
+    def __init__(self, frame_source: Callable[[int, int, int], np.ndarray] = None, capture_time: float = 0.0):
+        # frame_source(width, height, frame_index) returns a (height, width, 3) uint8 RGB image
+        self.frame_source = frame_source or FakeCamera.sky_gradient
+        # simulated exposure and encoding time per capture
+        self.capture_time = capture_time
+        self.led = True
+        self.resolution = (1296, 972)
+        self.exposure_mode = 'auto'
+        self.previewing = False
+        self.preview_starts = 0
+        self.frame_index = 0
+        self.closed = False
+
+    @staticmethod
+    def sky_gradient(width: int, height: int, frame_index: int) -> np.ndarray:
+        rows = np.linspace(1.0, 0.6, height, dtype=np.float32)[:, np.newaxis]
+        image = np.empty((height, width, 3), dtype=np.uint8)
+        image[..., 0] = (90 * rows).astype(np.uint8)
+        image[..., 1] = (140 * rows).astype(np.uint8)
+        image[..., 2] = (230 * rows).astype(np.uint8)
+        return image
+
+    def start_preview(self):
+        self.previewing = True
+        self.preview_starts += 1
+
+    def stop_preview(self):
+        self.previewing = False
+
+    def close(self):
+        self.closed = True
+
+    def capture(self, output, format: str = 'jpeg', use_video_port: bool = False, resize: Tuple[int, int] = None):
+        width, height = resize or self.resolution
+        image = self.frame_source(width, height, self.frame_index)
+        self.frame_index += 1
+        if self.capture_time > 0:
+            time.sleep(self.capture_time)
+        if format == 'rgb':
+            output.write(image.tobytes())
+        elif format == 'yuv':
+            output.write(FakeCamera.encode_yuv420(image))
+        elif format == 'png':
+            output.write(FakeCamera.encode_png(image))
+        elif format == 'jpeg' and Image is not None:
+            output.write(FakeCamera.encode_jpeg(image))
+        else:
+            raise ValueError("FakeCamera can't encode %s" % format)
+
+    @staticmethod
+    def encode_yuv420(image: np.ndarray) -> bytes:
+        rgb = image.astype(np.float32)
+        y = 0.299 * rgb[..., 0] + 0.587 * rgb[..., 1] + 0.114 * rgb[..., 2]
+        u = (rgb[..., 2] - y) * 0.565 + 128
+        v = (rgb[..., 0] - y) * 0.713 + 128
+        planes = [y, u[::2, ::2], v[::2, ::2]]
+        return b"".join(np.clip(plane, 0, 255).astype(np.uint8).tobytes() for plane in planes)
+
+    @staticmethod
+    def encode_jpeg(image: np.ndarray) -> bytes:
+        stream = io.BytesIO()
+        Image.fromarray(image, "RGB").save(stream, format="JPEG")
+        return stream.getvalue()
+
+    @staticmethod
+    def encode_png(image: np.ndarray) -> bytes:
+        height, width, _ = image.shape
+
+        def chunk(chunk_type: bytes, data: bytes) -> bytes:
+            return struct.pack(">I", len(data)) + chunk_type + data + struct.pack(
+                ">I", zlib.crc32(chunk_type + data) & 0xFFFFFFFF)
+
+        # filter type 0 in front of every row
+        rows = np.hstack([np.zeros((height, 1), dtype=np.uint8), image.reshape(height, width * 3)])
+        return b"\x89PNG\r\n\x1a\n" + chunk(b"IHDR", struct.pack(">IIBBBBB", width, height, 8, 2, 0, 0, 0)) + chunk(
+            b"IDAT", zlib.compress(rows.tobytes(), 1)) + chunk(b"IEND", b"")
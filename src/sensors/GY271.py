@@ -1,6 +1,7 @@
-from typing import Dict, Tuple
+from typing import Callable, Dict, Tuple
 
 from api import NGDC
+from api.DeclinationCache import DeclinationCache
 from wpiio.I2CDevice import I2CDevice
 
 import math
@@ -9,6 +10,7 @@ import time
 
 class GY271(I2CDevice):
     DEFAULT_DEVICE_I2C_ADDRESS = 0x0D
+    RAW_SAMPLE_SIZE = 9
 
     # Each channel in range -32768 to 32767 muTesla
     REGISTER_DATA_X_LSB = 0x00  # read only
@@ -51,7 +53,8 @@ class GY271(I2CDevice):
     POINTER_ROLL_OVER_NORMAL = 0
     POINTER_ROLL_OVER_ENABLED = 1
 
-    def __init__(self, config: Dict):
+    def __init__(self, config: Dict,
+                 declination_provider: Callable[[float, float], float] = NGDC.get_magnetic_declination):
         super().__init__(GY271.DEFAULT_DEVICE_I2C_ADDRESS)
         self.config_data_rate = GY271.DATA_RATE_200_HZ
         self.config_range = GY271.RANGE_8G
@@ -59,8 +62,14 @@ class GY271(I2CDevice):
         self.config_pointer_roll_over = GY271.POINTER_ROLL_OVER_NORMAL
         self.latitude = config["location"]["lat"]
         self.longitude = config["location"]["lon"]
+        self.declination = DeclinationCache(self.latitude, self.longitude, declination_provider)
         self.calibration_offset = config["compass"]["calibration_offset"]
         self.calibration_norm_factor = config["compass"]["calibration_norm_factor"]
+        # Optional 3x4 hard- and soft-iron correction from utils.MagnetometerCalibration, replaces offset and norm
+        self.calibration_matrix = config["compass"].get("calibration_matrix")
+        if self.calibration_matrix is not None:
+            self.calibration_matrix = tuple(tuple(float(value) for value in row) for row in self.calibration_matrix)
+        self.last_uncalibrated = (0, 0, 0)
         self.last_x = 0
         self.last_y = 0
         self.last_z = 0
@@ -104,18 +113,24 @@ class GY271(I2CDevice):
 
     def read(self):
         data = self.read_register(GY271.REGISTER_DATA_X_LSB, 9)
-        self.last_x = int.from_bytes(data[0:2], byteorder='little', signed=True)
-        self.last_y = int.from_bytes(data[2:4], byteorder='little', signed=True)
-        self.last_z = int.from_bytes(data[4:6], byteorder='little', signed=True)
+        self.archive_raw_sample(data)
+        x = int.from_bytes(data[0:2], byteorder='little', signed=True)
+        y = int.from_bytes(data[2:4], byteorder='little', signed=True)
+        z = int.from_bytes(data[4:6], byteorder='little', signed=True)
         self.last_temperature = int.from_bytes(data[7:9], byteorder='little', signed=True)
-
-        self.last_x -= self.calibration_offset[0]
-        self.last_y -= self.calibration_offset[1]
-        self.last_x /= self.calibration_norm_factor[0]
-        self.last_y /= self.calibration_norm_factor[1]
-
-        declination_angle = NGDC.get_magnetic_declination(self.latitude, self.longitude) * math.pi / 180.0
-        self.last_heading = math.atan2(self.last_y, self.last_x) + declination_angle
+        self.last_uncalibrated = (x, y, z)
+
+        if self.calibration_matrix is not None:
+            (m00, m01, m02, m03), (m10, m11, m12, m13), (m20, m21, m22, m23) = self.calibration_matrix
+            self.last_x = m00 * x + m01 * y + m02 * z + m03
+            self.last_y = m10 * x + m11 * y + m12 * z + m13
+            self.last_z = m20 * x + m21 * y + m22 * z + m23
+        else:
+            self.last_x = (x - self.calibration_offset[0]) / self.calibration_norm_factor[0]
+            self.last_y = (y - self.calibration_offset[1]) / self.calibration_norm_factor[1]
+            self.last_z = z
+
+        self.last_heading = math.atan2(self.last_y, self.last_x) + self.declination.radians
         if self.last_heading < 0.0:
             self.last_heading += 2 * math.pi
         if self.last_heading > 2 * math.pi:
@@ -128,6 +143,10 @@ class GY271(I2CDevice):
             self.write_control_modes()
             self.started = False
 
+    def close(self):
+        self.declination.stop()
+        super().close()
+
     @property
     def raw(self) -> Tuple[float, float, float, float]:
         self.read_if_needed()
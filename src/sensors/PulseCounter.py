@@ -0,0 +1,90 @@
+from collections import deque
+from typing import Callable, Deque, Dict, Optional
+import threading
+import time
+
+from gpiozero import DigitalInputDevice
+import numpy as np
+
+from sensors.Sensor import Sensor
+from wpiio.MCP23017 import MCP23017PinChange
+
+
+class PulseCounter(Sensor):
+    # Counts reed switch pulses from a GPIO edge callback or from MCP23017 pin change events. Every accepted pulse
+    # is timestamped, rates and gusts are computed from the buffered timestamps on demand. Timestamps are
+    # time.monotonic() seconds, a wall clock step (NTP) would break the debounce and the sorted buffer.
+
+    def __init__(self, pin: Optional[int] = None, debounce: float = 0.001, buffer_time: float = 3600.0,
+                 pin_factory=None):
+        super().__init__()
+        # pulses closer than this to the previous one are contact bounce (s)
+        self.debounce = debounce
+        # pulses older than this are dropped from the buffer (s)
+        self.buffer_time = buffer_time
+        self.pulses: Deque[float] = deque()
+        self.lock = threading.Lock()
+        self.count = 0
+        self.bounced = 0
+        self.last_pulse = -float("inf")
+        self.device = None
+        if pin is not None:
+            # the switch closes to ground against the internal pull up
+            self.device = DigitalInputDevice(pin, pull_up=True, pin_factory=pin_factory)
+            self.device.when_activated = self.on_edge
+
+    def close(self):
+        if self.device is not None:
+            self.device.close()
+            self.device = None
+
+    def on_edge(self):
+        self.pulse(time.monotonic())
+
+    def on_pin_change(self, change: MCP23017PinChange):
+        # expander inputs are pulled up as well, a closed switch reads 0
+        if change.level == 0:
+            self.pulse(change.timestamp)
+
+    @staticmethod
+    def expander_handler(counters: Dict[int, "PulseCounter"]) -> Callable[[MCP23017PinChange], None]:
+        # Handler for MCP23017.start_interrupts dispatching the changes of each pin to its counter
+        def handle(change: MCP23017PinChange):
+            if change.pin in counters:
+                counters[change.pin].on_pin_change(change)
+
+        return handle
+
+    def pulse(self, timestamp: float):
+        with self.lock:
+            if timestamp - self.last_pulse < self.debounce:
+                self.bounced += 1
+                return
+            self.last_pulse = timestamp
+            self.count += 1
+            self.pulses.append(timestamp)
+            while self.pulses[0] < timestamp - self.buffer_time:
+                self.pulses.popleft()
+
+    def get_pulse_times(self, window: float, now: Optional[float] = None) -> np.ndarray:
+        # monotonic timestamps of the pulses within (now - window, now]
+        now = time.monotonic() if now is None else now
+        with self.lock:
+            times = np.fromiter(self.pulses, dtype=np.float64, count=len(self.pulses))
+        return times[(times > now - window) & (times <= now)]
+
+    def get_wall_time(self, timestamp: float) -> float:
+        # wall clock time of a pulse timestamp, for reporting
+        return self.get_now() - (time.monotonic() - timestamp)
+
+    def get_rate(self, window: float, now: Optional[float] = None) -> float:
+        # mean pulses per second over the window
+        return self.get_pulse_times(window, now).size / window
+
+    def get_gust_rate(self, gust_window: float = 3.0, window: float = 600.0, now: Optional[float] = None) -> float:
+        # highest mean pulses per second over any gust_window within the window, 3 s after the WMO gust definition
+        times = self.get_pulse_times(window, now)
+        if times.size == 0:
+            return 0.0
+        counts = np.searchsorted(times, times + gust_window, side="left") - np.arange(times.size)
+        return int(counts.max()) / gust_window
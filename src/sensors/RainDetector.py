@@ -1,10 +1,122 @@
+from collections import deque
+from typing import Deque, Dict, NamedTuple, Optional
+import datetime
+import threading
+import time
+
 from sensors.DigitalOnOffSensor import DigitalOnOffSensor
 
 
+class RainEvent(NamedTuple):
+    # time of the first edge of the stable new state
+    timestamp: float
+    raining: bool
+
+
 class RainDetector(DigitalOnOffSensor):
-    def __init__(self, pin: int):
-        super().__init__(pin, True)
+    # Rain state changes are taken from gpiozero edge callbacks. A wet sensor chatters, so every edge moves the
+    # deadline of a single debounce thread and the state is only taken over once the input stayed unchanged for the
+    # debounce time.
+    MAX_EVENTS = 1000
+    # number of hourly and daily durations kept
+    MAX_HOURS = 48
+    MAX_DAYS = 31
+
+    def __init__(self, pin: int, debounce: float = 5.0, pin_factory=None):
+        super().__init__(pin, True, pin_factory)
+        # seconds the input has to be stable
+        self.debounce = debounce
+        # guards the state as well, the readers run on other threads than the debounce thread
+        self.condition = threading.Condition(threading.RLock())
+        # time.monotonic() at which the input counts as settled
+        self.deadline: Optional[float] = None
+        self.first_edge: Optional[float] = None
+        self.closed = False
+        self.raining = self.active
+        self.last_changed = self.get_now()
+        self.events: Deque[RainEvent] = deque(maxlen=RainDetector.MAX_EVENTS)
+        # seconds of rain per started hour and per day (local time), completed showers only
+        self.hourly_durations: Dict[datetime.datetime, float] = {}
+        self.daily_durations: Dict[datetime.date, float] = {}
+        self.worker = threading.Thread(target=self.run_debounce, name="RainDetector", daemon=True)
+        self.worker.start()
+        self.device.when_activated = self.on_edge
+        self.device.when_deactivated = self.on_edge
 
     @property
     def rain_detected(self) -> bool:
-        return self.active
+        return self.raining
+
+    def close(self):
+        with self.condition:
+            self.closed = True
+            self.condition.notify()
+        self.worker.join()
+        super().close()
+
+    def on_edge(self):
+        with self.condition:
+            if self.first_edge is None:
+                self.first_edge = self.get_now()
+            self.deadline = time.monotonic() + self.debounce
+            self.condition.notify()
+
+    def run_debounce(self):
+        with self.condition:
+            while not self.closed:
+                if self.deadline is None:
+                    self.condition.wait()
+                    continue
+                remaining = self.deadline - time.monotonic()
+                if remaining > 0:
+                    self.condition.wait(remaining)
+                    continue
+                self.deadline = None
+                timestamp = self.first_edge
+                self.first_edge = None
+                self.set_raining(self.active, timestamp)
+
+    def set_raining(self, raining: bool, timestamp: float):
+        with self.condition:
+            if raining == self.raining:
+                return
+            if not raining:
+                self.add_rain_duration(self.last_changed, timestamp)
+            self.raining = raining
+            self.last_changed = timestamp
+            self.events.append(RainEvent(timestamp, raining))
+
+    def add_rain_duration(self, start: float, stop: float):
+        # split the shower at the hour boundaries
+        begin = datetime.datetime.fromtimestamp(start)
+        end = datetime.datetime.fromtimestamp(stop)
+        while begin < end:
+            hour = begin.replace(minute=0, second=0, microsecond=0)
+            until = min(end, hour + datetime.timedelta(hours=1))
+            seconds = (until - begin).total_seconds()
+            self.hourly_durations[hour] = self.hourly_durations.get(hour, 0.0) + seconds
+            self.daily_durations[hour.date()] = self.daily_durations.get(hour.date(), 0.0) + seconds
+            begin = until
+        for durations, limit in [(self.hourly_durations, RainDetector.MAX_HOURS),
+                                 (self.daily_durations, RainDetector.MAX_DAYS)]:
+            for key in sorted(durations)[:-limit]:
+                del durations[key]
+
+    def get_ongoing_duration(self, since: datetime.datetime, now: float) -> float:
+        if not self.raining:
+            return 0.0
+        return max(now - max(self.last_changed, since.timestamp()), 0.0)
+
+    def get_rain_duration_hour(self, now: Optional[float] = None) -> float:
+        # seconds of rain in the current hour including an ongoing shower
+        now = self.get_now() if now is None else now
+        hour = datetime.datetime.fromtimestamp(now).replace(minute=0, second=0, microsecond=0)
+        with self.condition:
+            return self.hourly_durations.get(hour, 0.0) + self.get_ongoing_duration(hour, now)
+
+    def get_rain_duration_day(self, now: Optional[float] = None) -> float:
+        # seconds of rain today including an ongoing shower
+        now = self.get_now() if now is None else now
+        midnight = datetime.datetime.fromtimestamp(now).replace(hour=0, minute=0, second=0, microsecond=0)
+        with self.condition:
+            return self.daily_durations.get(midnight.date(), 0.0) + self.get_ongoing_duration(midnight, now)
@@ -0,0 +1,21 @@
+from typing import Optional
+
+from sensors.PulseCounter import PulseCounter
+
+
+class RainGauge(PulseCounter):
+    # Tipping bucket rain gauge, one pulse per bucket tip
+
+    def __init__(self, pin: Optional[int] = None, mm_per_pulse: float = 0.2794, debounce: float = 0.05,
+                 pin_factory=None):
+        # a bucket can't tip faster than every few hundred ms, the long debounce filters switch chatter
+        super().__init__(pin, debounce, 86400.0, pin_factory)
+        self.mm_per_pulse = mm_per_pulse
+
+    def get_rainfall(self, window: float = 3600.0, now: Optional[float] = None) -> float:
+        # precipitation within the window (mm)
+        return self.get_pulse_times(window, now).size * self.mm_per_pulse
+
+    def get_rain_rate(self, window: float = 600.0, now: Optional[float] = None) -> float:
+        # intensity extrapolated from the window (mm/h)
+        return self.get_rate(window, now) * 3600 * self.mm_per_pulse
@@ -1,10 +1,130 @@
+from typing import Any, Callable, Dict, List, NamedTuple, Optional
+
+from gpiozero import DigitalInputDevice
+
 from wpiio.I2CDevice import I2CDevice
 
+import math
 import time
 
 
+class SI1145Measurement(NamedTuple):
+    vis: int
+    ir: int
+    ps1: int
+    ps2: int
+    ps3: int
+    # AUX channel, holds the UV index * 100 when PARAM_CHLIST_ENUV is set
+    aux: int
+
+    @property
+    def uv_index(self) -> float:
+        return self.aux * 0.01
+
+
+class SI1145CommandError(Exception):
+    def __init__(self, command: int, response: int, message: Optional[str] = None):
+        if message is None:
+            message = "%s (0x%02X)" % (SI1145.RESPONSE_ERRORS.get(response, "Unknown error"), response)
+        super().__init__("[SI1145] Command 0x%02X failed: %s" % (command, message))
+        self.command = command
+        self.response = response
+
+
+class SI1145AutoRange:
+    # Gain ranging of one ALS channel. ADCGAIN doubles the integration time (25.6 us * 2^gain) and the sensitivity,
+    # the high signal range divides the sensitivity by 14.5. The settings are ordered by sensitivity, high range
+    # gains above 3 are left out as the normal range reaches the same sensitivity with a shorter integration time.
+    SETTINGS = [(True, gain) for gain in range(4)] + [(False, gain) for gain in range(8)]
+    # ALS readings carry an offset of 256 counts in the dark
+    ADC_OFFSET = 256
+    HIGH_RANGE_FACTOR = 14.5
+    # counts above the offset, readings between the two limits keep the current setting
+    MIN_COUNTS = 0x2000
+    MAX_COUNTS = 0xC000
+    # a saturated reading is an overflow as well, RESPONSE only keeps the code of one channel
+    ADC_MAX = 0xFFFF
+    # settings to step down after an ADC overflow, the signal is unknown then
+    OVERFLOW_STEP = 4
+
+    def __init__(self, gain_parameter: int, counter_parameter: int, misc_parameter: int, counts_per_lux: float,
+                 level: int = 0):
+        self.gain_parameter = gain_parameter
+        self.counter_parameter = counter_parameter
+        self.misc_parameter = misc_parameter
+        self.counts_per_lux = counts_per_lux
+        self.level = level
+        # the UV coefficients written at init only hold for the initial setting
+        self.calibrated_level = level
+        self.overflows = 0
+        self.changes = 0
+
+    @property
+    def calibrated(self) -> bool:
+        return self.level == self.calibrated_level
+
+    @property
+    def high_range(self) -> bool:
+        return SI1145AutoRange.SETTINGS[self.level][0]
+
+    @property
+    def gain(self) -> int:
+        return SI1145AutoRange.SETTINGS[self.level][1]
+
+    @staticmethod
+    def get_sensitivity(level: int) -> float:
+        high_range, gain = SI1145AutoRange.SETTINGS[level]
+        return (1 << gain) / (SI1145AutoRange.HIGH_RANGE_FACTOR if high_range else 1.0)
+
+    def get_counts(self, raw: int) -> float:
+        # counts normalized to gain 0 in the normal range
+        return max(raw - SI1145AutoRange.ADC_OFFSET, 0) / SI1145AutoRange.get_sensitivity(self.level)
+
+    def get_lux(self, raw: int) -> float:
+        return self.get_counts(raw) / self.counts_per_lux
+
+    def get_parameters(self) -> Dict[int, int]:
+        # the recovery counter is recommended to be the one's complement of the gain
+        return {
+            self.gain_parameter: self.gain,
+            self.counter_parameter: (~self.gain & 0x07) << 4,
+            self.misc_parameter: self.get_raw_setting()[1]
+        }
+
+    def get_raw_setting(self) -> List[int]:
+        # ADCGAIN and ADCMISC as written to the chip, stored with every archived sample
+        return [self.gain, SI1145.PARAM_ADCMISC_RANGE_HI if self.high_range else SI1145.PARAM_ADCMISC_RANGE_NORM]
+
+    def update(self, raw: int, overflow: bool) -> bool:
+        # Returns True when the channel needs new parameters. The least sensitive (shortest) setting that still
+        # reaches MIN_COUNTS is chosen.
+        if overflow:
+            self.overflows += 1
+            level = max(self.level - SI1145AutoRange.OVERFLOW_STEP, 0)
+        else:
+            counts = raw - SI1145AutoRange.ADC_OFFSET
+            if SI1145AutoRange.MIN_COUNTS <= counts <= SI1145AutoRange.MAX_COUNTS:
+                return False
+            signal = max(counts, 1) / SI1145AutoRange.get_sensitivity(self.level)
+            level = len(SI1145AutoRange.SETTINGS) - 1
+            for candidate in range(len(SI1145AutoRange.SETTINGS)):
+                if signal * SI1145AutoRange.get_sensitivity(candidate) >= SI1145AutoRange.MIN_COUNTS:
+                    level = candidate
+                    break
+        if level == self.level:
+            return False
+        self.level = level
+        self.changes += 1
+        return True
+
+
 class SI1145(I2CDevice):
     DEFAULT_DEVICE_I2C_ADDRESS = 0x60
+    # the data block followed by ADCGAIN and ADCMISC of VIS and IR, the counts depend on the range they were taken in
+    RAW_SAMPLE_SIZE = 16
+    # MEAS_RATE counts in 31.25 us steps
+    MEASURE_RATE_UNIT = 31.25 * 0.000001
+    MAX_MEASURE_RATE = 0xFFFF
 
     REGISTER_PART_ID = 0x00
     REGISTER_REV_ID = 0x01
@@ -41,6 +161,42 @@ class SI1145(I2CDevice):
     REGISTER_CHIP_STAT = 0x30
     REGISTER_ANA_IN_KEY = 0x3B  # - 0x3E
 
+    IRQ_STATUS_ALS = 0x01
+    IRQ_STATUS_PS1 = 0x04
+    IRQ_STATUS_PS2 = 0x08
+    IRQ_STATUS_PS3 = 0x10
+    IRQ_STATUS_CMD = 0x20
+
+    RESPONSE_ERROR = 0x80
+    RESPONSE_COUNTER_MASK = 0x0F
+    RESPONSE_INVALID_COMMAND = 0x80
+    RESPONSE_PS1_ADC_OVERFLOW = 0x88
+    RESPONSE_PS2_ADC_OVERFLOW = 0x89
+    RESPONSE_PS3_ADC_OVERFLOW = 0x8A
+    RESPONSE_ALS_VIS_ADC_OVERFLOW = 0x8C
+    RESPONSE_ALS_IR_ADC_OVERFLOW = 0x8D
+    RESPONSE_AUX_ADC_OVERFLOW = 0x8E
+    RESPONSE_ERRORS = {
+        RESPONSE_INVALID_COMMAND: "Invalid command",
+        RESPONSE_PS1_ADC_OVERFLOW: "ADC overflow during PS1 measurement",
+        RESPONSE_PS2_ADC_OVERFLOW: "ADC overflow during PS2 measurement",
+        RESPONSE_PS3_ADC_OVERFLOW: "ADC overflow during PS3 measurement",
+        RESPONSE_ALS_VIS_ADC_OVERFLOW: "ADC overflow during ALS-VIS measurement",
+        RESPONSE_ALS_IR_ADC_OVERFLOW: "ADC overflow during ALS-IR measurement",
+        RESPONSE_AUX_ADC_OVERFLOW: "ADC overflow during AUX measurement"
+    }
+    RESPONSE_OVERFLOWS = [RESPONSE_PS1_ADC_OVERFLOW, RESPONSE_PS2_ADC_OVERFLOW, RESPONSE_PS3_ADC_OVERFLOW,
+                          RESPONSE_ALS_VIS_ADC_OVERFLOW, RESPONSE_ALS_IR_ADC_OVERFLOW, RESPONSE_AUX_ADC_OVERFLOW]
+    # ADC counts per lux of sunlight at gain 0 in the normal range
+    VIS_COUNTS_PER_LUX = 0.282
+    IR_COUNTS_PER_LUX = 2.44
+    # Commands normally complete within a few hundred us, in autonomous mode they may wait for a measurement (s)
+    COMMAND_TIMEOUT = 0.05
+    # The sequencer needs about 1 ms after a RESET before it accepts register writes (s)
+    RESET_TIME = 0.001
+    # attempts of a range change that collides with an ADC overflow of the running autonomous cycle
+    RANGE_RETRIES = 3
+
     STATUS_SLEEP = 1
     STATUS_SUSPEND = 2
     STATUS_RUNNING = 4
@@ -122,46 +278,51 @@ class SI1145(I2CDevice):
     PARAM_ADCMISC_RANGE_NORM = 0x00
     PARAM_ADCMISC_RANGE_HI = 0x20
 
-    def __init__(self):
+    def __init__(self, auto_range: bool = False):
         super().__init__(SI1145.DEFAULT_DEVICE_I2C_ADDRESS)
-        time.sleep(0.25)
+        self.measure_rate = 0
+        # gain and signal range of VIS and IR follow the light level, starting at the least sensitive setting
+        self.auto_range = auto_range
+        self.vis_range = SI1145AutoRange(SI1145.PARAM_ALSVISADCGAIN, SI1145.PARAM_ALSVISADCOUNTER,
+                                         SI1145.PARAM_ALSVISADCMISC, SI1145.VIS_COUNTS_PER_LUX)
+        self.ir_range = SI1145AutoRange(SI1145.PARAM_ALSIRADCGAIN, SI1145.PARAM_ALSIRADCOUNTER,
+                                        SI1145.PARAM_ALSIRADCMISC, SI1145.IR_COUNTS_PER_LUX)
         self.chip_id = self.get_chip_id()
         if self.has_chip_meas_rate_bug():
             print("[WARN] SI1145 chip has meas_rate bug!")
 
         self.set_measure_rate(0)
         self.set_int_pin(False)
-        time.sleep(0.01)
-        self.set_command(SI1145.RESET)
-        time.sleep(0.01)
+        self.reset()
         self.set_hardware_key()
         # Enable UV index measurement coefficients!
-        self.write_register(SI1145.REGISTER_UCOEF0, 0x29)
-        self.write_register(SI1145.REGISTER_UCOEF1, 0x89)
-        self.write_register(SI1145.REGISTER_UCOEF2, 0x02)
-        self.write_register(SI1145.REGISTER_UCOEF3, 0x00)
-        self.set_parameter(SI1145.PARAM_CHLIST,
-                           SI1145.PARAM_CHLIST_ENUV | SI1145.PARAM_CHLIST_ENALSIR | SI1145.PARAM_CHLIST_ENALSVIS)
-        # /****************************** IR Sensor */
-        self.set_parameter(SI1145.PARAM_ALSIRADCMUX, SI1145.PARAM_ADCMUX_SMALLIR)
-        # Fastest clocks, clock div 1 (integration time)
-        self.set_parameter(SI1145.PARAM_ALSIRADCGAIN, 0)
-        # Take 511 clocks to recover
-        self.set_parameter(SI1145.PARAM_ALSIRADCOUNTER, SI1145.PARAM_ADCCOUNTER_511CLK)
-        # in high range mode
-        self.set_parameter(SI1145.PARAM_ALSIRADCMISC, SI1145.PARAM_ADCMISC_RANGE_HI)
-        # /****************************** Visible Sensor */
-        # fastest clocks, clock div 1 (integration time)
-        self.set_parameter(SI1145.PARAM_ALSVISADCGAIN, 0)
-        # Take 511 clocks to recover
-        self.set_parameter(SI1145.PARAM_ALSVISADCOUNTER, SI1145.PARAM_ADCCOUNTER_511CLK)
-        # in high signal range mode divides gain by 14.5
-        self.set_parameter(SI1145.PARAM_ALSVISADCMISC, SI1145.PARAM_ADCMISC_RANGE_HI)
+        self.write_registers(SI1145.REGISTER_UCOEF0, [0x29, 0x89, 0x02, 0x00])
+        self.set_parameters({
+            SI1145.PARAM_CHLIST:
+                SI1145.PARAM_CHLIST_ENUV | SI1145.PARAM_CHLIST_ENALSIR | SI1145.PARAM_CHLIST_ENALSVIS,
+            # /****************************** IR Sensor */
+            SI1145.PARAM_ALSIRADCMUX: SI1145.PARAM_ADCMUX_SMALLIR,
+            # gain, recovery clocks and signal range, initially fastest clocks in high range mode
+            **self.ir_range.get_parameters(),
+            # /****************************** Visible Sensor */
+            # high signal range mode divides gain by 14.5
+            **self.vis_range.get_parameters()
+        })
 
         # measurement rate for auto
         self.set_measure_rate(0xFF)  # 255 * 31.25 uS = 7.9 ms
-        # auto run
-        self.set_command(SI1145.ALS_FORCE)
+        self.interrupt_line: Optional[DigitalInputDevice] = None
+        # the first measurement for read_measurement
+        self.force_measurement()
+        self.measurement_handler: Optional[Callable[[SI1145Measurement], None]] = None
+        self.last_measurement: Optional[SI1145Measurement] = None
+        # gain normalized light levels of the last measurement, None after an ADC overflow
+        self.last_vis_lux: Optional[float] = None
+        self.last_ir_lux: Optional[float] = None
+        # None while the VIS or IR gain differs from the setting the UV coefficients are made for
+        self.last_uv_index: Optional[float] = None
+        self.last_overflows = (False, False)
+        self.interrupts = 0
 
     def get_chip_id(self) -> str or None:
         return self.read_register(SI1145.REGISTER_PART_ID, 1)[0]
@@ -197,6 +358,16 @@ class SI1145(I2CDevice):
 
     def set_measure_rate(self, rate: int):
         self.write_register_short(SI1145.REGISTER_MEAS_RATE0, rate)
+        self.measure_rate = rate
+
+    def get_interval_time(self):
+        # Last measure rate written, in seconds, without a bus transaction
+        return self.measure_rate * 31.25 * 0.000001
+
+    @staticmethod
+    def get_measure_rate_for_interval(interval: float) -> int:
+        # Smallest measure rate whose period is at least interval seconds, the 16-bit register caps it at about 2 s
+        return max(1, min(math.ceil(round(interval / SI1145.MEASURE_RATE_UNIT, 6)), SI1145.MAX_MEASURE_RATE))
 
     def set_ps_led(self):
         # LED3_I Represents the irLED current sunk by the LED3 pin during a PS measurement.
@@ -212,19 +383,76 @@ class SI1145(I2CDevice):
 
     def set_parameter(self, parameter: int, value: int):
         # Mailbox register for passing parameters from the host to the sequencer.
-        self.write_register(SI1145.REGISTER_PARAM_WR, value)
-        self.set_command(SI1145.PARAM_SET | parameter)
+        self.set_parameters({parameter: value})
+
+    def set_parameters(self, parameters: Dict[int, int]):
+        # PARAM_WR and COMMAND are adjacent, so each parameter is a single two byte write. The sequencer echoes the
+        # value into PARAM_RD, which is read together with RESPONSE to confirm the write.
+        num_bytes = SI1145.REGISTER_PARAM_RD - SI1145.REGISTER_RESPONSE + 1
+        with self.bus.transaction():
+            previous = self.prepare_command()
+            for parameter, value in parameters.items():
+                command = SI1145.PARAM_SET | parameter
+                self.write_registers(SI1145.REGISTER_PARAM_WR, [value, command])
+                data = self.wait_for_response(command, previous, num_bytes)
+                if data[-1] != value:
+                    raise SI1145CommandError(command, data[0], "PARAM_RD reads 0x%02X instead of the written 0x%02X" % (
+                        data[-1], value))
+                previous = data[0]
 
     def get_parameter(self, parameter: int):
         # Mailbox register for passing parameters from the sequencer to the host.
-        self.set_command(SI1145.PARAM_QUERY | parameter)
-        return self.read_register(SI1145.REGISTER_PARAM_RD, 1)[0]
+        with self.bus.transaction():
+            self.send_command(SI1145.PARAM_QUERY | parameter)
+            return self.read_register(SI1145.REGISTER_PARAM_RD, 1)[0]
 
     def set_command(self, command: int):
         # The COMMAND Register is the primary mailbox register into the internal sequencer.
         # Writing to the COMMAND register is the only I2C operation that wakes the device from standby mode.
         self.write_register(SI1145.REGISTER_COMMAND, command)
 
+    def send_command(self, command: int) -> int:
+        # Writes the command and waits until the sequencer reports it as executed, returns the response
+        with self.bus.transaction():
+            previous = self.prepare_command()
+            self.set_command(command)
+            return self.wait_for_response(command, previous, 1)[0]
+
+    def prepare_command(self) -> int:
+        # A pending error blocks every command except NOP and RESET, returns the roll-over counter to wait on
+        response = self.get_response()
+        if response & SI1145.RESPONSE_ERROR:
+            self.clear_error()
+            return 0
+        return response
+
+    def clear_error(self):
+        # NOP resets RESPONSE to 0, commands written before the sequencer executed it would still be ignored
+        self.set_command(SI1145.NOP)
+        deadline = time.perf_counter() + SI1145.COMMAND_TIMEOUT
+        while self.get_response() != 0:
+            if time.perf_counter() > deadline:
+                raise TimeoutError("[SI1145] Error not cleared within %.0f ms" % (SI1145.COMMAND_TIMEOUT * 1000))
+
+    def wait_for_response(self, command: int, previous: int, num_bytes: int) -> List:
+        # Polls RESPONSE (and the following num_bytes - 1 registers) until the roll-over counter moved on or an
+        # error code shows up. Errors are cleared with a NOP so the next command is accepted again.
+        deadline = time.perf_counter() + SI1145.COMMAND_TIMEOUT
+        while True:
+            data = self.read_register(SI1145.REGISTER_RESPONSE, num_bytes)
+            if data[0] & SI1145.RESPONSE_ERROR:
+                self.clear_error()
+                raise SI1145CommandError(command, data[0])
+            if data[0] != previous:
+                return data
+            if time.perf_counter() > deadline:
+                raise TimeoutError("[SI1145] Command 0x%02X not executed within %.0f ms" % (
+                    command, SI1145.COMMAND_TIMEOUT * 1000))
+
+    def reset(self):
+        self.set_command(SI1145.RESET)
+        time.sleep(SI1145.RESET_TIME)
+
     def get_response(self):
         # The Response register is used in conjunction with command processing. When an error is encountered, the
         # response register will be loaded with an error code. All error codes will have the MSB is set.
@@ -285,6 +513,134 @@ class SI1145(I2CDevice):
         # next measurement is made. Refer to "AN498: Si114x Designer's Guide", section "5.6.2 Host Interrupt Latency"
         return self.read_register_short(SI1145.REGISTER_AUX_DATA0)
 
+    def read_measurement(self) -> SI1145Measurement:
+        # Burst read of RESPONSE and the whole data block 0x22 - 0x2D in a single transaction, so all channels
+        # belong to the same measurement cycle and ADC overflows are seen with it.
+        num_bytes = SI1145.REGISTER_AUX_DATA1 - SI1145.REGISTER_RESPONSE + 1
+        data = self.read_register(SI1145.REGISTER_RESPONSE, num_bytes)
+        measurement = self.decode_measurement(data[2:], data[0])
+        if self.auto_range:
+            self.update_range()
+        if self.interrupt_line is None:
+            # without autonomous mode the chip only measures on request, the next poll reads this one
+            self.force_measurement()
+        return measurement
+
+    def force_measurement(self):
+        # ALS_FORCE measures once with the current parameters. An ADC overflow fails the command, but it is the
+        # result of this very measurement: the saturated counts report it with the next read.
+        try:
+            self.send_command(SI1145.ALS_FORCE)
+        except SI1145CommandError as e:
+            if e.response not in SI1145.RESPONSE_OVERFLOWS:
+                raise
+
+    def decode_measurement(self, data: List, response: int = 0) -> SI1145Measurement:
+        self.archive_raw_sample(list(data) + self.vis_range.get_raw_setting() + self.ir_range.get_raw_setting())
+        self.last_measurement = SI1145Measurement(*[self.get_ushort(data, i) for i in range(0, len(data), 2)])
+        vis_overflow = response == SI1145.RESPONSE_ALS_VIS_ADC_OVERFLOW or \
+            self.last_measurement.vis >= SI1145AutoRange.ADC_MAX
+        ir_overflow = response == SI1145.RESPONSE_ALS_IR_ADC_OVERFLOW or \
+            self.last_measurement.ir >= SI1145AutoRange.ADC_MAX
+        self.last_vis_lux = None if vis_overflow else self.vis_range.get_lux(self.last_measurement.vis)
+        self.last_ir_lux = None if ir_overflow else self.ir_range.get_lux(self.last_measurement.ir)
+        # the on-chip UV index is computed from the VIS and IR counts
+        calibrated = self.vis_range.calibrated and self.ir_range.calibrated
+        self.last_uv_index = self.last_measurement.uv_index if calibrated else None
+        self.last_overflows = (vis_overflow, ir_overflow)
+        if response in SI1145.RESPONSE_OVERFLOWS:
+            # the error blocks further commands until it is cleared
+            self.clear_error()
+        return self.last_measurement
+
+    def update_range(self):
+        # Adapts both channels to the last measurement. In autonomous mode the sequencer is paused while the
+        # parameters change, the levels are restored if the parameters could not be written.
+        vis_overflow, ir_overflow = self.last_overflows
+        levels = self.vis_range.level, self.ir_range.level
+        parameters = {}
+        if self.vis_range.update(self.last_measurement.vis, vis_overflow):
+            parameters.update(self.vis_range.get_parameters())
+        if self.ir_range.update(self.last_measurement.ir, ir_overflow):
+            parameters.update(self.ir_range.get_parameters())
+        if not parameters:
+            return
+        try:
+            with self.bus.transaction():
+                autonomous = self.interrupt_line is not None
+                if autonomous:
+                    self.retry_overflow(lambda: self.send_command(SI1145.PSALS_PAUSE))
+                try:
+                    self.retry_overflow(lambda: self.set_parameters(parameters))
+                finally:
+                    if autonomous:
+                        self.retry_overflow(lambda: self.send_command(SI1145.PSALS_AUTO))
+        except Exception:
+            self.vis_range.level, self.ir_range.level = levels
+            raise
+
+    @staticmethod
+    def retry_overflow(command: Callable[[], Any]):
+        # an ADC overflow of a measurement still in flight fails the command without being caused by it
+        for attempt in range(SI1145.RANGE_RETRIES):
+            try:
+                return command()
+            except SI1145CommandError as e:
+                if e.response not in SI1145.RESPONSE_OVERFLOWS or attempt == SI1145.RANGE_RETRIES - 1:
+                    raise
+
+    def start_autonomous(self, int_pin: int, handler: Callable[[SI1145Measurement], None], measure_rate: int = 0xFF,
+                         pin_factory=None):
+        # PSALS_AUTO: the chip measures every measure_rate * 31.25 us on its own and pulls INT low when done. Every
+        # measurement is read once from the INT edge, before the next cycle overwrites the data registers.
+        self.measurement_handler = handler
+        self.set_measure_rate(measure_rate)
+        self.set_irq_enable(True, False, False, False)
+        self.set_int_pin(True)
+        self.write_register(SI1145.REGISTER_IRQ_STATUS, 0xFF)
+        # INT is open drain and active low
+        self.interrupt_line = DigitalInputDevice(int_pin, pull_up=True, pin_factory=pin_factory)
+        self.interrupt_line.when_activated = self.on_interrupt
+        self.send_command(SI1145.PSALS_AUTO)
+
+    def stop_autonomous(self):
+        if self.interrupt_line is not None:
+            try:
+                self.retry_overflow(lambda: self.send_command(SI1145.PSALS_PAUSE))
+            finally:
+                self.interrupt_line.close()
+                self.interrupt_line = None
+            self.set_int_pin(False)
+
+    def on_interrupt(self):
+        # RESPONSE and IRQ_STATUS directly precede the data block, one read returns the overflow codes, the flags and
+        # the whole measurement
+        self.interrupts += 1
+        while True:
+            num_bytes = SI1145.REGISTER_AUX_DATA1 - SI1145.REGISTER_RESPONSE + 1
+            data = self.read_register(SI1145.REGISTER_RESPONSE, num_bytes)
+            if data[1] == 0:
+                return
+            # flags are cleared by writing ones, which releases INT
+            self.write_register(SI1145.REGISTER_IRQ_STATUS, data[1])
+            if data[1] & SI1145.IRQ_STATUS_ALS:
+                self.measurement_handler(self.decode_measurement(data[2:], data[0]))
+                if self.auto_range:
+                    try:
+                        self.update_range()
+                    except (SI1145CommandError, TimeoutError) as e:
+                        # keep the callback alive, the next measurement tries again
+                        print("[WARN] SI1145 range change failed: %s" % e)
+            # a cycle that completed while this one was handled keeps INT low without a new edge
+            if self.interrupt_line is None or not self.interrupt_line.is_active:
+                return
+
+    def close(self):
+        try:
+            self.stop_autonomous()
+        finally:
+            super().close()
+
     def get_status(self):
         return self.read_register(SI1145.REGISTER_CHIP_STAT, 1)[0]
 
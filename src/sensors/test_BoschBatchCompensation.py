@@ -0,0 +1,37 @@
+from unittest import TestCase
+
+from wpiio import I2CBus
+from wpiio.simulation.SimulatedBus import SimulatedBus
+from wpiio.simulation.SimulatedBME280 import SimulatedBME280
+from sensors import BoschBatchCompensation
+from sensors.BME280 import BME280
+
+import numpy as np
+
+
+class TestBoschBatchCompensation(TestCase):
+    def setUp(self):
+        bus = SimulatedBus()
+        bus.attach(SimulatedBME280())
+        I2CBus.set_bus_factory(lambda bus_number: bus)
+        self.sensor = BME280()
+        random = np.random.default_rng(42)
+        self.raw_pressure = random.integers(250000, 500000, 1000)
+        self.raw_temperature = random.integers(400000, 600000, 1000)
+        self.raw_humidity = random.integers(0, 65536, 1000)
+
+    def tearDown(self):
+        I2CBus.set_bus_factory(None)
+
+    def test_refine_matches_scalar(self):
+        temperature, pressure, humidity = BoschBatchCompensation.refine(
+            self.sensor, self.raw_pressure, self.raw_temperature, self.raw_humidity)
+        for i in range(len(self.raw_pressure)):
+            expected_temperature, t_fine = self.sensor.refine_temperature(int(self.raw_temperature[i]))
+            self.assertEqual(temperature[i], expected_temperature)
+            self.assertEqual(pressure[i], self.sensor.refine_pressure(int(self.raw_pressure[i]), t_fine))
+            self.assertEqual(humidity[i], self.sensor.refine_humidity(int(self.raw_humidity[i]), t_fine))
+
+    def test_without_humidity(self):
+        _, _, humidity = BoschBatchCompensation.refine(self.sensor, self.raw_pressure, self.raw_temperature)
+        self.assertIsNone(humidity)
@@ -0,0 +1,69 @@
+from unittest import TestCase
+
+from wpiio import I2CBus
+from wpiio.simulation.SimulatedBus import SimulatedBus
+from wpiio.simulation.SimulatedBME280 import SimulatedBME280
+from sensors import BoschCompensation
+from sensors.BME280 import BME280
+
+import numpy as np
+
+
+class TestBoschCompensation(TestCase):
+    def setUp(self):
+        bus = SimulatedBus()
+        bus.attach(SimulatedBME280())
+        I2CBus.set_bus_factory(lambda bus_number: bus)
+        self.sensor = BME280()
+
+    def tearDown(self):
+        I2CBus.set_bus_factory(None)
+
+    def test_datasheet_example(self):
+        # datasheet section 8.2: 25.08°C, 100653.27 Pa (double), 100653 Pa (64-bit) and 100656 Pa (32-bit)
+        temperature, t_fine = BoschCompensation.refine_temperature(self.sensor, 519888)
+        self.assertEqual(temperature, 25.08)
+        self.assertAlmostEqual(BoschCompensation.refine_pressure(self.sensor, 415148, t_fine), 1006.5327, places=3)
+        self.assertAlmostEqual(BoschCompensation.refine_pressure(
+            self.sensor, 415148, t_fine, BoschCompensation.COMPENSATION_INT64), 1006.53, places=2)
+        self.assertEqual(BoschCompensation.refine_pressure(
+            self.sensor, 415148, t_fine, BoschCompensation.COMPENSATION_INT32), 1006.56)
+
+    def test_integer_paths_match_float(self):
+        random = np.random.default_rng(7)
+        for _ in range(2000):
+            _, t_fine = BoschCompensation.refine_temperature(self.sensor, int(random.integers(400000, 600000)))
+            raw_pressure = int(random.integers(250000, 500000))
+            raw_humidity = int(random.integers(20000, 40000))
+            expected_pressure = BoschCompensation.refine_pressure(self.sensor, raw_pressure, t_fine)
+            expected_humidity = BoschCompensation.refine_humidity(self.sensor, raw_humidity, t_fine)
+            for mode in [BoschCompensation.COMPENSATION_INT64, BoschCompensation.COMPENSATION_INT32]:
+                self.assertAlmostEqual(BoschCompensation.refine_pressure(
+                    self.sensor, raw_pressure, t_fine, mode), expected_pressure, delta=0.1)
+                self.assertAlmostEqual(BoschCompensation.refine_humidity(
+                    self.sensor, raw_humidity, t_fine, mode), expected_humidity, delta=0.01)
+
+    def test_sensor_mode(self):
+        self.sensor.compensation = BoschCompensation.COMPENSATION_INT32
+        self.sensor.read()
+        self.assertEqual(self.sensor.last_pressure, 1006.56)
+        self.assertEqual(self.sensor.last_temperature, 25.08)
+
+    def test_divide(self):
+        self.assertEqual(BoschCompensation.divide(-7, 2), -3)
+        self.assertEqual(BoschCompensation.divide(7, -2), -3)
+        self.assertEqual(BoschCompensation.divide(7, 2), 3)
+
+    def test_unknown_mode(self):
+        _, t_fine = BoschCompensation.refine_temperature(self.sensor, 519888)
+        with self.assertRaises(ValueError):
+            BoschCompensation.refine_pressure(self.sensor, 415148, t_fine, "int16")
+        with self.assertRaises(ValueError):
+            BoschCompensation.refine_humidity(self.sensor, 30000, t_fine, "int16")
+
+    def test_parse_calibration(self):
+        calibration = BoschCompensation.parse_calibration(self.sensor.calibration_data)
+        self.assertEqual(calibration["dig_T1"], self.sensor.dig_T1)
+        self.assertEqual(calibration["dig_H5"], self.sensor.dig_H5)
+        # the BMP280 has no humidity block
+        self.assertNotIn("dig_H2", BoschCompensation.parse_calibration(self.sensor.calibration_data[:25]))
@@ -0,0 +1,55 @@
+from unittest import TestCase
+
+from sensors.Camera import Camera
+from sensors.FakeCamera import FakeCamera
+from utils import SolarUtils
+
+import os
+import shutil
+import tempfile
+
+
+class TestCamera(TestCase):
+    def setUp(self):
+        self.backend = FakeCamera(capture_time=0.01)
+        self.camera = Camera(self.backend, (64, 48), settle_time=0.0)
+
+    def test_warm_capture(self):
+        frames = [self.camera.capture() for _ in range(3)]
+        self.assertEqual(self.backend.preview_starts, 1)
+        self.assertTrue(frames[0].data.startswith(b"\x89PNG"))
+        self.assertEqual(frames[0].resolution, (64, 48))
+        self.assertGreaterEqual(frames[0].latency, 0.01)
+        self.assertEqual(self.camera.frame_count, 3)
+        self.camera.close()
+        self.assertFalse(self.backend.previewing)
+
+    def test_encoders(self):
+        self.assertEqual(len(self.camera.capture("rgb").data), 64 * 48 * 3)
+        self.assertEqual(len(self.camera.capture("yuv").data), 64 * 48 * 3 // 2)
+        self.assertEqual(len(self.camera.capture("rgb", (32, 24)).data), 32 * 24 * 3)
+        with self.assertRaises(ValueError):
+            Camera(self.backend, encoder="gif")
+        # rejected before anything is captured
+        with self.assertRaises(ValueError):
+            self.camera.capture("gif")
+        self.assertEqual(self.backend.frame_index, 3)
+        if "jpeg" in FakeCamera.FORMATS:
+            self.assertTrue(self.camera.capture("jpeg").data.startswith(b"\xff\xd8"))
+        else:
+            with self.assertRaises(ValueError):
+                Camera(self.backend, encoder="jpeg")
+
+    def test_snapshot(self):
+        target_path = tempfile.mkdtemp()
+        file_path = self.camera.snapshot(target_path)
+        self.assertTrue(file_path.endswith("_ldr_1.png"))
+        self.assertTrue(os.path.isfile(file_path))
+        shutil.rmtree(target_path)
+
+    def test_exposure_mode(self):
+        self.camera.set_exposure_mode(Camera.get_exposure_by_sun_phase(SolarUtils.NAUTICAL_TWILIGHT))
+        self.camera.capture()
+        self.assertEqual(self.backend.exposure_mode, 'night')
+        self.camera.set_exposure_mode(Camera.get_exposure_by_sun_phase(SolarUtils.DAY))
+        self.assertEqual(self.backend.exposure_mode, 'auto')
@@ -0,0 +1,71 @@
+from unittest import TestCase
+
+from gpiozero.pins.mock import MockFactory
+
+from sensors.Anemometer import Anemometer
+from sensors.PulseCounter import PulseCounter
+from sensors.RainGauge import RainGauge
+from wpiio.MCP23017 import MCP23017PinChange
+
+
+class TestPulseCounter(TestCase):
+    def test_gpio_edges(self):
+        factory = MockFactory()
+        counter = PulseCounter(5, debounce=0.01, pin_factory=factory)
+        pin = factory.pin(5)
+        for _ in range(3):
+            pin.drive_low()
+            pin.drive_high()
+        # contact bounce, all three closures happen within the debounce time
+        self.assertEqual(counter.count, 1)
+        self.assertEqual(counter.bounced, 2)
+        counter.close()
+
+    def test_wall_clock_step(self):
+        factory = MockFactory()
+        counter = PulseCounter(5, debounce=0.000001, pin_factory=factory)
+        pin = factory.pin(5)
+        wall_clock = iter([1000.0, 400.0, 300.0, 200.0])
+        # NTP steps the clock back between the pulses
+        counter.get_now = lambda: next(wall_clock)
+        for _ in range(3):
+            pin.drive_low()
+            pin.drive_high()
+        self.assertEqual(counter.count, 3)
+        self.assertEqual(counter.bounced, 0)
+        self.assertEqual(counter.get_rate(60.0) * 60.0, 3)
+        self.assertAlmostEqual(counter.get_wall_time(counter.last_pulse), 1000.0, delta=1.0)
+        counter.close()
+
+    def test_rate_and_gust(self):
+        counter = PulseCounter(buffer_time=60.0)
+        # 2 Hz for 50 s with a 3 s burst of 10 Hz in between
+        times = [1000.0 + i * 0.5 for i in range(100)] + [1020.05 + i * 0.1 for i in range(30)]
+        for timestamp in sorted(times):
+            counter.pulse(timestamp)
+        self.assertAlmostEqual(counter.get_rate(10.0, now=1049.9), 2.0)
+        self.assertAlmostEqual(counter.get_gust_rate(3.0, 60.0, now=1049.9), 12.0)
+        counter.pulse(1200.0)
+        # everything older than the buffer time is gone
+        self.assertEqual(len(counter.pulses), 1)
+        self.assertEqual(counter.count, 131)
+
+    def test_expander_events(self):
+        gauge = RainGauge()
+        anemometer = Anemometer()
+        handle = PulseCounter.expander_handler({3: gauge, 4: anemometer})
+        for i in range(10):
+            handle(MCP23017PinChange(100.0 + i, 3, 0))
+            handle(MCP23017PinChange(100.5 + i, 3, 1))
+            handle(MCP23017PinChange(100.0 + i * 0.25, 4, 0))
+        self.assertAlmostEqual(gauge.get_rainfall(3600.0, now=110.0), 10 * 0.2794)
+        self.assertAlmostEqual(gauge.get_rain_rate(3600.0, now=110.0), 10 * 0.2794)
+        self.assertAlmostEqual(anemometer.get_speed(2.5, now=102.25), 4 * 0.667)
+
+    def test_anemometer_buffer(self):
+        anemometer = Anemometer()
+        for i in range(1300):
+            anemometer.pulse(i * 0.5)
+        # only the 10 minute window is kept
+        self.assertEqual(len(anemometer.pulses), 1201)
+        self.assertAlmostEqual(anemometer.get_speed(now=649.5), 2 * 0.667)
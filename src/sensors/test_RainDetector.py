@@ -0,0 +1,56 @@
+from unittest import TestCase
+
+from gpiozero.pins.mock import MockFactory
+
+from sensors.RainDetector import RainDetector
+
+import datetime
+import threading
+import time
+
+
+class TestRainDetector(TestCase):
+    def setUp(self):
+        self.factory = MockFactory()
+        self.detector = RainDetector(24, debounce=0.05, pin_factory=self.factory)
+        self.pin = self.factory.pin(24)
+        # the sensor output is pulled low while wet
+        self.pin.drive_high()
+        time.sleep(0.1)
+        self.detector.events.clear()
+
+    def tearDown(self):
+        self.detector.close()
+
+    def test_debounce(self):
+        self.assertFalse(self.detector.rain_detected)
+        threads = threading.active_count()
+        before = time.time()
+        for _ in range(5):
+            self.pin.drive_low()
+            self.pin.drive_high()
+        self.pin.drive_low()
+        self.assertFalse(self.detector.rain_detected)
+        # chatter only moves the deadline of the one debounce thread
+        self.assertEqual(threading.active_count(), threads)
+        time.sleep(0.1)
+        self.assertTrue(self.detector.rain_detected)
+        self.assertEqual(len(self.detector.events), 1)
+        # the shower started with the first edge, not when the input settled
+        self.assertAlmostEqual(self.detector.last_changed, before, delta=0.02)
+        # chatter that returns to the same state is ignored
+        self.pin.drive_high()
+        self.pin.drive_low()
+        time.sleep(0.1)
+        self.assertEqual(len(self.detector.events), 1)
+
+    def test_durations(self):
+        start = datetime.datetime(2026, 6, 1, 9, 45).timestamp()
+        self.detector.set_raining(True, start)
+        self.detector.set_raining(False, start + 1800)
+        self.assertEqual(self.detector.hourly_durations[datetime.datetime(2026, 6, 1, 9)], 900)
+        self.assertEqual(self.detector.hourly_durations[datetime.datetime(2026, 6, 1, 10)], 900)
+        self.detector.set_raining(True, start + 2400)
+        self.assertEqual(self.detector.get_rain_duration_hour(start + 2700), 1200)
+        self.assertEqual(self.detector.get_rain_duration_day(start + 2700), 2100)
+        self.assertEqual([event.raining for event in self.detector.events], [True, False, True])
@@ -0,0 +1,229 @@
+from unittest import TestCase
+
+from gpiozero.pins.mock import MockFactory
+
+from wpiio import I2CBus
+from wpiio.simulation.SimulatedBus import SimulatedBus
+from wpiio.simulation.SimulatedSI1145 import SimulatedSI1145
+from sensors.SI1145 import SI1145, SI1145CommandError
+
+
+class TestSI1145(TestCase):
+    def setUp(self):
+        self.bus = SimulatedBus()
+        self.chip = self.bus.attach(SimulatedSI1145())
+        I2CBus.set_bus_factory(lambda bus_number: self.bus)
+        self.sensor = SI1145()
+
+    def tearDown(self):
+        I2CBus.set_bus_factory(None)
+
+    def test_init(self):
+        self.bus.reset_statistics()
+        SI1145()
+        # every parameter is one write plus one verifying read of RESPONSE up to PARAM_RD
+        self.assertLessEqual(self.bus.transactions, 28)
+        self.assertEqual(self.chip.parameters[SI1145.PARAM_ALSVISADCMISC], SI1145.PARAM_ADCMISC_RANGE_HI)
+        self.assertEqual(self.chip.registers[SI1145.REGISTER_UCOEF0 + 1], 0x89)
+
+    def test_command_polling(self):
+        self.chip.command_latency = 3
+        self.assertEqual(self.sensor.get_parameter(SI1145.PARAM_ALSIRADCOUNTER), SI1145.PARAM_ADCCOUNTER_511CLK)
+        executed = self.chip.commands_executed
+        self.sensor.set_parameter(SI1145.PARAM_ALSVISADCGAIN, 3)
+        self.assertEqual(self.chip.commands_executed, executed + 1)
+        self.assertEqual(self.chip.parameters[SI1145.PARAM_ALSVISADCGAIN], 3)
+
+    def test_command_error(self):
+        with self.assertRaises(SI1145CommandError) as context:
+            self.sensor.send_command(0x1F)
+        self.assertEqual(context.exception.response, SI1145.RESPONSE_INVALID_COMMAND)
+        # the error was cleared, so the sequencer accepts commands again
+        self.assertEqual(self.chip.registers[SimulatedSI1145.REGISTER_RESPONSE], 0)
+        self.sensor.send_command(SI1145.ALS_FORCE)
+        self.assertEqual(self.chip.registers[SimulatedSI1145.REGISTER_RESPONSE], 1)
+
+    def test_command_error_with_latency(self):
+        self.chip.command_latency = 3
+        with self.assertRaises(SI1145CommandError):
+            self.sensor.send_command(0x1F)
+        # the NOP has to be executed before the next command is accepted
+        self.sensor.send_command(SI1145.ALS_FORCE)
+        self.assertEqual(self.chip.registers[SimulatedSI1145.REGISTER_RESPONSE], 1)
+
+    def test_parameter_verify(self):
+        execute_command = self.chip.execute_command
+
+        def lose_value(command: int):
+            # the value got corrupted on the bus, PARAM_RD echoes something else
+            execute_command(command)
+            self.chip.registers[SimulatedSI1145.REGISTER_PARAM_RD] = 0x11
+
+        self.chip.execute_command = lose_value
+        with self.assertRaises(SI1145CommandError) as context:
+            self.sensor.set_parameter(SI1145.PARAM_ALSVISADCGAIN, 3)
+        self.assertIn("PARAM_RD reads 0x11", str(context.exception))
+
+    def test_command_timeout(self):
+        self.chip.command_latency = 1000000
+        with self.assertRaises(TimeoutError):
+            self.sensor.send_command(SI1145.ALS_FORCE)
+
+    def test_read_measurement(self):
+        self.chip.set_measurement(1021, 3020, 412, 11, 12, 13)
+        self.chip.parameters[SimulatedSI1145.PARAM_CHLIST] |= 0x07
+        self.sensor.send_command(SI1145.PSALS_FORCE)
+        self.bus.reset_statistics()
+        executed = self.chip.commands_executed
+        measurement = self.sensor.read_measurement()
+        # the block read, then RESPONSE, COMMAND and RESPONSE again to force the next measurement
+        self.assertEqual(self.bus.transactions, 4)
+        self.assertEqual(self.chip.commands_executed, executed + 1)
+        self.assertEqual(measurement, (1021, 3020, 11, 12, 13, 412))
+        self.assertAlmostEqual(measurement.uv_index, 4.12)
+        # the next poll returns the measurement forced by the previous one
+        self.chip.set_measurement(1022, 3021, 413)
+        self.assertEqual(self.sensor.read_measurement().vis, 1021)
+        self.assertEqual(self.sensor.read_measurement().vis, 1022)
+
+    def test_autonomous(self):
+        factory = MockFactory()
+        int_pin = factory.pin(25)
+        self.chip.interrupt_listener = lambda level: int_pin.drive_high() if level else int_pin.drive_low()
+        measurements = []
+        self.sensor.start_autonomous(25, measurements.append, pin_factory=factory)
+        self.assertTrue(self.chip.autonomous_als)
+        self.bus.reset_statistics()
+        for vis in range(100, 105):
+            self.chip.set_measurement(vis, 200, 300)
+            self.chip.run_autonomous_cycle()
+        # one combined status and data read plus the status clear per cycle
+        self.assertEqual(self.bus.transactions, 10)
+        self.assertEqual([measurement.vis for measurement in measurements], list(range(100, 105)))
+        self.assertTrue(self.chip.interrupt_level)
+        self.sensor.close()
+        self.assertFalse(self.chip.autonomous_als)
+
+    def test_close_during_overflow(self):
+        factory = MockFactory()
+        self.sensor.start_autonomous(25, lambda measurement: None, pin_factory=factory)
+        send_command = self.sensor.send_command
+        failures = [SI1145.RESPONSE_ALS_VIS_ADC_OVERFLOW]
+
+        def overflowing(command: int):
+            # a measurement in flight overflows while the pause is written
+            if failures:
+                raise SI1145CommandError(command, failures.pop())
+            return send_command(command)
+
+        self.sensor.send_command = overflowing
+        self.sensor.close()
+        self.assertFalse(self.chip.autonomous_als)
+        self.assertIsNone(self.sensor.interrupt_line)
+        self.assertIsNone(self.sensor.bus)
+
+    def test_close_failure(self):
+        factory = MockFactory()
+        self.sensor.start_autonomous(25, lambda measurement: None, pin_factory=factory)
+
+        def failing(command: int):
+            raise SI1145CommandError(command, SI1145.RESPONSE_INVALID_COMMAND)
+
+        self.sensor.send_command = failing
+        with self.assertRaises(SI1145CommandError):
+            self.sensor.close()
+        # the INT line and the bus handle are released anyway
+        self.assertIsNone(self.sensor.interrupt_line)
+        self.assertIsNone(self.sensor.bus)
+
+    def test_measure_rate_for_interval(self):
+        self.assertEqual(SI1145.get_measure_rate_for_interval(0.1), 3200)
+        self.assertEqual(SI1145.get_measure_rate_for_interval(0.0001), 4)
+        self.assertEqual(SI1145.get_measure_rate_for_interval(0.0), 1)
+        self.assertEqual(SI1145.get_measure_rate_for_interval(10.0), 0xFFFF)
+        self.sensor.set_measure_rate(SI1145.get_measure_rate_for_interval(0.1))
+        self.assertAlmostEqual(self.sensor.get_measure_rate(), 0.1)
+
+    def test_auto_range(self):
+        self.sensor.auto_range = True
+        self.chip.set_light(5000)
+        self.sensor.force_measurement()
+        levels = []
+        for lux in [5000, 10, 10, 10, 100000, 100000, 100000, 100000]:
+            # every poll reads the measurement forced at the end of the previous one, before the light changed
+            self.sensor.read_measurement()
+            levels.append(self.sensor.vis_range.level)
+            self.chip.set_light(lux)
+        for _ in range(2):
+            self.sensor.read_measurement()
+            levels.append(self.sensor.vis_range.level)
+        # dusk climbs to the longest integration time, direct sun overflows and steps back down
+        self.assertEqual(levels, [7, 7, 7, 11, 11, 11, 7, 3, 3, 3])
+        self.assertEqual(self.sensor.vis_range.overflows, 2)
+        self.assertEqual(self.sensor.ir_range.level, 0)
+        self.assertAlmostEqual(self.sensor.last_vis_lux, 100000, delta=100)
+        self.assertAlmostEqual(self.sensor.last_ir_lux, 100000, delta=100)
+        self.assertEqual(self.chip.parameters[SI1145.PARAM_ALSVISADCGAIN], 3)
+        self.assertEqual(self.chip.parameters[SI1145.PARAM_ALSVISADCOUNTER], 0x40)
+        self.assertEqual(self.chip.parameters[SI1145.PARAM_ALSVISADCMISC], SI1145.PARAM_ADCMISC_RANGE_HI)
+        self.assertEqual(self.chip.registers[SimulatedSI1145.REGISTER_RESPONSE] & SI1145.RESPONSE_ERROR, 0)
+
+    def test_auto_range_constant_light(self):
+        self.chip.set_light(100000)
+        sensor = SI1145(auto_range=True)
+        lux = []
+        for _ in range(6):
+            sensor.read_measurement()
+            lux.append(sensor.last_vis_lux)
+        # each poll measures with the range chosen by the previous one instead of rescaling a stale sample
+        self.assertEqual(sensor.vis_range.level, 3)
+        for value in lux[-3:]:
+            self.assertAlmostEqual(value, 100000, delta=100)
+        sensor.close()
+
+    def test_auto_range_autonomous(self):
+        factory = MockFactory()
+        int_pin = factory.pin(25)
+        self.chip.interrupt_listener = lambda level: int_pin.drive_high() if level else int_pin.drive_low()
+        self.sensor.auto_range = True
+        measurements = []
+        self.sensor.start_autonomous(25, measurements.append, pin_factory=factory)
+        self.chip.set_light(10)
+        for _ in range(3):
+            self.chip.run_autonomous_cycle()
+        self.assertEqual(self.sensor.vis_range.level, 11)
+        self.assertIsNone(self.sensor.last_uv_index)
+        # direct sun overflows at the highest gain while the chip keeps measuring
+        self.chip.set_light(100000)
+        for _ in range(4):
+            self.chip.run_autonomous_cycle()
+        self.assertEqual(len(measurements), 7)
+        self.assertEqual(self.sensor.vis_range.level, 3)
+        self.assertAlmostEqual(self.sensor.last_vis_lux, 100000, delta=100)
+        self.assertTrue(self.chip.autonomous_als)
+        self.assertEqual(self.chip.registers[SimulatedSI1145.REGISTER_RESPONSE] & SI1145.RESPONSE_ERROR, 0)
+        self.sensor.close()
+
+    def test_auto_range_failure(self):
+        factory = MockFactory()
+        int_pin = factory.pin(25)
+        self.chip.interrupt_listener = lambda level: int_pin.drive_high() if level else int_pin.drive_low()
+        self.sensor.auto_range = True
+        measurements = []
+        self.sensor.start_autonomous(25, measurements.append, pin_factory=factory)
+        attempts = []
+
+        def overflowing(parameters):
+            attempts.append(parameters)
+            raise SI1145CommandError(SI1145.PARAM_SET, SI1145.RESPONSE_ALS_VIS_ADC_OVERFLOW)
+
+        self.sensor.set_parameters = overflowing
+        self.chip.set_light(10)
+        self.chip.run_autonomous_cycle()
+        # the measurement was delivered, the levels stay in sync with the chip and measuring resumed
+        self.assertEqual(len(measurements), 1)
+        self.assertEqual(len(attempts), SI1145.RANGE_RETRIES)
+        self.assertEqual(self.sensor.vis_range.level, 0)
+        self.assertEqual(self.sensor.last_uv_index, 0.0)
+        self.assertTrue(self.chip.autonomous_als)
+        self.sensor.close()
@@ -1,6 +1,7 @@
-import math
 from typing import Tuple
 
+import numpy as np
+
 data = {
     4: {
         "angle_step": 360.0 / 4.0,
@@ -30,13 +31,35 @@ data = {
 }
 
 
+# Per division lookup tables (angle_step_offset, angle_step, names), resolved once instead of per call
+sector_tables = {divisions: (entry["angle_step_offset"], entry["angle_step"], tuple(entry["names"]))
+                 for divisions, entry in data.items()}
+sector_name_arrays = {divisions: np.array(entry["names"]) for divisions, entry in data.items()}
+
+
 def get_cardinal_point(degrees: float, divisions: int = 8) -> str:
-    index = math.floor(((degrees + data[divisions]["angle_step_offset"]) % 360.0) / data[divisions]["angle_step"])
-    return data[divisions]["names"][index]
+    angle_step_offset, angle_step, names = sector_tables[divisions]
+    # a tiny negative angle % 360.0 rounds up to 360.0
+    return names[int(((degrees + angle_step_offset) % 360.0) / angle_step) % divisions]
+
+
+def get_cardinal_points(degrees: np.ndarray, divisions: int = 8) -> np.ndarray:
+    # Array version of get_cardinal_point
+    angle_step_offset, angle_step, _ = sector_tables[divisions]
+    indices = (np.mod(np.asarray(degrees, dtype=np.float64) + angle_step_offset, 360.0) / angle_step).astype(np.intp)
+    # -1e-20 % 360.0 rounds up to 360.0
+    return sector_name_arrays[divisions][indices % divisions]
 
 
 def degrees_to_string(degrees: float) -> str:
-    return degree_minutes_to_string(*degree_decimal_to_degree_minutes(degrees))
+    (degrees, degrees_fraction) = divmod(degrees, 1)
+    return "%d° %d'" % (degrees, round(degrees_fraction * 60.0))
+
+
+def degrees_to_strings(degrees: np.ndarray) -> np.ndarray:
+    # Array version of degrees_to_string
+    whole_degrees, minutes = degree_decimals_to_degree_minutes(degrees)
+    return np.char.add(np.char.add(whole_degrees.astype(str), "° "), np.char.add(minutes.astype(str), "'"))
 
 
 def degree_decimal_to_degree_minutes(degrees: float) -> Tuple[int, int]:
@@ -45,5 +68,12 @@ def degree_decimal_to_degree_minutes(degrees: float) -> Tuple[int, int]:
     return int(degrees), minutes
 
 
+def degree_decimals_to_degree_minutes(degrees: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    # Array version of degree_decimal_to_degree_minutes, np.round rounds half to even like round
+    (degrees, degrees_fraction) = np.divmod(np.asarray(degrees, dtype=np.float64), 1)
+    minutes = np.round(degrees_fraction * 60.0)
+    return degrees.astype(np.int64), minutes.astype(np.int64)
+
+
 def degree_minutes_to_string(degrees: int, minutes: int) -> str:
     return "%s° %s'" % (degrees, minutes)
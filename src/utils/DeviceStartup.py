@@ -0,0 +1,77 @@
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Callable, Dict, List, Optional
+
+import time
+
+
+class StartupStep:
+    def __init__(self, name: str, start: Callable[[], Any], close: Optional[Callable[[Any], None]] = None):
+        self.name = name
+        self.start = start
+        # releases the result of start when another step failed
+        self.close = close
+        # seconds since the bootstrap began, set when the step ran
+        self.begin: Optional[float] = None
+        self.end: Optional[float] = None
+        self.future: Optional[Future] = None
+
+    @property
+    def duration(self) -> float:
+        return self.end - self.begin if self.end is not None else 0.0
+
+
+class DeviceStartup:
+    # Initializes independent devices on a thread pool, so the settle times of one driver overlap the bus I/O of
+    # the others. Every SharedBus transfer (and every bus.transaction() block) takes the bus lock, so the I2C
+    # traffic stays serialized. The station is ready after the slowest device instead of the sum of all.
+    def __init__(self, max_workers: Optional[int] = None):
+        self.steps: List[StartupStep] = []
+        self.max_workers = max_workers
+        self.begin = 0.0
+        self.total = 0.0
+
+    def add(self, name: str, start: Callable[[], Any], close: Optional[Callable[[Any], None]] = None) -> StartupStep:
+        step = StartupStep(name, start, close)
+        self.steps.append(step)
+        return step
+
+    def run_step(self, step: StartupStep) -> Any:
+        step.begin = time.perf_counter() - self.begin
+        try:
+            return step.start()
+        finally:
+            step.end = time.perf_counter() - self.begin
+
+    def run(self) -> Dict[str, Any]:
+        # Returns the result of every step by name, the first failure is raised once all steps finished and the
+        # devices that did start are closed again
+        self.begin = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=self.max_workers or max(1, len(self.steps))) as executor:
+            for step in self.steps:
+                step.future = executor.submit(self.run_step, step)
+        self.total = time.perf_counter() - self.begin
+        failed = [step for step in self.steps if step.future.exception() is not None]
+        if failed:
+            self.close_started()
+            raise failed[0].future.exception()
+        return {step.name: step.future.result() for step in self.steps}
+
+    def close_started(self):
+        for step in self.steps:
+            if step.close is None or step.future.exception() is not None:
+                continue
+            try:
+                step.close(step.future.result())
+            except Exception as e:
+                print("[WARN] Closing %s failed: %s" % (step.name, e))
+
+    @property
+    def sequential_total(self) -> float:
+        return sum(step.duration for step in self.steps)
+
+    def print_statistics(self):
+        for step in self.steps:
+            print("[Startup] %s: %.1f ms (from %.1f ms)%s" % (
+                step.name, step.duration * 1000.0, (step.begin or 0.0) * 1000.0,
+                ", failed: %s" % step.future.exception() if step.future.exception() is not None else ""))
+        print("[Startup] total: %.1f ms, sequential: %.1f ms" % (self.total * 1000.0, self.sequential_total * 1000.0))
@@ -0,0 +1,70 @@
+from typing import Optional, Tuple
+
+import numpy as np
+
+
+class FrameChangeDetector:
+    # Compares small grayscale thumbnails of consecutive frames so near-duplicate sky images can be dropped before
+    # the full resolution frame is encoded and uploaded.
+
+    def __init__(self, threshold: float = 4.0, max_skipped: int = 10, thumbnail_size: Tuple[int, int] = (64, 48)):
+        # mean absolute luma difference (0-255) against the last kept frame required to keep a frame
+        self.threshold = threshold
+        # keep at least every n-th frame, even if nothing changed
+        self.max_skipped = max_skipped
+        # (width, height), multiples of 32 and 16 avoid the padding of unencoded picamera captures
+        self.thumbnail_size = thumbnail_size
+        self.reference: Optional[np.ndarray] = None
+        self.last_difference = 0.0
+        self.skipped_in_row = 0
+        self.kept = 0
+        self.dropped = 0
+        self.forced = 0
+
+    @property
+    def drop_ratio(self) -> float:
+        total = self.kept + self.dropped
+        return self.dropped / total if total > 0 else 0.0
+
+    @staticmethod
+    def to_rgb(data: bytes, width: int, height: int) -> np.ndarray:
+        # unencoded picamera output is padded to a multiple of 32 columns and 16 rows
+        padded_width = (width + 31) // 32 * 32
+        padded_height = (height + 15) // 16 * 16
+        pixels = np.frombuffer(data, dtype=np.uint8)
+        if pixels.size == padded_width * padded_height * 3:
+            return pixels.reshape(padded_height, padded_width, 3)[:height, :width]
+        return pixels.reshape(height, width, 3)
+
+    @staticmethod
+    def to_luma(data: bytes, width: int, height: int) -> np.ndarray:
+        rgb = FrameChangeDetector.to_rgb(data, width, height).astype(np.float32)
+        return 0.299 * rgb[..., 0] + 0.587 * rgb[..., 1] + 0.114 * rgb[..., 2]
+
+    def update(self, thumbnail: np.ndarray) -> bool:
+        # Returns whether the frame belonging to the thumbnail should be kept. Differences are measured against the
+        # last kept frame, so a slow drift still triggers once it adds up.
+        if self.reference is None:
+            self.last_difference = float("inf")
+            changed = True
+        else:
+            self.last_difference = float(np.mean(np.abs(thumbnail - self.reference)))
+            changed = self.last_difference >= self.threshold
+        if not changed and self.skipped_in_row >= self.max_skipped:
+            self.forced += 1
+            changed = True
+        if changed:
+            self.reference = thumbnail
+            self.skipped_in_row = 0
+            self.kept += 1
+        else:
+            self.skipped_in_row += 1
+            self.dropped += 1
+        return changed
+
+    def update_from_rgb(self, data: bytes) -> bool:
+        return self.update(FrameChangeDetector.to_luma(data, *self.thumbnail_size))
+
+    def print_statistics(self):
+        print("[FrameChangeDetector] kept: %s (%s forced), dropped: %s (%.1f%%), last difference: %.2f" % (
+            self.kept, self.forced, self.dropped, self.drop_ratio * 100, self.last_difference))
@@ -0,0 +1,98 @@
+from typing import Tuple
+
+import numpy as np
+
+# Hard- and soft-iron calibration of a 3-axis magnetometer. The measured field lies on an ellipsoid
+#   (p - c)^T A (p - c) = 1
+# with the hard-iron offset c and the soft-iron distortion A. The fitted correction maps it onto the unit sphere
+#   p' = W (p - c) with W = sqrt(A)
+# and is returned as a 3x4 affine matrix M = [W | -W c], so a sample is corrected with M @ [x, y, z, 1].
+
+# Datasets recorded by turning the station only around its vertical axis barely span z, the z terms of the
+# ellipsoid are then unreliable and only the horizontal ellipse is fitted.
+MAX_AXIS_RATIO = 4.0
+
+
+class EllipsoidCalibrator:
+    def __init__(self, scale: float = None):
+        # Points are divided by scale to keep the normal equations well conditioned, defaults to the magnitude of
+        # the first point
+        self.scale = scale
+        self.count = 0
+        # Normal equations D^T D v = D^T 1 of the quadric
+        # a x^2 + b y^2 + c z^2 + 2d xy + 2e xz + 2f yz + 2g x + 2h y + 2i z = 1
+        self.dtd = np.zeros((9, 9))
+        self.dt1 = np.zeros(9)
+
+    def add(self, x: float, y: float, z: float):
+        self.add_points(np.array([[x, y, z]], dtype=np.float64))
+
+    def add_points(self, points: np.ndarray):
+        points = np.asarray(points, dtype=np.float64).reshape(-1, 3)
+        if len(points) == 0:
+            return
+        if self.scale is None:
+            self.scale = float(np.abs(points[0]).max()) or 1.0
+        x, y, z = (points / self.scale).T
+        design = np.column_stack([x * x, y * y, z * z, 2 * x * y, 2 * x * z, 2 * y * z, 2 * x, 2 * y, 2 * z])
+        self.dtd += design.T @ design
+        self.dt1 += design.sum(axis=0)
+        self.count += len(points)
+
+    def solve(self) -> np.ndarray:
+        try:
+            matrix, radii = self.solve_ellipsoid()
+            if radii.max() / radii.min() <= MAX_AXIS_RATIO:
+                return matrix
+        except (np.linalg.LinAlgError, ValueError):
+            pass
+        return self.solve_ellipse()
+
+    def solve_ellipsoid(self) -> Tuple[np.ndarray, np.ndarray]:
+        if self.count < 9:
+            raise ValueError("At least 9 points are needed for an ellipsoid fit")
+        v = np.linalg.solve(self.dtd, self.dt1)
+        quadric = np.array([[v[0], v[3], v[4]], [v[3], v[1], v[5]], [v[4], v[5], v[2]]])
+        return self.to_correction(quadric, v[6:9])
+
+    def solve_ellipse(self) -> np.ndarray:
+        # Horizontal ellipse a x^2 + b y^2 + 2d xy + 2g x + 2h y = 1 from the x/y rows of the same normal equations,
+        # z is passed through unchanged
+        if self.count < 5:
+            raise ValueError("At least 5 points are needed for an ellipse fit")
+        indices = [0, 1, 3, 6, 7]
+        v = np.linalg.solve(self.dtd[np.ix_(indices, indices)], self.dt1[indices])
+        quadric = np.array([[v[0], v[2]], [v[2], v[1]]])
+        matrix_2d, _ = self.to_correction(quadric, v[3:5])
+        matrix = np.zeros((3, 4))
+        matrix[0:2, 0:2] = matrix_2d[:, 0:2]
+        matrix[0:2, 3] = matrix_2d[:, 2]
+        matrix[2, 2] = 1.0
+        return matrix
+
+    def to_correction(self, quadric: np.ndarray, linear: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        center = -np.linalg.solve(quadric, linear)
+        quadric = quadric / (1.0 + center @ quadric @ center)
+        eigenvalues, eigenvectors = np.linalg.eigh(quadric)
+        if np.any(eigenvalues <= 0):
+            raise ValueError("Points do not lie on an ellipsoid")
+        # symmetric square root keeps the axes orientation
+        soft_iron = eigenvectors @ np.diag(np.sqrt(eigenvalues)) @ eigenvectors.T
+        matrix = np.hstack([soft_iron / self.scale, (-soft_iron @ center)[:, np.newaxis]])
+        return matrix, 1.0 / np.sqrt(eigenvalues) * self.scale
+
+
+def fit(points: np.ndarray) -> np.ndarray:
+    calibrator = EllipsoidCalibrator()
+    calibrator.add_points(points)
+    return calibrator.solve()
+
+
+def apply(matrix: np.ndarray, points: np.ndarray) -> np.ndarray:
+    points = np.asarray(points, dtype=np.float64).reshape(-1, 3)
+    return points @ matrix[:, 0:3].T + matrix[:, 3]
+
+
+def load_points(file_path: str) -> np.ndarray:
+    # CSV with a x,y,z header as written by main.compass_sensor
+    return np.loadtxt(file_path, delimiter=",", skiprows=1, ndmin=2)
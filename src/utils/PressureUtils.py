@@ -1,32 +1,72 @@
 import math
 
+import numpy as np
+
+# Barometric constant (hypsometric constant) K=delta.bldelta1.M (18400 m)
+K = 18400.0
+# mean barometric pressure of the air column (hPa)
+MEAN_PRESSURE = 1013.25
+# coefficient of thermal expansion of the air
+THERMAL_EXPANSION = 0.0037
+# constant depending on the figure of the earth
+FIGURE_OF_EARTH = 0.0026
+
+
+class SeaLevelReducer:
+    """
+    Reduction of station pressure to mean sea level with all location dependent terms computed once per station.
+    http://www.wind101.net/sea-level-pressure-advanced/sea-level-pressure-advanced.html
+    """
+
+    def __init__(self, height: float, latitude: float):
+        """
+        :param height: station height above mean sea level (m)
+        :param latitude: station latitude (degrees)
+        """
+        self.height = height
+        self.latitude = latitude
+        # delta height from upper and lower (mean sea level) station
+        dZ = height - 0
+        # Correction for asphericity of the earth
+        cor_e = 1 / (1 - (FIGURE_OF_EARTH * math.cos(2 * math.radians(latitude))))
+        self.exponent_scale = dZ / (K * cor_e)
+
+    def reduce(self, pressure: float, temperature: float) -> float:
+        """
+        :param pressure: station pressure (hPa)
+        :param temperature: air temperature (°C)
+        :return: pressure at mean sea level (hPa) rounded to 4 decimals
+        """
+        # mean pressure of aqueous vapour in the air column (hPa)
+        e = 10 ** (7.5 * temperature / (237.3 + temperature)) * 6.1078
+        # dZ / (cor_temperature * cor_humidity * cor_e) with the humidity correction 1 / (1 - 0.378 * (e / b))
+        exponent = self.exponent_scale * (1 - 0.378 * (e / MEAN_PRESSURE)) / (1 + THERMAL_EXPANSION * temperature)
+        p0c = pressure * 10 ** exponent
+        return round(p0c * 10000.0) / 10000.0
+
+    def reduce_array(self, pressure: np.ndarray, temperature: np.ndarray) -> np.ndarray:
+        """
+        Array version of reduce for reprocessing pressure / temperature series.
+        :param pressure: station pressures (hPa)
+        :param temperature: air temperatures (°C)
+        :return: pressures at mean sea level (hPa) rounded to 4 decimals
+        """
+        pressure = np.asarray(pressure, dtype=np.float64)
+        temperature = np.asarray(temperature, dtype=np.float64)
+        e = np.power(10.0, 7.5 * temperature / (237.3 + temperature)) * 6.1078
+        exponent = self.exponent_scale * (1 - 0.378 * (e / MEAN_PRESSURE)) / (1 + THERMAL_EXPANSION * temperature)
+        p0c = pressure * np.power(10.0, exponent)
+        return np.round(p0c * 10000.0) / 10000.0
+
 
 def adjust_to_mean_sea_level(pressure: float, height: float, latitude: float, temperature: float) -> float:
     """
     http://www.wind101.net/sea-level-pressure-advanced/sea-level-pressure-advanced.html
+    Prefer a SeaLevelReducer when reducing more than one reading of the same station.
     :param pressure:
     :param height:
-    :param latitude:
+    :param latitude: in degrees
     :param temperature:
     :return:
     """
-    # delta height from upper and lower (mean sea level) station
-    dZ = height - 0
-    # mean pressure of aqueous vapour in the air column (hPa)
-    e = math.pow(10, 7.5 * temperature / (237.3 + temperature)) * 6.1078
-    # mean barometric pressure of the air column (hPa)
-    b = 1013.25
-    # Barometric constant (hypsometric constant) K=delta.bldelta1.M (18400 m)
-    K = 18400.0
-    # coefficient of thermal expansion of the air
-    a = 0.0037
-    # constant depending on the figure of the earth
-    k = 0.0026
-    # Correction for atmospheric temperature
-    cor_temperature = K * (1 + a * temperature)
-    # Correction for humidity
-    cor_humidity = 1 / (1 - 0.378 * (e / b))
-    # Correction for asphericity of the earth
-    cor_e = 1 / (1 - (k * math.cos(2 * latitude)))
-    p0c = math.pow(10, dZ / (cor_temperature * cor_humidity * cor_e) + math.log10(pressure))
-    return round(p0c * 10000.0) / 10000.0
+    return SeaLevelReducer(height, latitude).reduce(pressure, temperature)
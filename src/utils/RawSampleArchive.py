@@ -0,0 +1,105 @@
+from typing import List, Optional
+
+import datetime
+import io
+import os
+import struct
+
+import numpy as np
+
+
+class RawSampleArchive:
+    # File layout: header, calibration block, fixed size records of a float64 timestamp followed by the raw
+    # register bytes of one sample. Records are only ever appended, a partially written last record is ignored.
+    MAGIC = b"WPRA"
+    VERSION = 1
+    HEADER_FORMAT = "<4sHHI16s"
+    HEADER_SIZE = struct.calcsize(HEADER_FORMAT)
+    TIMESTAMP_FORMAT = "<d"
+    TIMESTAMP_SIZE = struct.calcsize(TIMESTAMP_FORMAT)
+
+    def __init__(self, file_path: str, device_name: str = "", sample_size: int = 0, calibration: bytes = b""):
+        # Without a device_name an existing archive is opened as it is. With one, an existing archive of another
+        # device, sample size or calibration (e.g. a swapped chip) is moved aside and a new one is started.
+        self.file_path = file_path
+        self.rotated_path: Optional[str] = None
+        if os.path.isfile(file_path) and os.path.getsize(file_path) > 0:
+            self.read_header()
+            if device_name and not self.matches(device_name, sample_size, calibration):
+                self.rotate()
+        if not os.path.isfile(file_path) or os.path.getsize(file_path) == 0:
+            self.device_name = device_name
+            self.sample_size = sample_size
+            self.calibration = bytes(calibration)
+            self.write_header()
+        self.record_size = RawSampleArchive.TIMESTAMP_SIZE + self.sample_size
+        self.data_offset = RawSampleArchive.HEADER_SIZE + len(self.calibration)
+        self.truncate_partial_record()
+        self.file = io.open(file_path, "ab")
+
+    @staticmethod
+    def for_device(device, directory: str) -> 'RawSampleArchive':
+        # One archive per device, the device provides RAW_SAMPLE_SIZE and its raw calibration_data
+        if not os.path.exists(directory):
+            os.makedirs(directory)
+        device_name = "%s_%s" % (type(device).__name__, hex(device.i2c_address))
+        return RawSampleArchive(os.path.join(directory, device_name + ".raw"), device_name, device.RAW_SAMPLE_SIZE,
+                                device.calibration_data)
+
+    def matches(self, device_name: str, sample_size: int, calibration: bytes) -> bool:
+        # the header stores at most 16 bytes of the name
+        return self.device_name == device_name.encode("ascii")[:16].decode("ascii") and \
+            self.sample_size == sample_size and self.calibration == bytes(calibration)
+
+    def rotate(self):
+        root, extension = os.path.splitext(self.file_path)
+        self.rotated_path = "%s_%s%s" % (root, datetime.datetime.now().strftime("%Y%m%dT%H%M%S"), extension)
+        print("[WARN] %s belongs to another device (%s, %s bytes), moved to %s" % (
+            self.file_path, self.device_name, self.sample_size, self.rotated_path))
+        os.replace(self.file_path, self.rotated_path)
+
+    def read_header(self):
+        with io.open(self.file_path, "rb") as f:
+            magic, version, self.sample_size, calibration_size, device_name = struct.unpack(
+                RawSampleArchive.HEADER_FORMAT, f.read(RawSampleArchive.HEADER_SIZE))
+            if magic != RawSampleArchive.MAGIC or version != RawSampleArchive.VERSION:
+                raise ValueError("%s is not a raw sample archive" % self.file_path)
+            self.device_name = device_name.rstrip(b"\0").decode("ascii")
+            self.calibration = f.read(calibration_size)
+
+    def write_header(self):
+        with io.open(self.file_path, "wb") as f:
+            f.write(struct.pack(RawSampleArchive.HEADER_FORMAT, RawSampleArchive.MAGIC, RawSampleArchive.VERSION,
+                                self.sample_size, len(self.calibration), self.device_name.encode("ascii")[:16]))
+            f.write(self.calibration)
+
+    def truncate_partial_record(self):
+        size = os.path.getsize(self.file_path)
+        complete_size = self.data_offset + (size - self.data_offset) // self.record_size * self.record_size
+        if complete_size != size:
+            os.truncate(self.file_path, complete_size)
+
+    def append(self, timestamp: float, data: List[int] or bytes):
+        if len(data) != self.sample_size:
+            raise ValueError("Expected %s raw bytes, got %s" % (self.sample_size, len(data)))
+        self.file.write(struct.pack(RawSampleArchive.TIMESTAMP_FORMAT, timestamp) + bytes(data))
+
+    def flush(self):
+        self.file.flush()
+
+    def close(self):
+        self.file.close()
+
+    def __len__(self) -> int:
+        self.flush()
+        return (os.path.getsize(self.file_path) - self.data_offset) // self.record_size
+
+    def get_dtype(self) -> np.dtype:
+        return np.dtype([("timestamp", "<f8"), ("data", "u1", (self.sample_size,))])
+
+    def map(self) -> np.ndarray:
+        # Read only, zero-copy view of all records, fields "timestamp" and "data"
+        count = len(self)
+        if count == 0:
+            return np.empty(0, dtype=self.get_dtype())
+        return np.memmap(self.file_path, dtype=self.get_dtype(), mode="r", offset=self.data_offset, shape=(count,))
@@ -0,0 +1,103 @@
+from concurrent.futures import Executor, ThreadPoolExecutor
+from typing import Any, Callable, List, Optional
+
+import asyncio
+import math
+
+
+class SamplingTask:
+    def __init__(self, name: str, interval: float, sample: Callable[[], Any],
+                 handler: Optional[Callable[[Any], None]] = None):
+        self.name = name
+        # seconds between two samples
+        self.interval = interval
+        self.sample = sample
+        self.handler = handler
+        self.samples = 0
+        self.missed = 0
+        self.errors = 0
+        self.max_jitter = 0.0
+        self.total_jitter = 0.0
+
+    @property
+    def mean_jitter(self) -> float:
+        return self.total_jitter / self.samples if self.samples > 0 else 0.0
+
+    def record_jitter(self, jitter: float):
+        self.samples += 1
+        self.total_jitter += jitter
+        self.max_jitter = max(self.max_jitter, jitter)
+
+
+class SamplingScheduler:
+    def __init__(self, executor: Optional[Executor] = None):
+        self.tasks: List[SamplingTask] = []
+        self.executor = executor
+        self.running = False
+
+    def add(self, name: str, interval: float, sample: Callable[[], Any],
+            handler: Optional[Callable[[Any], None]] = None) -> SamplingTask:
+        task = SamplingTask(name, interval, sample, handler)
+        self.tasks.append(task)
+        return task
+
+    async def run_task(self, task: SamplingTask, executor: Executor):
+        loop = asyncio.get_running_loop()
+        # Deadlines are absolute multiples of the interval, so jitter of one sample does not accumulate as drift
+        deadline = loop.time()
+        while self.running:
+            delay = deadline - loop.time()
+            if delay > 0:
+                await asyncio.sleep(delay)
+            jitter = loop.time() - deadline
+            try:
+                # Bus I/O blocks, run it outside the event loop
+                result = await loop.run_in_executor(executor, task.sample)
+            except asyncio.CancelledError:
+                # stopped while the sample was pending, it is neither counted nor handled
+                raise
+            except Exception as e:
+                task.record_jitter(jitter)
+                task.errors += 1
+                print("[%s] Sampling failed: %s" % (task.name, e))
+            else:
+                task.record_jitter(jitter)
+                try:
+                    if task.handler is not None:
+                        task.handler(result)
+                except Exception as e:
+                    task.errors += 1
+                    print("[%s] Handling failed: %s" % (task.name, e))
+            deadline += task.interval
+            late = loop.time() - deadline
+            if late > task.interval:
+                # Skip the slots that can't be met anymore instead of sampling in a burst
+                skipped = math.floor(late / task.interval)
+                task.missed += skipped
+                deadline += skipped * task.interval
+
+    async def run(self, duration: float = None):
+        self.running = True
+        executor = self.executor or ThreadPoolExecutor(max_workers=max(1, len(self.tasks)))
+        runners = [asyncio.ensure_future(self.run_task(task, executor)) for task in self.tasks]
+        try:
+            if duration is None:
+                await asyncio.gather(*runners)
+            else:
+                await asyncio.sleep(duration)
+        finally:
+            self.running = False
+            for runner in runners:
+                runner.cancel()
+            await asyncio.gather(*runners, return_exceptions=True)
+            if self.executor is None:
+                executor.shutdown(wait=True)
+
+    def stop(self):
+        self.running = False
+
+    def print_statistics(self):
+        for task in self.tasks:
+            print("[%s] interval: %.2f ms, samples: %s, missed: %s, errors: %s, jitter mean: %.3f ms, max: %.3f ms" % (
+                task.name, task.interval * 1000.0, task.samples, task.missed, task.errors, task.mean_jitter * 1000.0,
+                task.max_jitter * 1000.0))
@@ -0,0 +1,48 @@
+from concurrent.futures import ProcessPoolExecutor
+from typing import NamedTuple, Tuple
+import multiprocessing
+
+import numpy as np
+
+from utils.FrameChangeDetector import FrameChangeDetector
+
+# red/blue ratio above which a pixel counts as cloud, clear sky scatters far more blue than red
+CLOUD_RATIO_THRESHOLD = 0.7
+# mean relative luma below which the frame is considered taken at night
+NIGHT_BRIGHTNESS = 0.08
+# pixels this dark carry no usable colour information and are left out of the cloud fraction
+MIN_PIXEL_BRIGHTNESS = 10
+
+
+class SkyConditions(NamedTuple):
+    # fraction of the usable sky pixels classified as cloud, nan at night
+    cloud_fraction: float
+    # mean relative luma in [0, 1]
+    brightness: float
+    is_day: bool
+
+
+def analyze(image: np.ndarray) -> SkyConditions:
+    # image is a (height, width, 3) uint8 RGB array, ideally a small thumbnail
+    rgb = image.reshape(-1, 3).astype(np.float32)
+    red, green, blue = rgb[:, 0], rgb[:, 1], rgb[:, 2]
+    luma = 0.299 * red + 0.587 * green + 0.114 * blue
+    brightness = float(luma.mean()) / 255
+    is_day = brightness >= NIGHT_BRIGHTNESS
+    usable = luma >= MIN_PIXEL_BRIGHTNESS
+    if not is_day or not usable.any():
+        return SkyConditions(float("nan"), brightness, is_day)
+    ratio = red[usable] / np.maximum(blue[usable], 1)
+    cloud_fraction = float(np.count_nonzero(ratio > CLOUD_RATIO_THRESHOLD)) / ratio.size
+    return SkyConditions(cloud_fraction, brightness, is_day)
+
+
+def analyze_rgb(data: bytes, size: Tuple[int, int]) -> SkyConditions:
+    # Entry point for process pools, only the raw bytes of an unencoded capture cross the process boundary
+    return analyze(FrameChangeDetector.to_rgb(data, *size))
+
+
+def create_analysis_pool(workers: int = 1) -> ProcessPoolExecutor:
+    # The station forks from a process already running scheduler, bus and startup threads, a forked child could
+    # inherit locks held by them. Spawned workers start from a fresh interpreter instead.
+    return ProcessPoolExecutor(workers, mp_context=multiprocessing.get_context("spawn"))
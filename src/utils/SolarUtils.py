@@ -0,0 +1,135 @@
+from typing import List, NamedTuple, Optional, Tuple, Union
+import bisect
+import datetime
+
+import numpy as np
+
+# Solar position after the NOAA solar calculator (https://gml.noaa.gov/grad/solcalc/calcdetails.html), accurate to
+# about a minute for sunrise and sunset which is plenty to decide how to expose a sky camera.
+
+# elevation of the sun's centre at sunrise/sunset including refraction and the solar disc radius (degrees)
+SUNRISE_ELEVATION = -0.833
+CIVIL_TWILIGHT_ELEVATION = -6.0
+NAUTICAL_TWILIGHT_ELEVATION = -12.0
+ASTRONOMICAL_TWILIGHT_ELEVATION = -18.0
+
+DAY = "day"
+CIVIL_TWILIGHT = "civil_twilight"
+NAUTICAL_TWILIGHT = "nautical_twilight"
+ASTRONOMICAL_TWILIGHT = "astronomical_twilight"
+NIGHT = "night"
+# phases from bright to dark with the lowest solar elevation belonging to each of them
+PHASES = [(DAY, SUNRISE_ELEVATION), (CIVIL_TWILIGHT, CIVIL_TWILIGHT_ELEVATION),
+          (NAUTICAL_TWILIGHT, NAUTICAL_TWILIGHT_ELEVATION), (ASTRONOMICAL_TWILIGHT, ASTRONOMICAL_TWILIGHT_ELEVATION),
+          (NIGHT, -90.0)]
+# resolution of the daily table
+TABLE_STEP = 60
+
+
+class SolarDay(NamedTuple):
+    date: datetime.date
+    # None if the sun does not cross the respective elevation on that day (polar day or night)
+    astronomical_dawn: Optional[datetime.datetime]
+    nautical_dawn: Optional[datetime.datetime]
+    civil_dawn: Optional[datetime.datetime]
+    sunrise: Optional[datetime.datetime]
+    sunset: Optional[datetime.datetime]
+    civil_dusk: Optional[datetime.datetime]
+    nautical_dusk: Optional[datetime.datetime]
+    astronomical_dusk: Optional[datetime.datetime]
+    # (start, phase) for every phase of the day in order, starting at midnight
+    phases: List[Tuple[datetime.datetime, str]]
+
+
+def get_solar_elevation(latitude: float, longitude: float,
+                        timestamps: Union[float, np.ndarray]) -> Union[float, np.ndarray]:
+    # timestamps are POSIX seconds, scalars and arrays of any shape are supported
+    timestamps = np.asarray(timestamps, dtype=np.float64)
+    julian_century = (timestamps / 86400 + 2440587.5 - 2451545) / 36525
+    mean_longitude = np.radians((280.46646 + julian_century * (36000.76983 + julian_century * 0.0003032)) % 360)
+    mean_anomaly = np.radians(357.52911 + julian_century * (35999.05029 - 0.0001537 * julian_century))
+    eccentricity = 0.016708634 - julian_century * (0.000042037 + 0.0000001267 * julian_century)
+    equation_of_center = np.sin(mean_anomaly) * (1.914602 - julian_century * (0.004817 + 0.000014 * julian_century)) + \
+        np.sin(2 * mean_anomaly) * (0.019993 - 0.000101 * julian_century) + np.sin(3 * mean_anomaly) * 0.000289
+    omega = np.radians(125.04 - 1934.136 * julian_century)
+    apparent_longitude = np.radians(np.degrees(mean_longitude) + equation_of_center - 0.00569 -
+                                    0.00478 * np.sin(omega))
+    mean_obliquity = 23 + (26 + (21.448 - julian_century * (
+            46.815 + julian_century * (0.00059 - julian_century * 0.001813))) / 60) / 60
+    obliquity = np.radians(mean_obliquity + 0.00256 * np.cos(omega))
+    declination = np.arcsin(np.sin(obliquity) * np.sin(apparent_longitude))
+    y = np.tan(obliquity / 2) ** 2
+    # equation of time (minutes)
+    equation_of_time = 4 * np.degrees(
+        y * np.sin(2 * mean_longitude) - 2 * eccentricity * np.sin(mean_anomaly) +
+        4 * eccentricity * y * np.sin(mean_anomaly) * np.cos(2 * mean_longitude) -
+        0.5 * y * y * np.sin(4 * mean_longitude) - 1.25 * eccentricity * eccentricity * np.sin(2 * mean_anomaly))
+    true_solar_time = ((timestamps % 86400) / 60 + equation_of_time + 4 * longitude) % 1440
+    hour_angle = np.radians(true_solar_time / 4 - 180)
+    latitude = np.radians(latitude)
+    cos_zenith = np.sin(latitude) * np.sin(declination) + \
+        np.cos(latitude) * np.cos(declination) * np.cos(hour_angle)
+    elevation = 90 - np.degrees(np.arccos(np.clip(cos_zenith, -1, 1)))
+    return elevation if elevation.ndim > 0 else float(elevation)
+
+
+def get_sun_phase(elevation: float) -> str:
+    for phase, min_elevation in PHASES:
+        if elevation >= min_elevation:
+            return phase
+    return NIGHT
+
+
+def get_solar_day(latitude: float, longitude: float, date: datetime.date,
+                  tz: Optional[datetime.tzinfo] = None) -> SolarDay:
+    # Evaluates the elevation once per TABLE_STEP over the whole (local) day and interpolates the crossings
+    # the local time zone of the station unless given
+    start = datetime.datetime.combine(date, datetime.time(), tz) if tz else \
+        datetime.datetime.combine(date, datetime.time()).astimezone()
+    timestamps = start.timestamp() + np.arange(0, 86400 + TABLE_STEP, TABLE_STEP, dtype=np.float64)
+    elevations = get_solar_elevation(latitude, longitude, timestamps)
+
+    def crossing(threshold: float, rising: bool) -> Optional[datetime.datetime]:
+        above = elevations >= threshold
+        edges = np.flatnonzero(above[1:] & ~above[:-1] if rising else ~above[1:] & above[:-1])
+        if edges.size == 0:
+            return None
+        i = edges[0]
+        fraction = (threshold - elevations[i]) / (elevations[i + 1] - elevations[i])
+        return datetime.datetime.fromtimestamp(timestamps[i] + fraction * TABLE_STEP, start.tzinfo)
+
+    # phase boundaries are where the phase index changes between two table entries
+    indices = np.searchsorted(-np.array([e for _, e in PHASES]), -elevations, side="left")
+    indices = np.minimum(indices, len(PHASES) - 1)
+    phases = [(start, PHASES[indices[0]][0])]
+    for i in np.flatnonzero(indices[1:] != indices[:-1]):
+        phases.append((datetime.datetime.fromtimestamp(timestamps[i + 1], start.tzinfo), PHASES[indices[i + 1]][0]))
+    return SolarDay(date,
+                    crossing(ASTRONOMICAL_TWILIGHT_ELEVATION, True), crossing(NAUTICAL_TWILIGHT_ELEVATION, True),
+                    crossing(CIVIL_TWILIGHT_ELEVATION, True), crossing(SUNRISE_ELEVATION, True),
+                    crossing(SUNRISE_ELEVATION, False), crossing(CIVIL_TWILIGHT_ELEVATION, False),
+                    crossing(NAUTICAL_TWILIGHT_ELEVATION, False), crossing(ASTRONOMICAL_TWILIGHT_ELEVATION, False),
+                    phases)
+
+
+class SolarSchedule:
+    # Keeps the table of the current day for a fixed location, looking up the phase of the sun is then a bisection
+    # instead of evaluating the solar position.
+
+    def __init__(self, latitude: float, longitude: float):
+        self.latitude = latitude
+        self.longitude = longitude
+        self.day: Optional[SolarDay] = None
+        self.phase_starts: List[datetime.datetime] = []
+
+    def get_day(self, date: datetime.date) -> SolarDay:
+        if self.day is None or self.day.date != date:
+            self.day = get_solar_day(self.latitude, self.longitude, date)
+            self.phase_starts = [start for start, _ in self.day.phases]
+        return self.day
+
+    def get_phase(self, now: Optional[datetime.datetime] = None) -> str:
+        # the table covers a local day, so the date has to be taken in local time as well
+        now = (now or datetime.datetime.now()).astimezone()
+        day = self.get_day(now.date())
+        return day.phases[max(bisect.bisect_right(self.phase_starts, now) - 1, 0)][1]
@@ -2,6 +2,8 @@ from unittest import TestCase
 
 from utils import CompassUtils
 
+import numpy as np
+
 
 class TestCompassUtils(TestCase):
     def test_get_cardinal_point(self):
@@ -24,3 +26,22 @@ class TestCompassUtils(TestCase):
 
     def test_degree_minutes_to_string(self):
         self.assertEquals(CompassUtils.degree_minutes_to_string(2, 49), "2° 49'")
+
+    def test_get_cardinal_point_rounding(self):
+        for divisions in [4, 8, 16, 32]:
+            angle_step_offset = CompassUtils.sector_tables[divisions][0]
+            # (degrees + offset) % 360.0 rounds to 360.0, which is the first sector again
+            self.assertEqual(CompassUtils.get_cardinal_point(-angle_step_offset - 1e-14, divisions), "N")
+
+    def test_get_cardinal_points(self):
+        degrees = np.linspace(-720.0, 720.0, 14401)
+        for divisions in [4, 8, 16, 32]:
+            expected = [CompassUtils.get_cardinal_point(x, divisions) for x in degrees]
+            self.assertEqual(CompassUtils.get_cardinal_points(degrees, divisions).tolist(), expected)
+
+    def test_degrees_to_strings(self):
+        degrees = np.linspace(-360.0, 360.0, 7201)
+        expected = [CompassUtils.degree_minutes_to_string(*CompassUtils.degree_decimal_to_degree_minutes(x))
+                    for x in degrees]
+        self.assertEqual(CompassUtils.degrees_to_strings(degrees).tolist(), expected)
+        self.assertEqual([CompassUtils.degrees_to_string(x) for x in degrees], expected)
@@ -0,0 +1,67 @@
+from unittest import TestCase
+
+from wpiio import I2CBus
+from wpiio.simulation.SimulatedBus import SimulatedBus
+from wpiio.simulation.SimulatedBME280 import SimulatedBME280
+from wpiio.simulation.SimulatedSI1145 import SimulatedSI1145
+from sensors.BME280 import BME280
+from sensors.SI1145 import SI1145
+from utils.DeviceStartup import DeviceStartup
+
+import time
+
+
+class TestDeviceStartup(TestCase):
+    def tearDown(self):
+        I2CBus.set_bus_factory(None)
+
+    def test_concurrent_steps(self):
+        startup = DeviceStartup()
+        for name in ["a", "b", "c"]:
+            startup.add(name, lambda name=name: time.sleep(0.2) or name)
+        self.assertEqual(startup.run(), {"a": "a", "b": "b", "c": "c"})
+        self.assertLess(startup.total, 0.4)
+        self.assertGreaterEqual(startup.sequential_total, 0.6)
+
+    def test_failure(self):
+        startup = DeviceStartup()
+        slow = startup.add("slow", lambda: time.sleep(0.1))
+        startup.add("failing", lambda: 1 / 0)
+        with self.assertRaises(ZeroDivisionError):
+            startup.run()
+        # the other steps still completed
+        self.assertGreaterEqual(slow.duration, 0.1)
+
+    def test_failure_closes_started(self):
+        closed = []
+        startup = DeviceStartup()
+        startup.add("a", lambda: "a", closed.append)
+        startup.add("b", lambda: time.sleep(0.1) or "b", closed.append)
+        startup.add("failing", lambda: 1 / 0, closed.append)
+        startup.add("unclosable", lambda: "c")
+        with self.assertRaises(ZeroDivisionError):
+            startup.run()
+        self.assertEqual(sorted(closed), ["a", "b"])
+
+    def test_failure_close_error(self):
+        startup = DeviceStartup()
+        startup.add("a", lambda: "a", lambda _: 1 / 0)
+        startup.add("failing", lambda: int("x"))
+        # the original failure surfaces, not the one from closing
+        with self.assertRaises(ValueError):
+            startup.run()
+
+    def test_shared_bus(self):
+        bus = SimulatedBus()
+        bus.attach(SimulatedBME280())
+        bus.attach(SimulatedSI1145())
+        I2CBus.set_bus_factory(lambda bus_number: bus)
+        startup = DeviceStartup()
+        startup.add("SI1145", SI1145)
+        startup.add("BME280", BME280)
+        devices = startup.run()
+        self.assertTrue(devices["SI1145"].is_chip_id_valid())
+        self.assertTrue(devices["BME280"].is_chip_id_valid())
+        self.assertIs(devices["SI1145"].bus, devices["BME280"].bus)
+        for device in devices.values():
+            device.close()
@@ -0,0 +1,38 @@
+from unittest import TestCase
+
+from sensors.Camera import Camera
+from sensors.FakeCamera import FakeCamera
+from utils.FrameChangeDetector import FrameChangeDetector
+
+import numpy as np
+
+
+class TestFrameChangeDetector(TestCase):
+    def test_drops_static_frames(self):
+        camera = Camera(FakeCamera(), settle_time=0)
+        detector = FrameChangeDetector(threshold=2.0, max_skipped=3)
+        kept = [detector.update_from_rgb(camera.capture("rgb", detector.thumbnail_size).data) for _ in range(9)]
+        # first frame, then one forced frame after every 3 dropped ones
+        self.assertEqual(kept, [True, False, False, False, True, False, False, False, True])
+        self.assertEqual(detector.kept, 3)
+        self.assertEqual(detector.forced, 2)
+        self.assertEqual(detector.dropped, 6)
+        self.assertAlmostEqual(detector.drop_ratio, 6 / 9)
+
+    def test_keeps_changed_frames(self):
+        def brightening(width, height, frame_index):
+            return np.full((height, width, 3), 20 * frame_index, dtype=np.uint8)
+
+        camera = Camera(FakeCamera(brightening), settle_time=0)
+        detector = FrameChangeDetector(threshold=10.0)
+        kept = [detector.update_from_rgb(camera.capture("rgb", detector.thumbnail_size).data) for _ in range(5)]
+        self.assertEqual(kept, [True] * 5)
+        self.assertAlmostEqual(detector.last_difference, 20.0, places=3)
+
+    def test_padded_capture(self):
+        width, height = 40, 30
+        padded = np.zeros((32, 64, 3), dtype=np.uint8)
+        padded[:height, :width] = 100
+        luma = FrameChangeDetector.to_luma(padded.tobytes(), width, height)
+        self.assertEqual(luma.shape, (height, width))
+        self.assertTrue(np.allclose(luma, 100, atol=0.01))
@@ -0,0 +1,35 @@
+from unittest import TestCase
+
+from utils import MagnetometerCalibration
+from utils.MagnetometerCalibration import EllipsoidCalibrator
+
+import os
+
+import numpy as np
+
+
+class TestMagnetometerCalibration(TestCase):
+    def setUp(self):
+        random = np.random.default_rng(7)
+        directions = random.normal(size=(400, 3))
+        directions /= np.linalg.norm(directions, axis=1)[:, np.newaxis]
+        soft_iron = np.array([[1.2, 0.1, 0.0], [0.1, 0.8, 0.05], [0.0, 0.05, 1.0]]) * 600.0
+        self.points = directions @ soft_iron.T + np.array([300.0, -200.0, 100.0])
+
+    def test_fit_ellipsoid(self):
+        corrected = MagnetometerCalibration.apply(MagnetometerCalibration.fit(self.points), self.points)
+        np.testing.assert_allclose(np.linalg.norm(corrected, axis=1), 1.0, atol=1e-9)
+
+    def test_streaming(self):
+        calibrator = EllipsoidCalibrator()
+        for point in self.points:
+            calibrator.add(*point)
+        np.testing.assert_allclose(calibrator.solve(), MagnetometerCalibration.fit(self.points), atol=1e-9)
+
+    def test_horizontal_dataset(self):
+        points = MagnetometerCalibration.load_points(os.path.join(os.path.dirname(__file__), "..", "calibration1.csv"))
+        matrix = MagnetometerCalibration.fit(points)
+        self.assertEqual(matrix[2].tolist(), [0.0, 0.0, 1.0, 0.0])
+        radius = np.linalg.norm(MagnetometerCalibration.apply(matrix, points)[:, 0:2], axis=1)
+        self.assertAlmostEqual(radius.mean(), 1.0, places=2)
+        self.assertLess(radius.std(), 0.05)
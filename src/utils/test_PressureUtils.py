@@ -0,0 +1,32 @@
+from unittest import TestCase
+
+from utils import PressureUtils
+from utils.PressureUtils import SeaLevelReducer
+
+import math
+
+import numpy as np
+
+
+class TestPressureUtils(TestCase):
+    @staticmethod
+    def reference(pressure: float, height: float, latitude: float, temperature: float) -> float:
+        # formula as published, with the latitude in radians
+        e = math.pow(10, 7.5 * temperature / (237.3 + temperature)) * 6.1078
+        cor_temperature = 18400.0 * (1 + 0.0037 * temperature)
+        cor_humidity = 1 / (1 - 0.378 * (e / 1013.25))
+        cor_e = 1 / (1 - (0.0026 * math.cos(2 * math.radians(latitude))))
+        return math.pow(10, height / (cor_temperature * cor_humidity * cor_e) + math.log10(pressure))
+
+    def test_adjust_to_mean_sea_level(self):
+        for pressure, height, latitude, temperature in [(1006.53, 111, 52.038264, 25.08), (850.0, 1500, -33.9, -5.0),
+                                                        (1013.25, 0, 0.0, 15.0)]:
+            self.assertAlmostEqual(PressureUtils.adjust_to_mean_sea_level(pressure, height, latitude, temperature),
+                                   self.reference(pressure, height, latitude, temperature), places=3)
+
+    def test_reduce_array(self):
+        reducer = SeaLevelReducer(111, 52.038264)
+        pressure = np.linspace(950.0, 1050.0, 101)
+        temperature = np.linspace(-20.0, 35.0, 101)
+        expected = [reducer.reduce(p, t) for p, t in zip(pressure.tolist(), temperature.tolist())]
+        np.testing.assert_allclose(reducer.reduce_array(pressure, temperature), expected, rtol=0, atol=1e-4)
@@ -0,0 +1,107 @@
+from types import SimpleNamespace
+from unittest import TestCase
+
+from wpiio import I2CBus
+from wpiio.simulation.SimulatedBus import SimulatedBus
+from wpiio.simulation.SimulatedBME280 import SimulatedBME280
+from wpiio.simulation.SimulatedSI1145 import SimulatedSI1145
+from sensors import BoschBatchCompensation, BoschCompensation
+from sensors.BME280 import BME280
+from sensors.SI1145 import SI1145, SI1145AutoRange
+from utils.RawSampleArchive import RawSampleArchive
+
+import os
+import tempfile
+import shutil
+
+
+class TestRawSampleArchive(TestCase):
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+        I2CBus.set_bus_factory(None)
+
+    def test_append_and_map(self):
+        file_path = os.path.join(self.directory, "test.raw")
+        archive = RawSampleArchive(file_path, "test", 3, b"\x01\x02")
+        archive.append(1.5, [1, 2, 3])
+        archive.append(2.5, bytes([4, 5, 6]))
+        with self.assertRaises(ValueError):
+            archive.append(3.5, [1])
+        archive.close()
+        # simulate a record cut short by a power loss
+        with open(file_path, "ab") as f:
+            f.write(b"\x00\x01")
+        archive = RawSampleArchive(file_path)
+        self.assertEqual(archive.device_name, "test")
+        self.assertEqual(archive.calibration, b"\x01\x02")
+        self.assertEqual(len(archive), 2)
+        records = archive.map()
+        self.assertEqual(list(records["timestamp"]), [1.5, 2.5])
+        self.assertEqual(records["data"][1].tolist(), [4, 5, 6])
+        archive.close()
+
+    def test_header_mismatch(self):
+        file_path = os.path.join(self.directory, "test.raw")
+        archive = RawSampleArchive(file_path, "test", 3, b"\x01\x02")
+        archive.append(1.5, [1, 2, 3])
+        archive.close()
+        archive = RawSampleArchive(file_path, "test", 3, b"\x01\x02")
+        self.assertIsNone(archive.rotated_path)
+        self.assertEqual(len(archive), 1)
+        archive.close()
+        # a swapped chip comes with another calibration, its samples must not be mixed with the old ones
+        archive = RawSampleArchive(file_path, "test", 3, b"\x03\x04")
+        self.assertEqual(archive.calibration, b"\x03\x04")
+        self.assertEqual(len(archive), 0)
+        archive.close()
+        rotated = RawSampleArchive(archive.rotated_path)
+        self.assertEqual(len(rotated), 1)
+        rotated.close()
+
+    def test_recompensate_bme280(self):
+        bus = SimulatedBus()
+        chip = bus.attach(SimulatedBME280())
+        I2CBus.set_bus_factory(lambda bus_number: bus)
+        sensor = BME280()
+        sensor.archive = RawSampleArchive.for_device(sensor, self.directory)
+        temperatures = []
+        for raw_temperature in range(500000, 520000, 1000):
+            chip.set_raw_values(415148, raw_temperature, 30000)
+            sensor.read()
+            temperatures.append(sensor.last_temperature)
+        sensor.archive.close()
+
+        archive = RawSampleArchive(os.path.join(self.directory, "BME280_0x76.raw"))
+        calibration = SimpleNamespace(**BoschCompensation.parse_calibration(archive.calibration))
+        raw_pressure, raw_temperature, raw_humidity = BoschBatchCompensation.decode_raw_samples(archive.map()["data"])
+        temperature, _, _ = BoschBatchCompensation.refine(calibration, raw_pressure, raw_temperature, raw_humidity)
+        self.assertEqual(temperature.tolist(), temperatures)
+        archive.close()
+
+    def test_si1145_range_settings(self):
+        bus = SimulatedBus()
+        chip = bus.attach(SimulatedSI1145())
+        I2CBus.set_bus_factory(lambda bus_number: bus)
+        sensor = SI1145(auto_range=True)
+        sensor.archive = RawSampleArchive.for_device(sensor, self.directory)
+        chip.set_light(10)
+        levels = []
+        for _ in range(3):
+            levels.append(sensor.vis_range.level)
+            sensor.read_measurement()
+        sensor.close()
+        sensor.archive.close()
+
+        archive = RawSampleArchive(os.path.join(self.directory, "SI1145_0x60.raw"))
+        data = archive.map()["data"]
+        self.assertEqual(data.shape, (3, SI1145.RAW_SAMPLE_SIZE))
+        # every record keeps the VIS and IR gain and signal range its counts were measured with
+        for record, level in zip(data, levels):
+            high_range, gain = SI1145AutoRange.SETTINGS[level]
+            misc = SI1145.PARAM_ADCMISC_RANGE_HI if high_range else SI1145.PARAM_ADCMISC_RANGE_NORM
+            self.assertEqual(record[12:14].tolist(), [gain, misc])
+        self.assertNotEqual(levels[0], levels[-1])
+        archive.close()
@@ -0,0 +1,33 @@
+from unittest import TestCase
+
+from utils.SamplingScheduler import SamplingScheduler
+
+import asyncio
+import time
+
+
+class TestSamplingScheduler(TestCase):
+    def test_run(self):
+        scheduler = SamplingScheduler()
+        results = []
+        fast = scheduler.add("fast", 0.01, lambda: time.sleep(0.001))
+        slow = scheduler.add("slow", 0.05, lambda: 42, results.append)
+        asyncio.run(scheduler.run(0.25))
+        self.assertGreaterEqual(fast.samples, 15)
+        self.assertIn(slow.samples, range(4, 7))
+        self.assertEqual(results, [42] * slow.samples)
+
+    def test_errors(self):
+        scheduler = SamplingScheduler()
+        task = scheduler.add("failing", 0.01, lambda: 1 / 0)
+        asyncio.run(scheduler.run(0.05))
+        self.assertEqual(task.errors, task.samples)
+
+    def test_cancelled_sample(self):
+        scheduler = SamplingScheduler()
+        results = []
+        # the run ends while the sample is still in the executor
+        task = scheduler.add("slow", 1.0, lambda: time.sleep(0.1) or 1, results.append)
+        asyncio.run(scheduler.run(0.05))
+        self.assertEqual(task.samples, 0)
+        self.assertEqual(results, [])
@@ -0,0 +1,32 @@
+from unittest import TestCase
+
+from sensors.FakeCamera import FakeCamera
+from utils import SkyAnalysis
+
+import math
+import numpy as np
+
+
+class TestSkyAnalysis(TestCase):
+    def test_clear_sky(self):
+        conditions = SkyAnalysis.analyze(FakeCamera.sky_gradient(64, 48, 0))
+        self.assertEqual(conditions.cloud_fraction, 0.0)
+        self.assertTrue(conditions.is_day)
+        self.assertAlmostEqual(conditions.brightness, 0.42, places=2)
+
+    def test_half_overcast(self):
+        image = FakeCamera.sky_gradient(64, 48, 0)
+        image[:, :32] = 200
+        conditions = SkyAnalysis.analyze(image)
+        self.assertAlmostEqual(conditions.cloud_fraction, 0.5)
+
+    def test_night(self):
+        conditions = SkyAnalysis.analyze(np.full((48, 64, 3), 5, dtype=np.uint8))
+        self.assertFalse(conditions.is_day)
+        self.assertTrue(math.isnan(conditions.cloud_fraction))
+
+    def test_process_pool(self):
+        image = np.full((48, 64, 3), 180, dtype=np.uint8)
+        with SkyAnalysis.create_analysis_pool() as pool:
+            conditions = pool.submit(SkyAnalysis.analyze_rgb, image.tobytes(), (64, 48)).result()
+        self.assertEqual(conditions.cloud_fraction, 1.0)
@@ -0,0 +1,54 @@
+from unittest import TestCase
+
+from utils import SolarUtils
+
+import datetime
+import numpy as np
+
+CEST = datetime.timezone(datetime.timedelta(hours=2))
+
+
+class TestSolarUtils(TestCase):
+    def assertTimeAlmostEqual(self, actual: datetime.datetime, expected: datetime.datetime, minutes: float = 2):
+        self.assertLessEqual(abs((actual - expected).total_seconds()), minutes * 60)
+
+    def test_solar_elevation(self):
+        # Berlin, summer solstice around solar noon
+        noon = datetime.datetime(2026, 6, 21, 13, 12, tzinfo=CEST).timestamp()
+        self.assertAlmostEqual(SolarUtils.get_solar_elevation(52.52, 13.405, noon), 60.9, places=1)
+        elevations = SolarUtils.get_solar_elevation(52.52, 13.405, noon + np.array([[0, 43200]]))
+        self.assertEqual(elevations.shape, (1, 2))
+        self.assertLess(elevations[0, 1], -10)
+
+    def test_solar_day(self):
+        day = SolarUtils.get_solar_day(52.52, 13.405, datetime.date(2026, 6, 21), CEST)
+        self.assertTimeAlmostEqual(day.sunrise, datetime.datetime(2026, 6, 21, 4, 43, tzinfo=CEST))
+        self.assertTimeAlmostEqual(day.sunset, datetime.datetime(2026, 6, 21, 21, 33, tzinfo=CEST))
+        self.assertLess(day.civil_dawn, day.sunrise)
+        self.assertGreater(day.nautical_dusk, day.civil_dusk)
+        # the sun doesn't get below -18° in a Berlin summer night
+        self.assertIsNone(day.astronomical_dawn)
+        self.assertEqual(day.phases[0], (datetime.datetime(2026, 6, 21, tzinfo=CEST), SolarUtils.ASTRONOMICAL_TWILIGHT))
+        self.assertEqual([phase for _, phase in day.phases][3:5], [SolarUtils.DAY, SolarUtils.CIVIL_TWILIGHT])
+
+    def test_polar_day(self):
+        day = SolarUtils.get_solar_day(69.65, 18.96, datetime.date(2026, 6, 21), CEST)
+        self.assertIsNone(day.sunrise)
+        self.assertIsNone(day.sunset)
+        self.assertEqual([phase for _, phase in day.phases], [SolarUtils.DAY])
+
+    def test_schedule(self):
+        schedule = SolarUtils.SolarSchedule(52.52, 13.405)
+        for hour, minute in [(0, 0), (4, 0), (12, 0), (21, 50), (23, 59)]:
+            now = datetime.datetime(2026, 6, 21, hour, minute).astimezone()
+            elevation = SolarUtils.get_solar_elevation(52.52, 13.405, now.timestamp())
+            self.assertEqual(schedule.get_phase(now), SolarUtils.get_sun_phase(elevation))
+
+    def test_schedule_other_timezone(self):
+        schedule = SolarUtils.SolarSchedule(52.52, 13.405)
+        for offset in [-12, 14]:
+            tz = datetime.timezone(datetime.timedelta(hours=offset))
+            for hour in [0, 6, 12, 18]:
+                now = datetime.datetime(2026, 6, 21, hour, 0).astimezone().astimezone(tz)
+                elevation = SolarUtils.get_solar_elevation(52.52, 13.405, now.timestamp())
+                self.assertEqual(schedule.get_phase(now), SolarUtils.get_sun_phase(elevation))
@@ -0,0 +1,39 @@
+from typing import Callable, Dict, Optional
+
+from wpiio.SharedBus import SharedBus
+
+import threading
+import smbus2
+
+# Optional replacement for the smbus2 backend, e.g. a SimulatedBus on hosts without an I2C bus
+bus_factory: Optional[Callable[[int], object]] = None
+
+# One shared handle per bus number for the whole process
+pool: Dict[int, SharedBus] = {}
+pool_lock = threading.Lock()
+
+
+def set_bus_factory(factory: Optional[Callable[[int], object]]):
+    # Every I2CDevice created afterwards obtains its bus handle from this factory, None restores smbus2
+    global bus_factory
+    with pool_lock:
+        bus_factory = factory
+        pool.clear()
+
+
+def open_bus(bus_number: int) -> SharedBus:
+    with pool_lock:
+        if bus_number not in pool:
+            handle = bus_factory(bus_number) if bus_factory is not None else smbus2.SMBus(bus_number)
+            pool[bus_number] = SharedBus(bus_number, handle)
+        bus = pool[bus_number]
+        bus.users += 1
+        return bus
+
+
+def release_bus(bus: SharedBus):
+    with pool_lock:
+        bus.users -= 1
+        if bus.users <= 0 and pool.get(bus.bus_number) is bus:
+            del pool[bus.bus_number]
+            bus.close()
@@ -4,16 +4,33 @@ from sensors.Sensor import Sensor
 from ctypes import c_short
 from typing import List
 
-import smbus2
+from wpiio import I2CBus
 
 
 class I2CDevice(Sensor):
-    def __init__(self, i2c_address: int):
+    # Rev 1 Pi uses bus 0
+    # Rev 2 Pi, Pi 2 & Pi 3 uses bus 1
+    DEFAULT_BUS_NUMBER = 1
+    # Number of raw register bytes per sample stored in a RawSampleArchive
+    RAW_SAMPLE_SIZE = 0
+
+    def __init__(self, i2c_address: int, bus_number: int = DEFAULT_BUS_NUMBER):
         super().__init__()
         self.i2c_address = i2c_address
-        # Rev 1 Pi uses bus 0
-        # Rev 2 Pi, Pi 2 & Pi 3 uses bus 1
-        self.bus = smbus2.SMBus(1)
+        self.bus = I2CBus.open_bus(bus_number)
+        # Raw calibration EEPROM content, stored once in the header of raw sample archives
+        self.calibration_data = b""
+        self.archive = None
+
+    def close(self):
+        # Drop this device's reference on the pooled bus handle
+        if self.bus is not None:
+            I2CBus.release_bus(self.bus)
+            self.bus = None
+
+    def archive_raw_sample(self, data: List):
+        if self.archive is not None:
+            self.archive.append(self.get_now(), data)
 
     @abstractmethod
     def get_chip_id(self) -> str or None:
@@ -53,5 +70,10 @@ class I2CDevice(Sensor):
     def write_register(self, register: int, data: int):
         self.bus.write_byte_data(self.i2c_address, register, data)
 
+    def write_registers(self, register: int, data: List[int]):
+        # Consecutive registers in one transaction, relies on the chip's address auto-increment
+        self.bus.write_i2c_block_data(self.i2c_address, register, data)
+
     def write_register_short(self, register: int, data: int):
-        self.bus.write_block_data(self.i2c_address, register, [data & 255, (data >> 8) & 255])
+        # Plain I2C block write, an SMBus block write would send a length byte into the register first
+        self.bus.write_i2c_block_data(self.i2c_address, register, [data & 255, (data >> 8) & 255])
@@ -1,5 +1,18 @@
+from typing import Callable, NamedTuple, Optional, Tuple
+
+from gpiozero import DigitalInputDevice
+
 from wpiio.I2CDevice import I2CDevice
 
+import time
+
+
+class MCP23017PinChange(NamedTuple):
+    # time.monotonic() of the INT edge, the level is the one captured in INTCAP at that moment
+    timestamp: float
+    pin: int
+    level: int
+
 
 class MCP23017(I2CDevice):
     DEFAULT_DEVICE_I2C_ADDRESS = 0x20
@@ -27,14 +40,22 @@ class MCP23017(I2CDevice):
     REGISTER_OLATA = 0x14
     REGISTER_OLATB = 0x15
 
+    IOCON_BANK = 1 << 7
+    # INTA and INTB are internally connected, one GPIO line is enough to watch both ports
+    IOCON_MIRROR = 1 << 6
+    # INT pins are push-pull active-high
+    IOCON_INTPOL = 1 << 1
+
     def __init__(self, i2c_address: int = DEFAULT_DEVICE_I2C_ADDRESS):
         super().__init__(i2c_address)
         # https://electronics.stackexchange.com/questions/325916/mcp23017-detecting-state-of-iocon-bank-bit-after-mcu-reset
-        # Assume IOCON.BANK = 1
-        value = self.read_register(MCP23017.REGISTER_GPINTENB, 1)[0]
-        value = value & 0x7F
-        self.write_register(MCP23017.REGISTER_GPINTENB, value)
-        self.write_register(MCP23017.REGISTER_IOCON, (1 << 7) | (1 << 1))
+        # With IOCON.BANK = 1 (e.g. after an MCU reset without a chip reset) 0x05 is IOCON, with BANK = 0 it is
+        # GPINTENB which is cleared below anyway. Clearing bit 7 therefore always ends up in BANK = 0 addressing.
+        with self.bus.transaction():
+            value = self.read_register(MCP23017.REGISTER_GPINTENB, 1)[0]
+            value = value & 0x7F
+            self.write_register(MCP23017.REGISTER_GPINTENB, value)
+            self.write_register(MCP23017.REGISTER_IOCON, MCP23017.IOCON_MIRROR | MCP23017.IOCON_INTPOL)
         self.write_register(MCP23017.REGISTER_GPINTENA, 0x0)
         self.write_register(MCP23017.REGISTER_GPINTENB, 0x0)
         self.write_register(MCP23017.REGISTER_INTCONA, 0xFF)
@@ -47,6 +68,9 @@ class MCP23017(I2CDevice):
         self.write_register(MCP23017.REGISTER_GPPUB, 0xFF)
         self.set_pins_input(*([True] * 16))
         self.set_pins_input(*([False] * 16))
+        self.interrupt_line: Optional[DigitalInputDevice] = None
+        self.change_handler: Optional[Callable[[MCP23017PinChange], None]] = None
+        self.interrupts = 0
 
     def get_chip_id(self) -> str or None:
         pass
@@ -83,3 +107,46 @@ class MCP23017(I2CDevice):
         else:
             value = self.read_register(MCP23017.REGISTER_GPIOB, 1)[0]
             return (value >> (index - 8)) & 0x01
+
+    def enable_interrupts(self, pins: int, compare_to_default: int = 0, default_values: int = 0):
+        # pins enables interrupt-on-change per bit (bit 0 is GPA0), pins set in compare_to_default interrupt when
+        # they differ from default_values instead of on every change
+        self.write_register_short(MCP23017.REGISTER_DEFVALA, default_values & 0xFFFF)
+        self.write_register_short(MCP23017.REGISTER_INTCONA, compare_to_default & 0xFFFF)
+        self.write_register_short(MCP23017.REGISTER_GPINTENA, pins & 0xFFFF)
+
+    def read_interrupt_capture(self) -> Tuple[int, int]:
+        # INTFA, INTFB, INTCAPA and INTCAPB are adjacent, one read returns the flags and clears the interrupt
+        data = self.read_register(MCP23017.REGISTER_INTFA, 4)
+        return (data[1] << 8) | data[0], (data[3] << 8) | data[2]
+
+    def start_interrupts(self, int_pin: int, handler: Callable[[MCP23017PinChange], None], pins: int = 0xFFFF,
+                         pin_factory=None):
+        # The bus is only touched when the INT line fires, idle inputs cause no traffic at all
+        self.change_handler = handler
+        self.enable_interrupts(pins)
+        # clear anything latched before the handler was installed
+        self.read_interrupt_capture()
+        self.interrupt_line = DigitalInputDevice(int_pin, pull_up=None, active_state=True, pin_factory=pin_factory)
+        self.interrupt_line.when_activated = self.on_interrupt
+        # a change latched between clearing the capture and attaching the callback never produces an edge
+        if self.interrupt_line.is_active:
+            self.on_interrupt()
+
+    def stop_interrupts(self):
+        if self.interrupt_line is not None:
+            self.interrupt_line.close()
+            self.interrupt_line = None
+            self.write_register_short(MCP23017.REGISTER_GPINTENA, 0)
+
+    def on_interrupt(self):
+        timestamp = time.monotonic()
+        self.interrupts += 1
+        flags, captured = self.read_interrupt_capture()
+        for pin in range(16):
+            if (flags >> pin) & 0x01:
+                self.change_handler(MCP23017PinChange(timestamp, pin, (captured >> pin) & 0x01))
+
+    def close(self):
+        self.stop_interrupts()
+        super().close()
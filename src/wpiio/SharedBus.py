@@ -0,0 +1,65 @@
+from concurrent.futures import Future
+from typing import Callable, List, Tuple
+
+import threading
+
+
+class SharedBus:
+    def __init__(self, bus_number: int, handle):
+        self.bus_number = bus_number
+        self.handle = handle
+        # Reentrant so a device can group several transfers while each transfer still takes the lock
+        self.lock = threading.RLock()
+        self.queue: List[Tuple[Callable, tuple, Future]] = []
+        self.queue_lock = threading.Lock()
+        self.users = 0
+
+    def transaction(self) -> threading.RLock:
+        # Usage: with bus.transaction(): ... keeps other devices off the bus for the whole block
+        return self.lock
+
+    def read_byte_data(self, i2c_addr: int, register: int) -> int:
+        with self.lock:
+            return self.handle.read_byte_data(i2c_addr, register)
+
+    def write_byte_data(self, i2c_addr: int, register: int, value: int):
+        with self.lock:
+            self.handle.write_byte_data(i2c_addr, register, value)
+
+    def read_i2c_block_data(self, i2c_addr: int, register: int, length: int) -> List[int]:
+        with self.lock:
+            return self.handle.read_i2c_block_data(i2c_addr, register, length)
+
+    def write_i2c_block_data(self, i2c_addr: int, register: int, data: List[int]):
+        with self.lock:
+            self.handle.write_i2c_block_data(i2c_addr, register, data)
+
+    def write_block_data(self, i2c_addr: int, register: int, data: List[int]):
+        with self.lock:
+            self.handle.write_block_data(i2c_addr, register, data)
+
+    def enqueue(self, function: Callable, *args) -> Future:
+        # Queue a device operation, it is executed together with all other queued operations on the next flush
+        future = Future()
+        with self.queue_lock:
+            self.queue.append((function, args, future))
+        return future
+
+    def flush(self) -> int:
+        with self.queue_lock:
+            queue = self.queue
+            self.queue = []
+        with self.lock:
+            for function, args, future in queue:
+                if not future.set_running_or_notify_cancel():
+                    continue
+                try:
+                    future.set_result(function(*args))
+                except Exception as e:
+                    future.set_exception(e)
+        return len(queue)
+
+    def close(self):
+        self.flush()
+        with self.lock:
+            self.handle.close()
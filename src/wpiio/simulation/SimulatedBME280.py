@@ -0,0 +1,51 @@
+from wpiio.simulation.SimulatedBMP280 import SimulatedBMP280
+
+
+class SimulatedBME280(SimulatedBMP280):
+    CHIP_ID = 0x60
+
+    REGISTER_HUM_MSB = 0xFD
+    REGISTER_CTRL_HUM = 0xF2
+    REGISTER_CALIBRATION_25 = 0xA1
+    REGISTER_CALIBRATION_26 = 0xE1
+
+    # Humidity calibration as read from a typical part
+    DEFAULT_HUMIDITY_CALIBRATION = {
+        "dig_H1": 75, "dig_H2": 362, "dig_H3": 0, "dig_H4": 313, "dig_H5": 50, "dig_H6": 30
+    }
+    DEFAULT_RAW_HUMIDITY = 30916
+
+    def __init__(self, i2c_address: int = SimulatedBMP280.DEFAULT_DEVICE_I2C_ADDRESS):
+        self.raw_humidity = SimulatedBME280.DEFAULT_RAW_HUMIDITY
+        super().__init__(i2c_address)
+
+    def write_calibration(self):
+        super().write_calibration()
+        self.calibration.update(SimulatedBME280.DEFAULT_HUMIDITY_CALIBRATION)
+        self.registers[SimulatedBME280.REGISTER_CALIBRATION_25] = self.calibration["dig_H1"]
+        self.set_short(SimulatedBME280.REGISTER_CALIBRATION_26, self.calibration["dig_H2"])
+        self.registers[SimulatedBME280.REGISTER_CALIBRATION_26 + 2] = self.calibration["dig_H3"]
+        # dig_H4 and dig_H5 are 12-bit values sharing the nibbles of 0xE5
+        dig_h4 = self.calibration["dig_H4"]
+        dig_h5 = self.calibration["dig_H5"]
+        self.registers[SimulatedBME280.REGISTER_CALIBRATION_26 + 3] = (dig_h4 >> 4) & 0xFF
+        self.registers[SimulatedBME280.REGISTER_CALIBRATION_26 + 4] = (dig_h4 & 0x0F) | ((dig_h5 & 0x0F) << 4)
+        self.registers[SimulatedBME280.REGISTER_CALIBRATION_26 + 5] = (dig_h5 >> 4) & 0xFF
+        self.registers[SimulatedBME280.REGISTER_CALIBRATION_26 + 6] = self.calibration["dig_H6"] & 0xFF
+
+    def set_raw_values(self, raw_pressure: int, raw_temperature: int, raw_humidity: int = None):
+        if raw_humidity is not None:
+            self.raw_humidity = raw_humidity
+        super().set_raw_values(raw_pressure, raw_temperature)
+
+    def write_data(self):
+        super().write_data()
+        self.registers[SimulatedBME280.REGISTER_HUM_MSB] = (self.raw_humidity >> 8) & 0xFF
+        self.registers[SimulatedBME280.REGISTER_HUM_MSB + 1] = self.raw_humidity & 0xFF
+
+    def get_sample_counts(self):
+        code = self.registers[SimulatedBME280.REGISTER_CTRL_HUM] & 0x07
+        return super().get_sample_counts() + [1 << (code - 1) if code else 0]
+
+    def get_writable_registers(self):
+        return super().get_writable_registers() + (SimulatedBME280.REGISTER_CTRL_HUM,)
@@ -0,0 +1,102 @@
+import time
+
+from wpiio.simulation.SimulatedChip import SimulatedChip
+
+
+class SimulatedBMP280(SimulatedChip):
+    DEFAULT_DEVICE_I2C_ADDRESS = 0x76
+    CHIP_ID = 0x58
+
+    REGISTER_PRESS_MSB = 0xF7
+    REGISTER_TEMP_MSB = 0xFA
+    REGISTER_CTRL_MEAS = 0xF4
+    REGISTER_STATUS = 0xF3
+    REGISTER_CONFIG = 0xF5
+    REGISTER_RESET = 0xE0
+    REGISTER_ID = 0xD0
+    REGISTER_CALIBRATION_00 = 0x88
+
+    RESET_WORD = 0xB6
+    STATUS_MEASURING = 1 << 3
+    MODE_SLEEP = 0
+    MODE_NORMAL = 3
+
+    # Calibration and raw values from the datasheet example (section 8.2), 25.08°C and 1006.53 hPa
+    DEFAULT_CALIBRATION = {
+        "dig_T1": 27504, "dig_T2": 26435, "dig_T3": -1000,
+        "dig_P1": 36477, "dig_P2": -10685, "dig_P3": 3024, "dig_P4": 2855, "dig_P5": 140, "dig_P6": -7,
+        "dig_P7": 15500, "dig_P8": -14600, "dig_P9": 6000
+    }
+    DEFAULT_RAW_TEMPERATURE = 519888
+    DEFAULT_RAW_PRESSURE = 415148
+
+    def __init__(self, i2c_address: int = DEFAULT_DEVICE_I2C_ADDRESS):
+        super().__init__(i2c_address)
+        self.calibration = dict(SimulatedBMP280.DEFAULT_CALIBRATION)
+        self.raw_temperature = SimulatedBMP280.DEFAULT_RAW_TEMPERATURE
+        self.raw_pressure = SimulatedBMP280.DEFAULT_RAW_PRESSURE
+        self.registers[SimulatedBMP280.REGISTER_ID] = self.CHIP_ID
+        # fixed duration of a conversion (s), None for the typical time of the configured oversampling
+        self.conversion_time = None
+        self.conversion_end = 0.0
+        self.conversions = 0
+        self.write_calibration()
+        self.write_data()
+
+    def write_calibration(self):
+        names = ["dig_T1", "dig_T2", "dig_T3", "dig_P1", "dig_P2", "dig_P3", "dig_P4", "dig_P5", "dig_P6", "dig_P7",
+                 "dig_P8", "dig_P9"]
+        for i, name in enumerate(names):
+            self.set_short(SimulatedBMP280.REGISTER_CALIBRATION_00 + i * 2, self.calibration[name])
+
+    def set_raw_values(self, raw_pressure: int, raw_temperature: int):
+        self.raw_pressure = raw_pressure
+        self.raw_temperature = raw_temperature
+        self.write_data()
+
+    def write_data(self):
+        self.set_raw_20bit(SimulatedBMP280.REGISTER_PRESS_MSB, self.raw_pressure)
+        self.set_raw_20bit(SimulatedBMP280.REGISTER_TEMP_MSB, self.raw_temperature)
+
+    def set_raw_20bit(self, register: int, value: int):
+        self.registers[register] = (value >> 12) & 0xFF
+        self.registers[register + 1] = (value >> 4) & 0xFF
+        self.registers[register + 2] = (value << 4) & 0xF0
+
+    def get_sample_counts(self):
+        # number of temperature and pressure samples of a conversion
+        ctrl_meas = self.registers[SimulatedBMP280.REGISTER_CTRL_MEAS]
+        return [1 << (code - 1) if code else 0 for code in [ctrl_meas >> 5, (ctrl_meas >> 2) & 0x07]]
+
+    def get_conversion_time(self) -> float:
+        if self.conversion_time is not None:
+            return self.conversion_time
+        counts = self.get_sample_counts()
+        # typical measurement time, datasheet appendix B
+        return (1.0 + 2.0 * counts[0] + sum(2.0 * count + 0.5 for count in counts[1:] if count)) / 1000.0
+
+    def read_byte(self, register: int) -> int:
+        if register == SimulatedBMP280.REGISTER_STATUS:
+            if time.monotonic() < self.conversion_end:
+                return SimulatedBMP280.STATUS_MEASURING
+            ctrl_meas = self.registers[SimulatedBMP280.REGISTER_CTRL_MEAS]
+            if ctrl_meas & 0x03 not in (SimulatedBMP280.MODE_SLEEP, SimulatedBMP280.MODE_NORMAL):
+                # back to sleep after a forced conversion
+                self.registers[SimulatedBMP280.REGISTER_CTRL_MEAS] = ctrl_meas & 0xFC
+            return 0
+        return super().read_byte(register)
+
+    def write_byte(self, register: int, value: int):
+        if register == SimulatedBMP280.REGISTER_RESET:
+            if value == SimulatedBMP280.RESET_WORD:
+                self.registers[SimulatedBMP280.REGISTER_CTRL_MEAS] = 0
+                self.registers[SimulatedBMP280.REGISTER_CONFIG] = 0
+        elif register in self.get_writable_registers():
+            super().write_byte(register, value)
+            if register == SimulatedBMP280.REGISTER_CTRL_MEAS and value & 0x03 not in (
+                    SimulatedBMP280.MODE_SLEEP, SimulatedBMP280.MODE_NORMAL):
+                self.conversions += 1
+                self.conversion_end = time.monotonic() + self.get_conversion_time()
+
+    def get_writable_registers(self):
+        return SimulatedBMP280.REGISTER_CTRL_MEAS, SimulatedBMP280.REGISTER_CONFIG
@@ -0,0 +1,75 @@
+from typing import Dict, List
+
+from wpiio.simulation.SimulatedChip import SimulatedChip
+
+import time
+
+
+class SimulatedBus:
+    # SMBus I2C block transfers are limited to 32 bytes
+    MAX_BLOCK_LENGTH = 32
+
+    def __init__(self, latency: float = 0.0):
+        # latency in seconds added to every bus transaction
+        self.latency = latency
+        self.chips: Dict[int, SimulatedChip] = {}
+        self.transactions = 0
+        self.bytes_read = 0
+        self.bytes_written = 0
+
+    def attach(self, chip: SimulatedChip) -> SimulatedChip:
+        self.chips[chip.i2c_address] = chip
+        return chip
+
+    def reset_statistics(self):
+        self.transactions = 0
+        self.bytes_read = 0
+        self.bytes_written = 0
+
+    def get_chip(self, i2c_address: int) -> SimulatedChip:
+        if i2c_address not in self.chips:
+            # Same error the kernel driver reports for a missing device
+            raise OSError(121, "Remote I/O error")
+        return self.chips[i2c_address]
+
+    def transfer(self, num_read: int, num_written: int):
+        self.transactions += 1
+        self.bytes_read += num_read
+        self.bytes_written += num_written
+        if self.latency > 0:
+            time.sleep(self.latency)
+
+    def read_byte_data(self, i2c_addr: int, register: int, force: bool = None) -> int:
+        chip = self.get_chip(i2c_addr)
+        self.transfer(1, 1)
+        return chip.read(register, 1)[0]
+
+    def write_byte_data(self, i2c_addr: int, register: int, value: int, force: bool = None):
+        chip = self.get_chip(i2c_addr)
+        self.transfer(0, 2)
+        chip.write(register, [value])
+
+    def read_i2c_block_data(self, i2c_addr: int, register: int, length: int, force: bool = None) -> List[int]:
+        if length > SimulatedBus.MAX_BLOCK_LENGTH:
+            raise ValueError("Desired block length over %d bytes" % SimulatedBus.MAX_BLOCK_LENGTH)
+        chip = self.get_chip(i2c_addr)
+        self.transfer(length, 1)
+        return chip.read(register, length)
+
+    def write_i2c_block_data(self, i2c_addr: int, register: int, data: List[int], force: bool = None):
+        if len(data) > SimulatedBus.MAX_BLOCK_LENGTH:
+            raise ValueError("Data length cannot exceed %d bytes" % SimulatedBus.MAX_BLOCK_LENGTH)
+        chip = self.get_chip(i2c_addr)
+        self.transfer(0, len(data) + 1)
+        chip.write(register, data)
+
+    def write_block_data(self, i2c_addr: int, register: int, data: List[int], force: bool = None):
+        # SMBus block write, the byte count is transmitted in front of the data
+        if len(data) > SimulatedBus.MAX_BLOCK_LENGTH:
+            raise ValueError("Data length cannot exceed %d bytes" % SimulatedBus.MAX_BLOCK_LENGTH)
+        chip = self.get_chip(i2c_addr)
+        self.transfer(0, len(data) + 2)
+        chip.write(register, [len(data)] + list(data))
+
+    def close(self):
+        pass
@@ -0,0 +1,26 @@
+from typing import List
+
+
+class SimulatedChip:
+    def __init__(self, i2c_address: int, num_registers: int = 256):
+        self.i2c_address = i2c_address
+        self.registers = bytearray(num_registers)
+
+    def read(self, register: int, length: int) -> List[int]:
+        # Register address auto-increments during burst reads
+        return [self.read_byte((register + i) % len(self.registers)) for i in range(length)]
+
+    def write(self, register: int, data: List[int]):
+        for i, value in enumerate(data):
+            self.write_byte((register + i) % len(self.registers), value & 0xFF)
+
+    def read_byte(self, register: int) -> int:
+        return self.registers[register]
+
+    def write_byte(self, register: int, value: int):
+        self.registers[register] = value
+
+    def set_short(self, register: int, value: int):
+        # store a 16-bit value little endian
+        self.registers[register] = value & 0xFF
+        self.registers[register + 1] = (value >> 8) & 0xFF
@@ -0,0 +1,48 @@
+from wpiio.simulation.SimulatedChip import SimulatedChip
+
+
+class SimulatedGY271(SimulatedChip):
+    DEFAULT_DEVICE_I2C_ADDRESS = 0x0D
+    CHIP_ID = 0xFF
+
+    REGISTER_DATA_X_LSB = 0x00
+    REGISTER_DOR_OVL_DRDY = 0x06
+    REGISTER_TEMP_OUT_LSB = 0x07
+    REGISTER_OSR_RNG_ODR_MODE = 0x09
+    REGISTER_SOFTRST_ROLPNT_INTENB = 0x0A
+    REGISTER_PERIOD_FBR = 0x0B
+    REGISTER_CHIP_ID = 0x0D
+
+    STATUS_DRDY = 0x01
+    STATUS_OVL = 0x02
+    STATUS_DOR = 0x04
+
+    def __init__(self, i2c_address: int = DEFAULT_DEVICE_I2C_ADDRESS):
+        super().__init__(i2c_address, 0x0E)
+        self.registers[SimulatedGY271.REGISTER_CHIP_ID] = SimulatedGY271.CHIP_ID
+        self.set_field(0, 0, 0)
+
+    def set_field(self, x: int, y: int, z: int, temperature: int = 0):
+        status = self.registers[SimulatedGY271.REGISTER_DOR_OVL_DRDY]
+        if status & SimulatedGY271.STATUS_DRDY:
+            # previous sample was never read
+            status |= SimulatedGY271.STATUS_DOR
+        self.set_short(SimulatedGY271.REGISTER_DATA_X_LSB, x)
+        self.set_short(SimulatedGY271.REGISTER_DATA_X_LSB + 2, y)
+        self.set_short(SimulatedGY271.REGISTER_DATA_X_LSB + 4, z)
+        self.set_short(SimulatedGY271.REGISTER_TEMP_OUT_LSB, temperature)
+        self.registers[SimulatedGY271.REGISTER_DOR_OVL_DRDY] = status | SimulatedGY271.STATUS_DRDY
+
+    def read_byte(self, register: int) -> int:
+        value = super().read_byte(register)
+        if register == SimulatedGY271.REGISTER_DATA_X_LSB + 5:
+            # DRDY and DOR are cleared once all data registers were read
+            self.registers[SimulatedGY271.REGISTER_DOR_OVL_DRDY] = 0
+        return value
+
+    def write_byte(self, register: int, value: int):
+        if register == SimulatedGY271.REGISTER_SOFTRST_ROLPNT_INTENB and value & 0x80:
+            self.registers[SimulatedGY271.REGISTER_OSR_RNG_ODR_MODE] = 0
+            self.registers[SimulatedGY271.REGISTER_SOFTRST_ROLPNT_INTENB] = 0
+        elif register >= SimulatedGY271.REGISTER_OSR_RNG_ODR_MODE:
+            super().write_byte(register, value)
@@ -0,0 +1,108 @@
+from typing import Callable, Optional
+
+from wpiio.simulation.SimulatedChip import SimulatedChip
+
+
+class SimulatedMCP23017(SimulatedChip):
+    DEFAULT_DEVICE_I2C_ADDRESS = 0x20
+
+    # Modelled with IOCON.BANK = 0 addressing only
+    REGISTER_IODIRA = 0x00
+    REGISTER_IPOLA = 0x02
+    REGISTER_GPINTENA = 0x04
+    REGISTER_DEFVALA = 0x06
+    REGISTER_INTCONA = 0x08
+    REGISTER_IOCON = 0x0A
+    REGISTER_IOCON_ALIAS = 0x0B
+    REGISTER_INTFA = 0x0E
+    REGISTER_INTCAPA = 0x10
+    REGISTER_GPIOA = 0x12
+    REGISTER_OLATA = 0x14
+
+    IOCON_MIRROR = 1 << 6
+    IOCON_INTPOL = 1 << 1
+
+    def __init__(self, i2c_address: int = DEFAULT_DEVICE_I2C_ADDRESS):
+        super().__init__(i2c_address, 0x16)
+        # All pins are inputs after power on
+        self.registers[SimulatedMCP23017.REGISTER_IODIRA] = 0xFF
+        self.registers[SimulatedMCP23017.REGISTER_IODIRA + 1] = 0xFF
+        self.pin_levels = 0
+        # called with the new electrical level of the INT pin whenever it changes, INTA is modelled (or both
+        # with IOCON.MIRROR)
+        self.interrupt_listener: Optional[Callable[[bool], None]] = None
+        self.interrupt_level = True
+
+    def set_pin_levels(self, levels: int):
+        # Drive the 16 external pin levels, bit 0 is GPA0 and bit 15 is GPB7
+        previous = [self.get_port_value(port) for port in range(2)]
+        self.pin_levels = levels & 0xFFFF
+        for port in range(2):
+            self.check_interrupt(port, previous[port])
+        self.update_interrupt_output()
+
+    def check_interrupt(self, port: int, previous: int):
+        # INTF and INTCAP only latch while no interrupt is pending on the port
+        if self.registers[SimulatedMCP23017.REGISTER_INTFA + port] != 0:
+            return
+        value = self.get_port_value(port)
+        intcon = self.registers[SimulatedMCP23017.REGISTER_INTCONA + port]
+        defval = self.registers[SimulatedMCP23017.REGISTER_DEFVALA + port]
+        # INTCON bits compare against DEFVAL, the others against the previous value
+        triggered = ((value ^ previous) & ~intcon) | ((value ^ defval) & intcon)
+        triggered &= self.registers[SimulatedMCP23017.REGISTER_GPINTENA + port]
+        triggered &= self.registers[SimulatedMCP23017.REGISTER_IODIRA + port]
+        if triggered:
+            self.registers[SimulatedMCP23017.REGISTER_INTFA + port] = triggered
+            self.registers[SimulatedMCP23017.REGISTER_INTCAPA + port] = value
+
+    def clear_interrupt(self, port: int):
+        self.registers[SimulatedMCP23017.REGISTER_INTFA + port] = 0
+        # a pin still differing from DEFVAL interrupts again right away
+        self.check_interrupt(port, self.get_port_value(port))
+        self.update_interrupt_output()
+
+    def update_interrupt_output(self):
+        iocon = self.registers[SimulatedMCP23017.REGISTER_IOCON]
+        active = self.registers[SimulatedMCP23017.REGISTER_INTFA] != 0
+        if iocon & SimulatedMCP23017.IOCON_MIRROR:
+            active = active or self.registers[SimulatedMCP23017.REGISTER_INTFA + 1] != 0
+        level = active == bool(iocon & SimulatedMCP23017.IOCON_INTPOL)
+        if level != self.interrupt_level:
+            self.interrupt_level = level
+            if self.interrupt_listener is not None:
+                self.interrupt_listener(level)
+
+    def get_port_value(self, port: int) -> int:
+        iodir = self.registers[SimulatedMCP23017.REGISTER_IODIRA + port]
+        ipol = self.registers[SimulatedMCP23017.REGISTER_IPOLA + port]
+        olat = self.registers[SimulatedMCP23017.REGISTER_OLATA + port]
+        inputs = ((self.pin_levels >> (port * 8)) & 0xFF) ^ ipol
+        return (inputs & iodir) | (olat & ~iodir & 0xFF)
+
+    def read_byte(self, register: int) -> int:
+        if register in (SimulatedMCP23017.REGISTER_GPIOA, SimulatedMCP23017.REGISTER_GPIOA + 1):
+            value = self.get_port_value(register - SimulatedMCP23017.REGISTER_GPIOA)
+            self.clear_interrupt(register - SimulatedMCP23017.REGISTER_GPIOA)
+            return value
+        if register in (SimulatedMCP23017.REGISTER_INTCAPA, SimulatedMCP23017.REGISTER_INTCAPA + 1):
+            value = self.registers[register]
+            self.clear_interrupt(register - SimulatedMCP23017.REGISTER_INTCAPA)
+            return value
+        if register == SimulatedMCP23017.REGISTER_IOCON_ALIAS:
+            register = SimulatedMCP23017.REGISTER_IOCON
+        return super().read_byte(register)
+
+    def write_byte(self, register: int, value: int):
+        if register == SimulatedMCP23017.REGISTER_IOCON_ALIAS:
+            register = SimulatedMCP23017.REGISTER_IOCON
+        if register in (SimulatedMCP23017.REGISTER_GPIOA, SimulatedMCP23017.REGISTER_GPIOA + 1):
+            # Writing GPIO writes the output latch
+            register += SimulatedMCP23017.REGISTER_OLATA - SimulatedMCP23017.REGISTER_GPIOA
+        if register in (SimulatedMCP23017.REGISTER_INTFA, SimulatedMCP23017.REGISTER_INTFA + 1,
+                        SimulatedMCP23017.REGISTER_INTCAPA, SimulatedMCP23017.REGISTER_INTCAPA + 1):
+            # read only
+            return
+        super().write_byte(register, value)
+        if register == SimulatedMCP23017.REGISTER_IOCON:
+            self.update_interrupt_output()
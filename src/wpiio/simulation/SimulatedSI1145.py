@@ -0,0 +1,224 @@
+from typing import Callable, Optional
+
+from wpiio.simulation.SimulatedChip import SimulatedChip
+
+
+class SimulatedSI1145(SimulatedChip):
+    DEFAULT_DEVICE_I2C_ADDRESS = 0x60
+    PART_ID = 0x45
+    SEQ_ID = 0x08
+
+    REGISTER_PART_ID = 0x00
+    REGISTER_SEQ_ID = 0x02
+    REGISTER_INT_CFG = 0x03
+    REGISTER_IRQ_ENABLE = 0x04
+    REGISTER_PARAM_WR = 0x17
+    REGISTER_COMMAND = 0x18
+    REGISTER_RESPONSE = 0x20
+    REGISTER_IRQ_STATUS = 0x21
+    REGISTER_ALS_VIS_DATA0 = 0x22
+    REGISTER_PS1_DATA0 = 0x26
+    REGISTER_AUX_DATA0 = 0x2C
+    REGISTER_PARAM_RD = 0x2E
+    REGISTER_CHIP_STAT = 0x30
+
+    PARAM_CHLIST = 0x01
+    PARAM_CHLIST_ENUV = 0x80
+    PARAM_CHLIST_ENAUX = 0x40
+    PARAM_CHLIST_ENALSIR = 0x20
+    PARAM_CHLIST_ENALSVIS = 0x10
+
+    PARAM_ALSVISADCGAIN = 0x11
+    PARAM_ALSVISADCMISC = 0x12
+    PARAM_ALSIRADCGAIN = 0x1E
+    PARAM_ALSIRADCMISC = 0x1F
+    PARAM_ADCMISC_RANGE_HI = 0x20
+
+    COMMAND_NOP = 0x00
+    COMMAND_RESET = 0x01
+    COMMAND_BUSADDR = 0x02
+    COMMAND_PS_FORCE = 0x05
+    COMMAND_ALS_FORCE = 0x06
+    COMMAND_PSALS_FORCE = 0x07
+    COMMAND_PS_PAUSE = 0x09
+    COMMAND_ALS_PAUSE = 0x0A
+    COMMAND_PSALS_PAUSE = 0x0B
+    COMMAND_PS_AUTO = 0x0D
+    COMMAND_ALS_AUTO = 0x0E
+    COMMAND_PSALS_AUTO = 0x0F
+    COMMAND_GET_CAL = 0x12
+    COMMAND_PARAM_QUERY = 0x80
+    COMMAND_PARAM_SET = 0xA0
+
+    RESPONSE_INVALID_COMMAND = 0x80
+    RESPONSE_ALS_VIS_ADC_OVERFLOW = 0x8C
+    RESPONSE_ALS_IR_ADC_OVERFLOW = 0x8D
+
+    IRQ_STATUS_ALS = 0x01
+    IRQ_STATUS_PS1 = 0x04
+    IRQ_STATUS_PS2 = 0x08
+    IRQ_STATUS_PS3 = 0x10
+
+    STATUS_SLEEP = 1
+
+    def __init__(self, i2c_address: int = DEFAULT_DEVICE_I2C_ADDRESS):
+        super().__init__(i2c_address, 0x3F)
+        self.parameters = bytearray(0x20)
+        self.vis = 260
+        self.ir = 253
+        self.uv = 0
+        self.ps = [0, 0, 0]
+        # when set, VIS and IR are derived from the light level and the channel gain settings instead
+        self.lux: Optional[float] = None
+        self.commands_executed = 0
+        # number of RESPONSE reads before a written command is executed, models the sequencer being busy
+        self.command_latency = 0
+        self.pending_command: Optional[int] = None
+        self.pending_reads = 0
+        # called with the new electrical level of the open drain INT pin whenever it changes
+        self.interrupt_listener: Optional[Callable[[bool], None]] = None
+        self.interrupt_level = True
+        self.reset()
+
+    def reset(self):
+        for i in range(len(self.registers)):
+            self.registers[i] = 0
+        for i in range(len(self.parameters)):
+            self.parameters[i] = 0
+        self.parameters[0] = self.i2c_address
+        self.registers[SimulatedSI1145.REGISTER_PART_ID] = SimulatedSI1145.PART_ID
+        self.registers[SimulatedSI1145.REGISTER_SEQ_ID] = SimulatedSI1145.SEQ_ID
+        self.registers[SimulatedSI1145.REGISTER_CHIP_STAT] = SimulatedSI1145.STATUS_SLEEP
+        self.autonomous_ps = False
+        self.autonomous_als = False
+        self.update_interrupt_output()
+
+    def update_interrupt_output(self):
+        active = self.registers[SimulatedSI1145.REGISTER_INT_CFG] & 0x01 and \
+            self.registers[SimulatedSI1145.REGISTER_IRQ_STATUS] & self.registers[SimulatedSI1145.REGISTER_IRQ_ENABLE]
+        level = not active
+        if level != self.interrupt_level:
+            self.interrupt_level = level
+            if self.interrupt_listener is not None:
+                self.interrupt_listener(level)
+
+    def run_autonomous_cycle(self):
+        # One wake up of the autonomous mode, a real chip does this every MEAS_RATE * 31.25 us
+        if self.autonomous_ps:
+            self.measure_ps()
+        if self.autonomous_als:
+            self.measure_als()
+        self.update_interrupt_output()
+
+    def set_measurement(self, vis: int, ir: int, uv: int, ps1: int = 0, ps2: int = 0, ps3: int = 0):
+        # Values reported by the next forced or autonomous measurement
+        self.vis = vis
+        self.ir = ir
+        self.uv = uv
+        self.ps = [ps1, ps2, ps3]
+
+    def set_light(self, lux: Optional[float]):
+        # Sunlight of the given illuminance, 0.282 VIS and 2.44 IR counts per lux at gain 0 in the normal range
+        self.lux = lux
+
+    def get_counts(self, counts_per_lux: float, gain_parameter: int, misc_parameter: int) -> int:
+        counts = self.lux * counts_per_lux * (1 << self.parameters[gain_parameter])
+        if self.parameters[misc_parameter] & SimulatedSI1145.PARAM_ADCMISC_RANGE_HI:
+            counts /= 14.5
+        return 256 + int(counts)
+
+    def measure_als(self):
+        chlist = self.parameters[SimulatedSI1145.PARAM_CHLIST]
+        vis, ir = self.vis, self.ir
+        if self.lux is not None:
+            vis = self.get_counts(0.282, SimulatedSI1145.PARAM_ALSVISADCGAIN, SimulatedSI1145.PARAM_ALSVISADCMISC)
+            ir = self.get_counts(2.44, SimulatedSI1145.PARAM_ALSIRADCGAIN, SimulatedSI1145.PARAM_ALSIRADCMISC)
+        if chlist & SimulatedSI1145.PARAM_CHLIST_ENALSVIS:
+            if vis > 0xFFFF:
+                vis = 0xFFFF
+                self.registers[SimulatedSI1145.REGISTER_RESPONSE] = SimulatedSI1145.RESPONSE_ALS_VIS_ADC_OVERFLOW
+            self.set_short(SimulatedSI1145.REGISTER_ALS_VIS_DATA0, vis)
+        if chlist & SimulatedSI1145.PARAM_CHLIST_ENALSIR:
+            if ir > 0xFFFF:
+                ir = 0xFFFF
+                self.registers[SimulatedSI1145.REGISTER_RESPONSE] = SimulatedSI1145.RESPONSE_ALS_IR_ADC_OVERFLOW
+            self.set_short(SimulatedSI1145.REGISTER_ALS_VIS_DATA0 + 2, ir)
+        if chlist & (SimulatedSI1145.PARAM_CHLIST_ENUV | SimulatedSI1145.PARAM_CHLIST_ENAUX):
+            self.set_short(SimulatedSI1145.REGISTER_AUX_DATA0, self.uv)
+        self.registers[SimulatedSI1145.REGISTER_IRQ_STATUS] |= SimulatedSI1145.IRQ_STATUS_ALS
+
+    def measure_ps(self):
+        chlist = self.parameters[SimulatedSI1145.PARAM_CHLIST]
+        for i in range(3):
+            if chlist & (1 << i):
+                self.set_short(SimulatedSI1145.REGISTER_PS1_DATA0 + i * 2, self.ps[i])
+                self.registers[SimulatedSI1145.REGISTER_IRQ_STATUS] |= SimulatedSI1145.IRQ_STATUS_PS1 << i
+
+    def execute_command(self, command: int):
+        response = self.registers[SimulatedSI1145.REGISTER_RESPONSE]
+        if command == SimulatedSI1145.COMMAND_NOP:
+            self.registers[SimulatedSI1145.REGISTER_RESPONSE] = 0
+            return
+        if command == SimulatedSI1145.COMMAND_RESET:
+            self.reset()
+            return
+        if response & 0x80:
+            # Errors are retained until a NOP or RESET, every other command is ignored
+            return
+        if command & 0xE0 == SimulatedSI1145.COMMAND_PARAM_SET:
+            value = self.registers[SimulatedSI1145.REGISTER_PARAM_WR]
+            self.parameters[command & 0x1F] = value
+            self.registers[SimulatedSI1145.REGISTER_PARAM_RD] = value
+        elif command & 0xE0 == SimulatedSI1145.COMMAND_PARAM_QUERY:
+            self.registers[SimulatedSI1145.REGISTER_PARAM_RD] = self.parameters[command & 0x1F]
+        elif command in (SimulatedSI1145.COMMAND_PS_FORCE, SimulatedSI1145.COMMAND_PSALS_FORCE):
+            self.measure_ps()
+            if command == SimulatedSI1145.COMMAND_PSALS_FORCE:
+                self.measure_als()
+        elif command == SimulatedSI1145.COMMAND_ALS_FORCE:
+            self.measure_als()
+        elif command in (SimulatedSI1145.COMMAND_PS_AUTO, SimulatedSI1145.COMMAND_ALS_AUTO,
+                         SimulatedSI1145.COMMAND_PSALS_AUTO):
+            self.autonomous_ps = self.autonomous_ps or command != SimulatedSI1145.COMMAND_ALS_AUTO
+            self.autonomous_als = self.autonomous_als or command != SimulatedSI1145.COMMAND_PS_AUTO
+        elif command in (SimulatedSI1145.COMMAND_PS_PAUSE, SimulatedSI1145.COMMAND_ALS_PAUSE,
+                         SimulatedSI1145.COMMAND_PSALS_PAUSE):
+            self.autonomous_ps = self.autonomous_ps and command == SimulatedSI1145.COMMAND_ALS_PAUSE
+            self.autonomous_als = self.autonomous_als and command == SimulatedSI1145.COMMAND_PS_PAUSE
+        elif not (SimulatedSI1145.COMMAND_BUSADDR <= command <= SimulatedSI1145.COMMAND_GET_CAL):
+            self.registers[SimulatedSI1145.REGISTER_RESPONSE] = SimulatedSI1145.RESPONSE_INVALID_COMMAND
+            return
+        self.commands_executed += 1
+        if self.registers[SimulatedSI1145.REGISTER_RESPONSE] & 0x80:
+            # the measurement ended with an ADC overflow
+            self.update_interrupt_output()
+            return
+        # bits 3:0 form a roll-over counter of executed commands
+        self.registers[SimulatedSI1145.REGISTER_RESPONSE] = (response + 1) & 0x0F
+        self.update_interrupt_output()
+
+    def read_byte(self, register: int) -> int:
+        if register == SimulatedSI1145.REGISTER_RESPONSE and self.pending_command is not None:
+            self.pending_reads -= 1
+            if self.pending_reads < 0:
+                command = self.pending_command
+                self.pending_command = None
+                self.execute_command(command)
+        return super().read_byte(register)
+
+    def write_byte(self, register: int, value: int):
+        if register == SimulatedSI1145.REGISTER_COMMAND:
+            self.registers[register] = value
+            if self.command_latency > 0:
+                self.pending_command = value
+                self.pending_reads = self.command_latency
+            else:
+                self.execute_command(value)
+        elif register == SimulatedSI1145.REGISTER_IRQ_STATUS:
+            # interrupt flags are cleared by writing ones
+            self.registers[register] &= ~value & 0xFF
+            self.update_interrupt_output()
+        elif SimulatedSI1145.REGISTER_SEQ_ID < register < SimulatedSI1145.REGISTER_RESPONSE:
+            super().write_byte(register, value)
+            if register in (SimulatedSI1145.REGISTER_INT_CFG, SimulatedSI1145.REGISTER_IRQ_ENABLE):
+                self.update_interrupt_output()
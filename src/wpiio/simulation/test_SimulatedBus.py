@@ -0,0 +1,144 @@
+from unittest import TestCase
+
+from gpiozero.pins.mock import MockFactory
+
+from wpiio import I2CBus
+from wpiio.simulation.SimulatedBus import SimulatedBus
+from wpiio.simulation.SimulatedBME280 import SimulatedBME280
+from wpiio.simulation.SimulatedGY271 import SimulatedGY271
+from wpiio.simulation.SimulatedMCP23017 import SimulatedMCP23017
+from wpiio.simulation.SimulatedSI1145 import SimulatedSI1145
+from sensors.BME280 import BME280
+from sensors.SI1145 import SI1145
+from wpiio.MCP23017 import MCP23017
+
+import time
+
+
+class TestSimulatedBus(TestCase):
+    def setUp(self):
+        self.bus = SimulatedBus()
+        I2CBus.set_bus_factory(lambda bus_number: self.bus)
+
+    def tearDown(self):
+        I2CBus.set_bus_factory(None)
+
+    def test_missing_device(self):
+        with self.assertRaises(OSError):
+            self.bus.read_byte_data(0x42, 0)
+
+    def test_bme280(self):
+        self.bus.attach(SimulatedBME280())
+        sensor = BME280()
+        self.assertTrue(sensor.is_chip_id_valid())
+        sensor.read()
+        self.assertAlmostEqual(sensor.last_temperature, 25.08)
+        self.assertAlmostEqual(sensor.last_pressure, 1006.533, places=3)
+        self.assertTrue(0.0 < sensor.last_humidity < 100.0)
+
+    def test_bme280_forced(self):
+        chip = self.bus.attach(SimulatedBME280())
+        sensor = BME280()
+        start = time.perf_counter()
+        sensor.measure()
+        elapsed = time.perf_counter() - start
+        # returns after the typical conversion time instead of the worst case
+        self.assertGreaterEqual(elapsed, chip.get_conversion_time())
+        self.assertEqual(chip.conversions, 1)
+        self.assertEqual(chip.registers[SimulatedBME280.REGISTER_CTRL_MEAS] & 0x03, BME280.CONTROL_MODE_SLEEP)
+        self.assertAlmostEqual(sensor.last_temperature, 25.08)
+        chip.conversion_time = 0.02
+        self.bus.reset_statistics()
+        start = time.perf_counter()
+        sensor.measure()
+        self.assertGreaterEqual(time.perf_counter() - start, 0.02)
+        # two control writes and the data read, the rest are status polls after the typical time. A loaded machine
+        # only makes for fewer polls.
+        polls = self.bus.transactions - 3
+        max_polls = (0.02 - sensor.get_typical_measure_time()) / BME280.STATUS_POLL_INTERVAL + 2
+        self.assertGreaterEqual(polls, 1)
+        self.assertLessEqual(polls, max_polls)
+        self.assertEqual(chip.conversions, 2)
+        chip.conversion_time = 1.0
+        with self.assertRaises(TimeoutError):
+            sensor.measure()
+
+    def test_si1145(self):
+        chip = self.bus.attach(SimulatedSI1145())
+        chip.set_measurement(300, 400, 150)
+        sensor = SI1145()
+        self.assertTrue(sensor.is_chip_id_valid())
+        self.assertEqual(sensor.get_measure_rate(), 0xFF * 31.25 * 0.000001)
+        self.assertEqual(sensor.get_als_vis_data(), 300)
+        self.assertEqual(sensor.get_als_ir_data(), 400)
+        self.assertEqual(sensor.get_aux_data(), 150)
+
+    def test_gy271(self):
+        chip = self.bus.attach(SimulatedGY271())
+        chip.set_field(-1200, 800, 300, 25)
+        self.assertEqual(self.bus.read_i2c_block_data(SimulatedGY271.DEFAULT_DEVICE_I2C_ADDRESS, 0x06, 1)[0] & 1, 1)
+        data = self.bus.read_i2c_block_data(SimulatedGY271.DEFAULT_DEVICE_I2C_ADDRESS, 0x00, 9)
+        self.assertEqual(int.from_bytes(bytes(data[0:2]), byteorder='little', signed=True), -1200)
+        self.assertEqual(data[6] & 1, 0)
+
+    def test_mcp23017(self):
+        chip = self.bus.attach(SimulatedMCP23017())
+        chip.set_pin_levels(0b1010000000000101)
+        expander = MCP23017()
+        expander.set_pins_input(*([True] * 16))
+        self.assertEqual(expander.read_ports(), 0b1010000000000101)
+        self.assertEqual(expander.read_port(2), 1)
+        self.assertEqual(expander.read_port(14), 0)
+
+    def test_mcp23017_interrupts(self):
+        chip = self.bus.attach(SimulatedMCP23017())
+        expander = MCP23017()
+        self.assertEqual(chip.registers[SimulatedMCP23017.REGISTER_IOCON] & MCP23017.IOCON_BANK, 0)
+        expander.set_pins_input(*([True] * 16))
+        factory = MockFactory()
+        int_pin = factory.pin(17)
+        chip.interrupt_listener = lambda level: int_pin.drive_high() if level else int_pin.drive_low()
+        events = []
+        expander.start_interrupts(17, events.append, pins=0b1000000000000001, pin_factory=factory)
+        self.bus.reset_statistics()
+        # pin 3 isn't watched, so nothing happens on the bus
+        chip.set_pin_levels(0b1000)
+        self.assertEqual(self.bus.transactions, 0)
+        chip.set_pin_levels(0b1000000000001001)
+        chip.set_pin_levels(0b1000000000001000)
+        self.assertEqual([(event.pin, event.level) for event in events], [(0, 1), (15, 1), (0, 0)])
+        self.assertEqual(expander.interrupts, 2)
+        self.assertFalse(chip.interrupt_level)
+        expander.close()
+
+    def test_mcp23017_interrupt_during_start(self):
+        chip = self.bus.attach(SimulatedMCP23017())
+        expander = MCP23017()
+        expander.set_pins_input(*([True] * 16))
+        factory = MockFactory()
+        int_pin = factory.pin(17)
+        chip.interrupt_listener = lambda level: int_pin.drive_high() if level else int_pin.drive_low()
+        clear_capture = expander.read_interrupt_capture
+
+        def clear_and_change():
+            # the pin changes after the capture was cleared but before the INT line is watched
+            expander.read_interrupt_capture = clear_capture
+            flags = clear_capture()
+            chip.set_pin_levels(0b1)
+            return flags
+
+        expander.read_interrupt_capture = clear_and_change
+        events = []
+        expander.start_interrupts(17, events.append, pins=0b1, pin_factory=factory)
+        self.assertEqual([(event.pin, event.level) for event in events], [(0, 1)])
+        self.assertFalse(chip.interrupt_level)
+        # INT was released, so the next change arrives as an edge again
+        chip.set_pin_levels(0b0)
+        self.assertEqual([(event.pin, event.level) for event in events], [(0, 1), (0, 0)])
+        expander.close()
+
+    def test_latency(self):
+        self.bus.attach(SimulatedBME280())
+        self.bus.latency = 0.001
+        BME280()
+        self.assertGreater(self.bus.transactions, 0)
@@ -0,0 +1,63 @@
+from unittest import TestCase
+
+from wpiio import I2CBus
+from wpiio.simulation.SimulatedBus import SimulatedBus
+from wpiio.simulation.SimulatedBME280 import SimulatedBME280
+from wpiio.simulation.SimulatedSI1145 import SimulatedSI1145
+from sensors.BME280 import BME280
+from sensors.SI1145 import SI1145
+
+import threading
+
+
+class TestSharedBus(TestCase):
+    def setUp(self):
+        self.opened = []
+        I2CBus.set_bus_factory(self.create_bus)
+
+    def tearDown(self):
+        I2CBus.set_bus_factory(None)
+
+    def create_bus(self, bus_number: int) -> SimulatedBus:
+        bus = SimulatedBus()
+        bus.attach(SimulatedBME280())
+        bus.attach(SimulatedSI1145())
+        self.opened.append(bus_number)
+        return bus
+
+    def test_pooled_handle(self):
+        bme280_sensor = BME280()
+        si1145_sensor = SI1145()
+        self.assertIs(bme280_sensor.bus, si1145_sensor.bus)
+        self.assertEqual(self.opened, [1])
+        bme280_sensor.close()
+        self.assertIn(1, I2CBus.pool)
+        si1145_sensor.close()
+        self.assertNotIn(1, I2CBus.pool)
+
+    def test_concurrent_parameters(self):
+        sensor = SI1145()
+        errors = []
+
+        def worker(parameter: int, value: int):
+            for _ in range(200):
+                sensor.set_parameter(parameter, value)
+                if sensor.get_parameter(parameter) != value:
+                    errors.append(parameter)
+
+        threads = [threading.Thread(target=worker, args=(p, p * 3)) for p in range(0x10, 0x14)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(errors, [])
+
+    def test_enqueue_flush(self):
+        bme280_sensor = BME280()
+        si1145_sensor = SI1145()
+        bus = bme280_sensor.bus
+        bus.handle.reset_statistics()
+        chip_ids = [bus.enqueue(bme280_sensor.get_chip_id), bus.enqueue(si1145_sensor.get_chip_id)]
+        self.assertEqual(bus.handle.transactions, 0)
+        self.assertEqual(bus.flush(), 2)
+        self.assertEqual([future.result() for future in chip_ids], [0x60, 0x45])